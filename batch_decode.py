@@ -0,0 +1,107 @@
+# batch_decode.py
+# This file contains the headless batch decoder for captured UART logs.
+# It must not import tkinter, pyserial or PIL, so it runs on a bare Python install.
+#
+# Usage: python main.py decode [--json] [--details] [--stats] [FILE ...]
+#        (reads stdin when no file is given or the file is '-')
+
+import argparse
+import json
+import sys
+
+import decode_cache
+from errlog_record import parse_errlog_line
+
+TSV_COLUMNS = ('source', 'code', 'error', 'rtc', 'power_state', 'up_cause', 'seq_no', 'psq', 'dev_power', 't_soc', 't_env')
+
+
+def iter_errlog_records(lines):
+    """Yields an ErrlogRecord for every errlog line, skipping everything else (echoes, prompts, noise)."""
+    for line in lines:
+        # Console captures saved from the GUI prefix received lines with '> '
+        text = line.strip().lstrip('>').lstrip()
+        if not text.startswith("OK "):
+            continue
+        try:
+            record = parse_errlog_line(text)
+        except ValueError:
+            continue
+        if record is not None:
+            yield record
+
+
+def decode_record(record, details=False):
+    """Returns the decoded fields of a record as an ordered dict of strings."""
+    fields = record.fields()
+    decoded = {
+        'code': fields['Code'],
+        'error': decode_cache.decode('Code', fields['Code']),
+        'rtc': decode_cache.decode('Rtc', fields['Rtc']),
+        'power_state': decode_cache.decode('PowState', fields['PowState']),
+        'up_cause': decode_cache.decode('UpCause', fields['UpCause']),
+        'seq_no': fields['SeqNo'],
+        'psq': decode_cache.decode('SeqNo', fields['SeqNo']),
+        'dev_power': decode_cache.decode('DevPm', fields['DevPm']),
+        't_soc': decode_cache.decode('T_SoC', fields['T_SoC']),
+        't_env': decode_cache.decode('T_Env', fields['T_Env']),
+    }
+    if details:
+        decoded['description'] = decode_cache.decode('Description', fields['Code'])
+    return decoded
+
+
+def _open_input(path):
+    if path == '-':
+        if hasattr(sys.stdin, 'reconfigure'):
+            sys.stdin.reconfigure(errors='replace')
+        return sys.stdin
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+def decode_stream(paths, out, as_json=False, details=False):
+    """Decodes every errlog line in the given files to out, one record per line. Returns the record count."""
+    count = 0
+    if not as_json:
+        columns = TSV_COLUMNS + (('description',) if details else ())
+        out.write("\t".join(columns) + "\n")
+    for path in paths:
+        source = '<stdin>' if path == '-' else path
+        stream = _open_input(path)
+        try:
+            for record in iter_errlog_records(stream):
+                decoded = decode_record(record, details)
+                if as_json:
+                    out.write(json.dumps({'source': source, **decoded}, ensure_ascii=False) + "\n")
+                else:
+                    if details:
+                        decoded['description'] = " | ".join(filter(None, decoded['description'].splitlines()))
+                    out.write(source + "\t" + "\t".join(decoded.values()) + "\n")
+                count += 1
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py decode", description="Decode PS5 errlog lines from captured UART logs.")
+    parser.add_argument('files', nargs='*', default=['-'], help="log files to read ('-' or none for stdin)")
+    parser.add_argument('--json', action='store_true', help="write JSON lines instead of tab-separated values")
+    parser.add_argument('--details', action='store_true', help="include the detailed error database description")
+    parser.add_argument('--stats', action='store_true', help="print record count and decode cache statistics to stderr")
+    args = parser.parse_args(argv)
+
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(errors='replace')
+    try:
+        count = decode_stream(args.files or ['-'], sys.stdout, as_json=args.json, details=args.details)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if args.stats:
+        print(f"{count} records decoded, cache: {decode_cache.default_cache.stats()}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
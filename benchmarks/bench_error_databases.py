@@ -0,0 +1,61 @@
+# bench_error_databases.py
+# Compares the compiled cod3r_database lookup with a linear scan of the same rules.
+# Run from the repository root: python benchmarks/bench_error_databases.py
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import error_databases
+
+
+def linear_lookup(err_code_hex):
+    """Walks the rules in order like the old if/elif chain did."""
+    for code, message in error_databases._CODE_RULES:
+        if err_code_hex[0:len(code)] == code:
+            return message
+    if err_code_hex[0:6] == error_databases.GDDR6_BANK_PREFIX:
+        message = error_databases._decode_gddr6_banks(err_code_hex)
+        if message is not None:
+            return message
+    return error_databases.DEFAULT_MESSAGE.format(err_code_hex)
+
+
+def build_corpus(random_count=20000, seed=0):
+    """Every known code, every code in each known prefix group and the RAM family, plus random 32-bit codes."""
+    rng = random.Random(seed)
+    codes = []
+    for code, _ in error_databases._CODE_RULES:
+        codes.append(code)
+        if len(code) < 8:
+            codes.extend(code + f"{i:0{8 - len(code)}X}" for i in range(16 ** min(8 - len(code), 2)))
+    codes.extend(f"{error_databases.GDDR6_BANK_PREFIX}{mask:02X}" for mask in range(256))
+    codes.extend(f"{rng.getrandbits(32):08X}" for _ in range(random_count))
+    return codes
+
+
+def main():
+    codes = build_corpus()
+    mismatches = [code for code in codes if linear_lookup(code) != error_databases.cod3r_database(code)]
+    if mismatches:
+        print(f"Mismatch for {len(mismatches)} codes, e.g. {mismatches[:5]}")
+        return 1
+
+    def run(fn):
+        for code in codes:
+            fn(code)
+
+    linear = min(timeit.repeat(lambda: run(linear_lookup), number=1, repeat=5))
+    compiled = min(timeit.repeat(lambda: run(error_databases.cod3r_database), number=1, repeat=5))
+    print(f"{len(codes)} lookups, identical results")
+    print(f"linear scan : {linear * 1e9 / len(codes):8.0f} ns/lookup")
+    print(f"compiled    : {compiled * 1e9 / len(codes):8.0f} ns/lookup")
+    print(f"speedup     : {linear / compiled:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+# bench_suite.py
+# Standing benchmarks for the decode and ingest hot paths, checked against a stored baseline.
+# Run from the repository root:
+#   python benchmarks/bench_suite.py                    # compare with benchmarks/baseline.json
+#   python benchmarks/bench_suite.py --update-baseline  # record the current numbers (median of 3 processes) as the baseline
+# Exits with 1 when a case is slower than its baseline by more than --threshold (or its CASE_THRESHOLDS entry).
+#
+# Every case is timed as the median of --repeat samples, each long enough (MIN_SAMPLE_SECONDS) that
+# timer resolution and one-off stalls do not count. A fixed pure-Python workload (the 'calibration'
+# case) is timed right before and after every sample, and cases are compared by their speed relative
+# to it, so a machine that is slower or faster than when the baseline was recorded (CPU frequency,
+# other load on a shared runner) does not read as a regression or hide one.
+# Baselines are still best recorded on the bench machine or CI runner that checks them.
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import decoders
+import error_databases
+import uart_simulator
+from errlog_index import ErrlogIndex, ErrlogQuery, parse_code_prefix
+from errlog_record import parse_errlog_line
+from metrics import PipelineMetrics
+from serial_reader import LineFramer
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+DEFAULT_THRESHOLD = 0.25  # Allowed slowdown, relative to the calibration case, before a case counts as a regression
+# Cases that vary more than that from one process to the next even on an idle machine. The index
+# query walks records scattered over the heap, so its speed follows where they happened to be allocated.
+CASE_THRESHOLDS = {'errlog_index_query': 0.4}
+DEFAULT_REPEAT = 5
+MIN_SAMPLE_SECONDS = 0.2  # Each sample runs a case this long at least
+CALIBRATION_CASE = 'calibration'
+BASELINE_PROCESSES = 3  # A baseline is the median of this many runs, each in a fresh interpreter
+BASELINE_VERSION = 2  # 1 was best-of-N with no calibration, so its numbers are not comparable
+
+
+def build_corpus(known_count=4000, unknown_count=1000, seed=0):
+    """
+    Errlog reply lines as the console sends them: mostly known codes, plus
+    random codes that match no rule and so take the longest path through
+    every lookup, and GDDR6 bank codes. About one line in ten is a repeat,
+    as happens when a console is dumped more than once.
+    """
+    rng = random.Random(seed)
+    lines = uart_simulator.generate_errlog_lines(known_count, seed)
+    for line in uart_simulator.generate_errlog_lines(unknown_count, seed + 1):
+        parts = line.split()
+        parts[2] = f"{rng.getrandbits(32):08X}"
+        lines.append(" ".join(parts))
+    for mask in range(256):
+        parts = lines[mask].split()
+        parts[2] = f"{error_databases.GDDR6_BANK_PREFIX}{mask:02X}"
+        lines.append(" ".join(parts))
+    lines.extend(rng.sample(lines, len(lines) // 10))
+    rng.shuffle(lines)
+    return [uart_simulator.with_checksum(line) for line in lines]
+
+
+def _fields(corpus, index):
+    return [line.split()[index].partition(':')[0] for line in corpus]
+
+
+class _NullWidget:
+    """Stands in for the Tk widgets parse_and_add_errlog_entry touches, so only the Python side is timed."""
+
+    def row_inserted(self, *args): pass
+    def reset(self): pass
+    def config(self, **kwargs): pass
+
+
+def _headless_gui():
+    """
+    Returns a UartTerminalGUI whose ingest state comes from the same _init_ingest_state() as the real
+    window, with only the widgets stubbed out, or None if gui cannot be imported.
+    """
+    try:
+        import gui
+    except ImportError:  # tkinter or pyserial missing on this machine
+        return None
+    app = gui.UartTerminalGUI.__new__(gui.UartTerminalGUI)  # No Tk root: __init__ would build the window
+    app._init_ingest_state(PipelineMetrics())
+    app.errlog_table = app.errlog_header_label = _NullWidget()
+    app.log_to_general_output = lambda message, tag=None: None
+    return app
+
+
+def _calibration():
+    """A fixed mix of the interpreter work the cases do (formatting, hex parsing, dict and list operations)."""
+    table = {}
+    for i in range(2000):
+        key = f"{i * 2654435761 & 0xFFFFFFFF:08X}"
+        table[key[:4]] = table.get(key[:4], 0) + int(key, 16) % 7
+    return sorted(table.items(), key=lambda item: item[1])
+
+
+def build_cases(corpus):
+    """Returns {name: (function running one pass, operations per pass)}."""
+    codes = _fields(corpus, 2)
+    rtcs = _fields(corpus, 3)
+    pow_states = _fields(corpus, 4)
+    temps = _fields(corpus, 8) + _fields(corpus, 9)
+    stream = "".join(f"{line}\n" for line in corpus).encode('utf-8')
+    chunks = [stream[i:i + 64] for i in range(0, len(stream), 64)]  # Roughly what one read returns at 115200 baud
+
+    def each(fn, values):
+        return lambda: [fn(value) for value in values]
+
+    def framing():
+        feed = LineFramer().feed
+        for chunk in chunks:
+            feed(chunk)
+
+    records = [parse_errlog_line(line) for line in corpus]
+    for entry_no, record in enumerate(records, 1):
+        record.entry_no = entry_no
+    index = ErrlogIndex()
+
+    def indexing():
+        index.clear()
+        for record in records:
+            index.add(record)
+
+    indexing()
+    newest = index.newest_rtc
+    queries = [  # Filter bar queries, from narrow to broad
+        ErrlogQuery(code_range=parse_code_prefix("8080xxxx"), rtc_min=newest - 7 * 86400, soc_min=60),
+        ErrlogQuery(code_range=parse_code_prefix("80"), soc_min=40),
+        ErrlogQuery(rtc_min=newest - 30 * 86400, env_min=30),
+        ErrlogQuery(code_range=parse_code_prefix("C0")),
+    ]
+
+    cases = {
+        CALIBRATION_CASE: (_calibration, 2000),
+        'decode_err_code': (each(decoders._decode_err_code, codes), len(codes)),
+        'decode_pw_state': (each(decoders._decode_pw_state, pow_states), len(pow_states)),
+        'decode_rtc': (each(decoders._decode_rtc, rtcs), len(rtcs)),
+        'convert_to_celsius': (each(decoders.convert_to_celsius, temps), len(temps)),
+        'cod3r_database': (each(error_databases.cod3r_database, codes), len(codes)),
+        'line_framing': (framing, len(corpus)),
+        'errlog_index_add': (indexing, len(records)),
+        'errlog_index_query': (each(index.query, queries), len(queries)),
+    }
+
+    app = _headless_gui()
+    if app is not None:
+        def ingest():
+            app._init_ingest_state(app.metrics)
+            for line in corpus:
+                app.parse_and_add_errlog_entry(line)
+        cases['parse_and_add_errlog_entry'] = (ingest, len(corpus))
+    return cases
+
+
+def run_cases(cases, repeat=DEFAULT_REPEAT, only=None, min_time=MIN_SAMPLE_SECONDS):
+    """
+    Returns {name: {'ops_per_sec', 'ns_per_op', 'relative'}} from the median of repeat samples, each
+    running the case as many times as fit in min_time. Every sample is bracketed by two short runs of
+    the calibration case; 'relative' is the case's speed over the calibration speed around it, which
+    cancels out the machine running faster or slower from one moment to the next.
+    """
+    calibration = timeit.Timer(cases[CALIBRATION_CASE][0])
+    calibration_number = max(1, int(min_time / 4 / calibration.timeit(number=1)))
+
+    def calibration_speed():
+        return calibration_number / calibration.timeit(number=calibration_number)
+
+    results = {}
+    for name, (fn, ops) in cases.items():
+        if only and name not in only and name != CALIBRATION_CASE:
+            continue
+        timer = timeit.Timer(fn)
+        number = max(1, int(min_time / timer.timeit(number=1)))  # The first call doubles as the warm-up pass
+        times, relative = [], []
+        for _ in range(repeat):
+            before = calibration_speed()
+            elapsed = timer.timeit(number=number) / number
+            times.append(elapsed); relative.append(1.0 / elapsed / ((before + calibration_speed()) / 2))
+        median = statistics.median(times)
+        results[name] = {'ops_per_sec': round(ops / median, 1), 'ns_per_op': round(median * 1e9 / ops, 1),
+                         'relative': round(statistics.median(relative), 6)}
+    return results
+
+
+def run_in_processes(count, repeat, only=None):
+    """
+    Runs the suite in count fresh interpreters and returns the median of each number. Memory layout
+    differs from one process to the next and some cases follow it, so one process can be an outlier.
+    """
+    command = [sys.executable, os.path.abspath(__file__), '--json', '--repeat', str(repeat)]
+    for name in only or ():
+        command += ['--case', name]
+    runs = [json.loads(subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout)['results']
+            for _ in range(count)]
+    return {name: {key: round(statistics.median(run[name][key] for run in runs), 6) for key in result}
+            for name, result in runs[0].items()}
+
+
+def change_vs_baseline(results, baseline, name):
+    """
+    Change of a case against its baseline as a fraction, measured relative to the calibration case
+    (for the calibration case itself: the change in raw speed). None if the baseline lacks the case.
+    """
+    base = baseline.get('results', {}).get(name)
+    if not base:
+        return None
+    key = 'ops_per_sec' if name == CALIBRATION_CASE else 'relative'
+    return results[name][key] / base[key] - 1.0
+
+
+def compare(results, baseline, threshold):
+    """Returns the list of (name, current, baseline, change) for cases slower than the threshold allows."""
+    regressions = []
+    for name, result in results.items():
+        change = change_vs_baseline(results, baseline, name)
+        if name != CALIBRATION_CASE and change is not None and change < -max(threshold, CASE_THRESHOLDS.get(name, 0)):
+            regressions.append((name, result['ops_per_sec'], baseline['results'][name]['ops_per_sec'], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the decode and ingest hot paths.")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON file (default: benchmarks/baseline.json)")
+    parser.add_argument('--update-baseline', action='store_true', help="write the current results as the new baseline")
+    parser.add_argument('--processes', type=int, default=BASELINE_PROCESSES, help="with --update-baseline: runs to take the median of")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown as a fraction (default 0.25)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="samples per case, the median counts")
+    parser.add_argument('--case', action='append', help="run only this case (repeatable)")
+    parser.add_argument('--json', action='store_true', help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus()
+    if args.update_baseline and args.processes > 1:
+        results = run_in_processes(args.processes, args.repeat, args.case)
+    else:
+        results = run_cases(build_cases(corpus), repeat=args.repeat, only=args.case)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('version') != BASELINE_VERSION:
+            if not args.update_baseline:
+                print(f"Baseline {args.baseline} is from an older version of this suite; run with --update-baseline.", file=sys.stderr)
+            baseline = None
+
+    if args.json:
+        print(json.dumps({'corpus_lines': len(corpus), 'results': results}, indent=2))
+    else:
+        runs = f" in {args.processes} processes" if args.update_baseline and args.processes > 1 else ""
+        print(f"{len(corpus)} corpus lines, median of {args.repeat}{runs}")
+        for name, result in results.items():
+            line = f"{name:28s} {result['ns_per_op']:10.1f} ns/op {result['ops_per_sec']:14.0f} ops/s"
+            change = change_vs_baseline(results, baseline, name) if baseline else None
+            if change is not None:
+                line += f"   {change:+7.1%} vs baseline" + (" (machine)" if name == CALIBRATION_CASE else "")
+            print(line)
+
+    if args.update_baseline:
+        # Cases not run this time (--case, or no gui on this machine) keep their recorded numbers
+        merged = dict(baseline.get('results', {}) if baseline else {}, **results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'version': BASELINE_VERSION, 'python': platform.python_version(), 'machine': platform.machine(),
+                       'platform': platform.platform(), 'results': merged}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one.", file=sys.stderr)
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    for name, current, base, change in regressions:
+        print(f"REGRESSION {name}: {current:.0f} ops/s vs baseline {base:.0f} ops/s ({change:+.1%})", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,420 @@
+# capture_engine.py
+# This file contains the multi-port capture engine for watching many consoles from one process.
+#
+# The GUI stays single-port; this engine backs the capture command, whose errlogs reach the GUI
+# through the history database (--store) that its History and Analytics windows read.
+#
+# Usage: python main.py capture PORT[@BAUD] [PORT[@BAUD] ...] [--adapter NAME] [--send CMD] [--log-dir DIR]
+#                               [--decode] [--store [DB]]
+
+import argparse
+import ctypes
+import os
+import queue
+import selectors
+import socket
+import sqlite3
+import sys
+import threading
+
+import serial
+
+import batch_decode
+from console import ConsoleBuffer
+from errlog_record import parse_errlog_line
+from errlog_store import ErrlogStore, DEFAULT_DB_FILENAME
+from serial_reader import LineFramer, filter_echo, format_command, READ_CHUNK_SIZE
+
+DEFAULT_BAUD = 115200
+SESSION_CONSOLE_LINES = 5000  # Console history kept per session
+
+
+class PortSession:
+    """One console on the bench: its port, console history, parsed errlogs and command state."""
+
+    def __init__(self, port, baud=DEFAULT_BAUD, adapter_type="Pico", console_lines=SESSION_CONSOLE_LINES):
+        self.port = port
+        self.baud = baud
+        self.adapter_type = adapter_type
+        self.serial_connection = None
+        self.framer = LineFramer()
+        self.console = ConsoleBuffer(console_lines)
+        self.parsed_errlogs = []  # ErrlogRecord objects in arrival order, without repeats
+        self._errlog_keys = set()
+        self.duplicate_count = 0  # Entries dropped because they were already in parsed_errlogs
+        self.last_sent_command = None
+        self.echo_handled = False
+        self.error = None  # Set when the port failed and the session was closed
+        self.bytes_received = 0
+        self.lines_received = 0
+
+    @property
+    def is_open(self):
+        return self.serial_connection is not None and self.serial_connection.is_open
+
+    def handle_data(self, data):
+        """Frames received bytes, records any errlog entries and returns the lines to show."""
+        self.bytes_received += len(data)
+        lines, self.echo_handled = filter_echo(self.framer.feed(data), self.last_sent_command, self.echo_handled)
+        if not lines:
+            return lines
+        self.lines_received += len(lines)
+        self.console.append("\n".join(f"> {line}" for line in lines), "recv_tag")
+        for line in lines:
+            if line.startswith("OK "):
+                try:
+                    record = parse_errlog_line(line)
+                except ValueError:
+                    continue
+                if record is None:
+                    continue
+                if record.key in self._errlog_keys:
+                    self.duplicate_count += 1
+                else:
+                    self._errlog_keys.add(record.key)
+                    record.entry_no = len(self.parsed_errlogs) + 1
+                    self.parsed_errlogs.append(record)
+        return lines
+
+    def __repr__(self):
+        return f"PortSession({self.port!r}, {self.baud})"
+
+
+class _CommEventWaiter:
+    """
+    Waits on serial port handles on Windows, where select() only takes sockets.
+
+    Every port has an overlapped WaitCommEvent(EV_RXCHAR) outstanding, each
+    with its own event; wait() blocks in WaitForMultipleObjects on those
+    events and a wake event, so a quiet bench costs no CPU either.
+    """
+
+    MAX_PORTS = 63  # WaitForMultipleObjects takes 64 handles, one of them is the wake event
+
+    class _Port:
+        __slots__ = ('overlapped', 'mask', 'armed')
+
+    def __init__(self):
+        from ctypes import wintypes
+        from serial import win32
+        self._win32 = win32
+        kernel32 = ctypes.WinDLL('kernel32')
+        self._wait_for_multiple = kernel32.WaitForMultipleObjects  # serial.win32 binds neither of these two
+        self._wait_for_multiple.restype = wintypes.DWORD
+        self._wait_for_multiple.argtypes = [wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE), wintypes.BOOL, wintypes.DWORD]
+        self._set_event = kernel32.SetEvent
+        self._set_event.restype = wintypes.BOOL
+        self._set_event.argtypes = [wintypes.HANDLE]
+        self._handle_array = wintypes.HANDLE * (self.MAX_PORTS + 1)
+        self._wake_event = win32.CreateEvent(None, 0, 0, None)  # Auto-reset
+        self._ports = {}  # session -> _Port
+
+    def register(self, session):
+        win32 = self._win32
+        port = self._Port()
+        port.overlapped = win32.OVERLAPPED()
+        port.overlapped.hEvent = win32.CreateEvent(None, 1, 0, None)  # Manual reset, as overlapped I/O requires
+        port.mask = win32.DWORD()
+        port.armed = False
+        # pyserial leaves EV_ERR set; EV_RXCHAR is what completes the wait when bytes arrive
+        win32.SetCommMask(session.serial_connection._port_handle, win32.EV_RXCHAR | win32.EV_ERR)
+        self._ports[session] = port
+
+    def unregister(self, session):
+        port = self._ports.pop(session, None)
+        if port is None:
+            return
+        win32 = self._win32
+        handle = session.serial_connection._port_handle
+        if port.armed and handle:
+            # The OVERLAPPED must outlive the wait, so cancel it and let it finish before dropping it
+            win32.CancelIoEx(handle, ctypes.byref(port.overlapped))
+            win32.GetOverlappedResult(handle, ctypes.byref(port.overlapped), ctypes.byref(win32.DWORD()), True)
+        win32.CloseHandle(port.overlapped.hEvent)
+
+    def wake(self):
+        self._set_event(self._wake_event)
+
+    def close(self):
+        self._win32.CloseHandle(self._wake_event)
+
+    def _arm(self, session, port):
+        """Starts the wait for the next received byte. Returns False if it completed at once or failed."""
+        win32 = self._win32
+        win32.ResetEvent(port.overlapped.hEvent)
+        if win32.WaitCommEvent(session.serial_connection._port_handle, ctypes.byref(port.mask), ctypes.byref(port.overlapped)):
+            return False
+        port.armed = win32.GetLastError() == win32.ERROR_IO_PENDING
+        return port.armed  # Any other error: the next read reports it
+
+    def wait(self, sessions):
+        """Blocks until a port has data or failed, or wake() was called. Returns the sessions to read."""
+        ready, waiting = [], []
+        for session in sessions:
+            port = self._ports.get(session)
+            if port is None:
+                continue
+            if not port.armed and not self._arm(session, port):
+                ready.append(session)
+                continue
+            try:
+                has_data = session.serial_connection.in_waiting > 0  # Bytes that arrived before the wait was armed
+            except (serial.SerialException, OSError):
+                has_data = True  # Let the read report the failure
+            (ready if has_data else waiting).append(session)
+        if ready:
+            return ready
+
+        win32 = self._win32
+        handles = self._handle_array(self._wake_event, *(self._ports[session].overlapped.hEvent for session in waiting))
+        self._wait_for_multiple(len(waiting) + 1, handles, False, win32.INFINITE)
+        for session in waiting:
+            port = self._ports[session]
+            if win32.WaitForSingleObject(port.overlapped.hEvent, 0) == 0:  # WAIT_OBJECT_0: this port's wait completed
+                win32.GetOverlappedResult(session.serial_connection._port_handle, ctypes.byref(port.overlapped),
+                                          ctypes.byref(win32.DWORD()), False)
+                port.armed = False
+                ready.append(session)
+        return ready
+
+
+class CaptureEngine:
+    """
+    Reads any number of serial ports from a single thread.
+
+    The thread sleeps until one of the ports has data, so it costs nothing
+    while the bench is quiet: on POSIX every port is registered with a
+    selector; on Windows, where serial handles cannot be selected on, a
+    _CommEventWaiter blocks on the port handles themselves.
+
+    Received lines are handed over as (session, [lines]) on output_queue. When
+    a port fails, (session, message) with a str message is queued and the
+    session is closed.
+    """
+
+    def __init__(self, use_selector=None):
+        self.sessions = []
+        self.output_queue = queue.Queue()
+        self._pending = queue.Queue()  # ('add'|'remove', session), applied on the engine thread
+        self._stop = threading.Event()
+        self._thread = None
+        self._use_selector = (os.name == 'posix') if use_selector is None else use_selector
+        if self._use_selector:
+            self._selector = selectors.DefaultSelector()
+            self._wake_r, self._wake_w = socket.socketpair()
+            self._wake_r.setblocking(False)
+            self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        else:
+            self._waiter = _CommEventWaiter()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="capture-engine", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stops the engine thread and closes every port."""
+        self._stop.set()
+        self._wake()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._use_selector:
+            self._selector.close()
+            self._wake_r.close()
+            self._wake_w.close()
+        else:
+            self._waiter.close()
+
+    def open_session(self, port, baud=DEFAULT_BAUD, adapter_type="Pico"):
+        """Opens a port and starts capturing it. Raises serial.SerialException if the port cannot be opened."""
+        if not self._use_selector and len(self.sessions) + self._pending.qsize() >= _CommEventWaiter.MAX_PORTS:
+            raise serial.SerialException(f"at most {_CommEventWaiter.MAX_PORTS} ports can be captured at once")
+        session = PortSession(port, baud, adapter_type)
+        # Non-blocking reads; the engine thread does the waiting for all ports
+        session.serial_connection = serial.Serial(port, baud, timeout=0)
+        self._pending.put(('add', session))
+        self._wake()
+        return session
+
+    def is_active(self):
+        """True while at least one session is open or about to be."""
+        return bool(self.sessions) or not self._pending.empty()
+
+    def close_session(self, session):
+        self._pending.put(('remove', session))
+        self._wake()
+
+    def send_command(self, session, command_str):
+        """Writes a command to one session's port and returns the message logged for it."""
+        full_command, log_msg = format_command(command_str, session.adapter_type)
+        session.last_sent_command = command_str.strip()
+        session.serial_connection.write(full_command)
+        session.console.append(log_msg, "sent_tag")
+        return log_msg
+
+    def _wake(self):
+        if self._use_selector:
+            try:
+                self._wake_w.send(b'\0')
+            except OSError:
+                pass  # Already closed
+        else:
+            self._waiter.wake()
+
+    def _apply_pending(self):
+        while True:
+            try:
+                action, session = self._pending.get_nowait()
+            except queue.Empty:
+                return
+            if action == 'add':
+                self.sessions.append(session)
+                if self._use_selector:
+                    self._selector.register(session.serial_connection.fileno(), selectors.EVENT_READ, session)
+                else:
+                    self._waiter.register(session)
+            elif session in self.sessions:
+                self._remove(session)
+
+    def _remove(self, session):
+        self.sessions.remove(session)
+        if self._use_selector:
+            try:
+                self._selector.unregister(session.serial_connection.fileno())
+            except (KeyError, ValueError, OSError):
+                pass
+        else:
+            self._waiter.unregister(session)
+        try:
+            session.serial_connection.close()
+        except Exception:
+            pass
+
+    def _read(self, session):
+        try:
+            connection = session.serial_connection
+            data = connection.read(min(connection.in_waiting, READ_CHUNK_SIZE) or 1)
+        except (serial.SerialException, OSError) as e:
+            session.error = f"(PC ERROR) COM PORT UNPLUGGED OR BUSY: {e}"
+            self._remove(session)
+            self.output_queue.put((session, session.error))
+            return False
+        if not data:
+            return False
+        lines = session.handle_data(data)
+        if lines:
+            self.output_queue.put((session, lines))
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._apply_pending()
+            if self._use_selector:
+                for key, _ in self._selector.select():
+                    if key.data is None:
+                        try:
+                            while self._wake_r.recv(4096): pass
+                        except BlockingIOError:
+                            pass
+                    elif key.data in self.sessions:
+                        self._read(key.data)
+            else:
+                for session in self._waiter.wait(self.sessions):
+                    if session in self.sessions:
+                        self._read(session)
+        self._apply_pending()
+        for session in list(self.sessions):
+            self._remove(session)
+
+
+def _parse_port_spec(spec, default_baud):
+    port, sep, baud = spec.rpartition('@')
+    if not sep:
+        return spec, default_baud
+    return port, int(baud)
+
+
+def _default_db_path():
+    # Next to the exe or main.py, where the GUI keeps its history database
+    base = os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base, DEFAULT_DB_FILENAME)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py capture", description="Capture several PS5 UART consoles at once.")
+    parser.add_argument('ports', nargs='+', help="serial ports, optionally with a baud rate as PORT@BAUD")
+    parser.add_argument('--baud', type=int, default=DEFAULT_BAUD, help="baud rate for ports without @BAUD")
+    parser.add_argument('--adapter', default="Pico", help="adapter type, decides whether commands get a checksum")
+    parser.add_argument('--send', action='append', default=[], metavar='CMD', help="command to send to every port after opening (repeatable)")
+    parser.add_argument('--log-dir', help="also write each port's lines to DIR/<port>.log")
+    parser.add_argument('--decode', action='store_true', help="also print every new errlog entry decoded, tab-separated")
+    parser.add_argument('--store', nargs='?', const=_default_db_path(), metavar='DB',
+                        help="write new errlog entries to the history database the GUI reads (default: the GUI's)")
+    args = parser.parse_args(argv)
+
+    store = None
+    if args.store:
+        try:
+            store = ErrlogStore(args.store)
+        except sqlite3.Error as e:
+            print(f"(PC ERROR) Cannot open errlog history {args.store}: {e}", file=sys.stderr)
+            return 1
+        if store.removed_duplicates:
+            print(f"Errlog history: removed {store.removed_duplicates} repeated entries from {args.store}", file=sys.stderr)
+    engine = CaptureEngine()
+    engine.start()
+    log_files = {}
+    errlogs_seen = {}  # session -> number of its parsed_errlogs already printed or stored
+    try:
+        for spec in args.ports:
+            try:
+                port, baud = _parse_port_spec(spec, args.baud)
+                session = engine.open_session(port, baud, args.adapter)
+            except (serial.SerialException, ValueError) as e:
+                print(f"(PC ERROR) Cannot open {spec}: {e}", file=sys.stderr)
+                continue
+            if args.log_dir:
+                os.makedirs(args.log_dir, exist_ok=True)
+                name = port.replace(os.sep, '_').replace('/', '_').replace(':', '_').strip('_')
+                log_files[session] = open(os.path.join(args.log_dir, f"{name}.log"), 'a', encoding='utf-8')
+            for command in args.send:
+                print(f"{session.port}\t{engine.send_command(session, command)}")
+
+        while True:
+            try:
+                session, lines = engine.output_queue.get(timeout=0.5)  # Timeout keeps Ctrl+C responsive on Windows
+            except queue.Empty:
+                if not engine.is_active(): break # Every port failed or none could be opened
+                continue
+            if isinstance(lines, str):
+                print(f"{session.port}\t{lines}", file=sys.stderr)
+                continue
+            out = "".join(f"{session.port}\t{line}\n" for line in lines)
+            sys.stdout.write(out)
+            if session in log_files:
+                log_files[session].write("".join(f"{line}\n" for line in lines))
+                log_files[session].flush()
+            # The engine thread appends a line's records before queueing the line, so they are all here
+            new_records = session.parsed_errlogs[errlogs_seen.get(session, 0):]
+            errlogs_seen[session] = errlogs_seen.get(session, 0) + len(new_records)
+            for record in new_records:
+                if args.decode:
+                    sys.stdout.write(f"{session.port}\terrlog\t" + "\t".join(batch_decode.decode_record(record).values()) + "\n")
+                if store:
+                    store.add(record, session.port)
+            if store and new_records:
+                store.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.stop()
+        for log_file in log_files.values():
+            log_file.close()
+        if store:
+            store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+# console.py
+# This file contains the bounded, batched console used for the UART output pane.
+
+import collections
+
+DEFAULT_MAX_LINES = 5000  # Lines kept before the oldest ones are evicted
+TRIM_SLACK_LINES = 500  # Evict only after overshooting by this many lines, so trimming happens in bulk
+
+
+class ConsoleBuffer:
+    """
+    Keeps the appends not yet shown, up to max_lines messages.
+
+    This part has no Tk dependency, so it can also back a console that is
+    not on screen (e.g. a capture session running in the background): the
+    oldest messages are dropped while nobody takes them, so the buffer then
+    holds the most recent output, ready for whoever shows it next.
+    """
+
+    def __init__(self, max_lines=DEFAULT_MAX_LINES):
+        self.max_lines = max_lines
+        self._pending = collections.deque(maxlen=max_lines)
+
+    def append(self, message, tag=None):
+        """Queues a message (one or more lines) for the next flush."""
+        if not message.endswith('\n'): message += '\n'
+        self._pending.append((message, tag))
+
+    def take_pending(self):
+        """Returns and forgets the (text, tag) pairs appended since the last call."""
+        pending = list(self._pending)
+        self._pending.clear()
+        return pending
+
+    def has_pending(self):
+        return bool(self._pending)
+
+    def clear(self):
+        self._pending.clear()
+
+
+class TextConsole:
+    """
+    Writes a ConsoleBuffer into a read-only Tk Text widget.
+
+    Appends are coalesced until the Tk loop is idle, then written with one
+    insert, one state toggle and one scroll. The widget is trimmed back to
+    max_lines in bulk, so its size and the cost per line stay bounded.
+    """
+
+    def __init__(self, text_widget, max_lines=DEFAULT_MAX_LINES, trim_slack=TRIM_SLACK_LINES):
+        self.widget = text_widget
+        self.buffer = ConsoleBuffer(max_lines)
+        self.max_lines = max_lines
+        self.trim_slack = trim_slack
+        self._widget_lines = 0
+        self._flush_scheduled = False
+
+    def write(self, message, tag=None):
+        self.buffer.append(message, tag)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.widget.after_idle(self.flush)
+
+    def flush(self):
+        """Writes all pending appends to the widget in a single batch."""
+        self._flush_scheduled = False
+        pending = self.buffer.take_pending()
+        if not pending:
+            return
+
+        # Merge consecutive messages with the same tag, then pass every chunk to one insert call
+        insert_args = []
+        run_text, run_tag = [], pending[0][1]
+        for text, tag in pending:
+            if tag != run_tag:
+                insert_args.extend(("".join(run_text), (run_tag,) if run_tag else ()))
+                run_text, run_tag = [], tag
+            run_text.append(text)
+            self._widget_lines += text.count('\n')
+        insert_args.extend(("".join(run_text), (run_tag,) if run_tag else ()))
+
+        self.widget.configure(state='normal')
+        self.widget.insert('end', *insert_args)
+        if self._widget_lines > self.max_lines + self.trim_slack:
+            excess = self._widget_lines - self.max_lines
+            self.widget.delete('1.0', f'{excess + 1}.0')
+            self._widget_lines -= excess
+        self.widget.see('end')
+        self.widget.configure(state='disabled')
+
+    def clear(self):
+        self.buffer.clear()
+        self.widget.configure(state='normal')
+        self.widget.delete('1.0', 'end')
+        self.widget.configure(state='disabled')
+        self._widget_lines = 0
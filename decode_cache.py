@@ -0,0 +1,95 @@
+# decode_cache.py
+# This file contains the shared LRU cache in front of the field decoders.
+
+import collections
+import threading
+
+import decoders
+
+DEFAULT_MAX_ENTRIES = 4096  # Decoded (field, raw value) pairs kept before the least recently used is evicted
+
+def _describe_code(err_code_hex):
+    import error_databases  # The detailed database is only loaded once a description is first needed
+    return error_databases.cod3r_database(err_code_hex)
+
+
+# Errlog field name -> decoder. 'Description' is the detailed text for the 'Code' field.
+FIELD_DECODERS = {
+    'Code': decoders._decode_err_code,
+    'Rtc': decoders._decode_rtc,
+    'PowState': decoders._decode_pw_state,
+    'UpCause': decoders._decode_upcause,
+    'SeqNo': decoders._decode_seq_no,
+    'DevPm': decoders._decode_devpower,
+    'T_SoC': decoders._decode_temp_soc,
+    'T_Env': decoders._decode_temp_env,
+    'Description': _describe_code,
+}
+
+
+class DecodeCache:
+    """
+    Bounded LRU cache of decoded field values keyed on (field, raw value).
+
+    Errlog fields repeat a lot (the same records come back on every re-fetch),
+    so decoding each distinct raw value once is enough. Hit, miss and eviction
+    counters show how well the cache is doing.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def decode(self, field, raw_value):
+        """Returns the decoded text for a raw field value, decoding it only on a miss."""
+        key = (field, raw_value)
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                pass
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        # Decode outside the lock; a concurrent miss on the same key just decodes twice
+        value = FIELD_DECODERS[field](raw_value)
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = value
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+# Shared by the GUI and the batch tools
+default_cache = DecodeCache()
+
+
+def decode(field, raw_value):
+    """Decodes a raw errlog field through the shared cache."""
+    return default_cache.decode(field, raw_value)
@@ -3,6 +3,8 @@
 
 import datetime
 
+from prefix_rules import PrefixRuleSet
+
 # Constants used by decoder functions
 TIME_ZERO = 1325376000  # UNIX timestamp for January 1, 2012
 SEQ_DATABASE = {
@@ -178,6 +180,120 @@ SEQ_DATABASE = {
     "2117": "Dev HDMI 5V Power On", "2134": "Dev VBURN ON", "FFFF": "Unknown SeqNo"
 }
 
+# Short error code descriptions: (code prefix, severity tag, message).
+# 8-character entries are exact codes, shorter ones are catch-alls for a code
+# family; the longest matching entry wins (e.g. 80050000 over 8005).
+ERR_CODE_RULES = (
+    ('80000001', None, 'Failed to access thermal sensor'),
+    ('80000004', 'CRITICAL', 'AC/DC Power Fail'),
+    ('80000005', 'CRITICAL', 'Main SoC CPU Power Fail'),
+    ('80000006', 'CRITICAL', 'Main SoC GFX Power Fail'),
+    ('80000007', None, 'Main SoC Thrm Hi Tempr Abnormal'),
+    ('80000008', None, 'Drive Dead Notify Timeout'),
+    ('80000009', 'Common', 'AC Detect CHECK PSU'),
+    ('8000000A', 'CRITICAL', 'VRM HOT Fatal'),
+    ('8000000B', None, 'Unexpected Thermal Shutdown'),
+    ('8000000C', None, 'MSoC Tempr Alert'),
+    ('80050000', 'CRITICAL', 'SoC VRM Power Fail (CPU)'),
+    ('8005', 'CRITICAL', 'SoC VRM Power Fail (CPU)'),
+    ('80060000', 'CRITICAL', 'SoC VRM Power Fail (GFX)'),
+    ('8006', 'CRITICAL', 'SoC VRM Power Fail (GFX)'),
+    ('8080', 'CRITICAL', 'Fatal Shutdown by OS request'),
+    ('80810001', 'CRITICAL', 'PSQ Pre_Post Fail'),
+    ('80810002', None, 'Power Seq: NVS Access Error'),
+    ('80810013', None, 'Power Seq: ScCmd DRAM Init Error'),
+    ('80810014', None, 'Power Seq: ScCmd Link Up Failure'),
+    ('80830000', None, 'Main SoC Sync Flood'),
+    ('80840000', 'Common', 'PCIe Link Down'),
+    ('80870001', None, 'Flash Cont:RAM Protect Error'),
+    ('80870002', None, 'Flash Cont:RAM Parity Error'),
+    ('80870003', None, 'Flash Cont:Boot Failed'),
+    ('80870004', None, 'Flash Cont:Boot Failed NoRecord'),
+    ('80870005', None, 'Flash Cont:Boot Failed State Err'),
+    ('808710', None, 'Flash Cont:ScCmd Response Error'),
+    ('8088', None, 'Flash Cont:Boot EAP Error'),
+    ('8089', None, 'Flash Cont:Boot EFC Error'),
+    ('808A', None, 'Flash Cont:Temper Error'),
+    ('808B', None, 'Flash Cont:Watch Dog Timer'),
+    ('808C', 'ERROR', 'USB Type-C Error'), # Corrected spelling
+    ('808D0000', 'CRITICAL', 'Thermal Shutdown: Main SoC'),
+    ('808D0001', None, 'Thermal Shutdown: Local Sensor 1'),
+    ('808D0002', None, 'Thermal Shutdown: Local Sensor 2'),
+    ('808D0003', None, 'Thermal Shutdown: Local Sensor 3'),
+    ('808E0000', None, 'COM Err:Close Error'),
+    ('808E0001', None, 'COM Err:Open Error'),
+    ('808E0002', None, 'COM Err:Host Write Flag Error'),
+    ('808E0003', None, 'COM Err:EMC Read Flag Error'),
+    ('808E0004', None, 'COM Err:Write Flag Error'),
+    ('808E0005', None, 'COM Err:Wait SIG1 Error'),
+    ('808E0006', None, 'COM Err:Reset request from Host'),
+    ('808E0007', None, 'COM Err:Checksum Error'),
+    ('808F0001', None, 'SMCU Com Err:Timeout'),
+    ('808F0002', None, 'SMCU Com Err:Reset'),
+    ('808F0003', None, 'SMCU Com Err:TIS Error'),
+    ('808F00FF', None, 'SMCU Com Err:Undefined'),
+    ('8090', 'CRITICAL', 'Fatal Shutdown by Error Add Code'),
+    ('8091', 'CRITICAL', 'SSD PMIC Error'),
+    ('80C00114', None, 'Watch Dog For SoC'),
+    ('80C00115', None, 'Watch Dog For EAP'),
+    ('80C0012C', 'Common', 'BD Drive Detached'),
+    ('80C0012D', None, 'EMC Watch Dog Timer Error'),
+    ('80C0012E', None, 'ADC Error (Button)'),
+    ('80C0012F', None, 'ADC Error (BD Drive)'),
+    ('80C00130', None, 'ADC Error (AC In Det)'),
+    ('80C00131', 'ERROR', 'USB Over Current'),
+    ('80C00132', None, 'FAN Storage Access Failed'),
+    ('80C00133', None, 'USB-BT FW Header Invalid'),
+    ('80C00134', None, 'USB-BT BT Command Error'),
+    ('80C00135', None, 'USB-BT Memory Malloc Failed'),
+    ('80C00136', None, 'USB-BT Device Not Found'),
+    ('80C00137', None, 'USB-BT MISC Error'),
+    ('80C00138', None, 'Flash Cont Interrupt HW Error'),
+    ('80C00139', None, 'BD Drive Eject Assert Delayed'),
+    ('80D001', None, 'USB-BT Error (Bulk Out)'),
+    ('80D002', None, 'USB-BT Error (Bulk In)'),
+    ('80D003', None, 'USB-BT Error (Bt Init)'),
+    ('80D004', None, 'USB-BT Error (Download Firmware)'),
+    ('80D005', None, 'USB-BT Error (Release Device)'),
+    ('80D006', None, 'USB-BT Error (Exec Cmd0)'),
+    ('80D007', None, 'USB-BT Error (Exec Cmd1)'),
+    ('B0', 'CRITICAL', 'Sonics Bus Error'),
+    ('C001', None, 'Main SoC Access Error (I2C)'),
+    ('C002', 'Common', 'SoC thermal sensor issue'),
+    ('C003', None, 'Main SoC Access Error (SB-RMI)'),
+    ('C00B', None, 'Serial Flash Access Error'),
+    ('C00C', None, 'VRM Controller Access Error'),
+    ('C00D', None, 'PMIC (Subsystem) Access Error'),
+    ('C010', None, 'Flash Controller Access Error'),
+    ('C011', None, 'Potentiometer Access Error'),
+    ('C015', None, 'PCIe Redriver Access Errror'),
+    ('C016', None, 'PMIC (SSD) Access Error'),
+    ('C081', None, 'HDMI Tx Access Error'),
+    ('C090', None, 'USB Type-C PD Cont Access Error'),
+    ('C091', None, 'USB Type-C USB/DP Mux Accss Err'),
+    ('C092', None, 'USB Type-C Redriver Access Error'),
+    ('C0FE', None, 'Dummy Error Code'),
+)
+ERR_CODE_TABLE = PrefixRuleSet(
+    (code, f"({tag}) {msg}" if tag else msg) for code, tag, msg in ERR_CODE_RULES
+)
+
+# Power state: host OS state from characters 2-3, falling back to the first of them
+HOST_OS_STATE_RULES = (
+    ('00', 'SysReady:'), ('01', 'MaOnStby:'), ('20', 'BIOS____:'), ('30', 'BIOS____:'),
+    ('40', 'EAP_Redy:'), ('FF', 'HstOsOFF:'),
+    ('0', 'Reserved:'), ('1', 'PSP____:'), ('4', 'EAP____:'),
+) + tuple((c, 'Kernel__:') for c in '56789AB') + tuple((c, 'IntPrcss:') for c in 'CDEF')
+HOST_OS_STATE_TABLE = PrefixRuleSet(HOST_OS_STATE_RULES, default='        ')
+
+# Power state: EMC state from characters 6-7
+EMC_STATE_RULES = (
+    ('00', 'ACIN_L'), ('01', 'Stanby'), ('02', 'PG2_ON'), ('03', 'EFC_ON'), ('04', 'EAP_ON'),
+    ('05', 'SOC_ON'), ('06', 'ErrDET'), ('07', 'FtlErr'), ('08', 'NvrBot'), ('09', 'FrcOFF'),
+    ('0A', 'FofBTd'),
+)
+EMC_STATE_TABLE = PrefixRuleSet(EMC_STATE_RULES, default='______')
+
 def _decode_rtc(rtc_hex): # Removed self
     """Decodes RTC hex value to a human-readable date and time."""
     if rtc_hex == 'N/A':
@@ -192,230 +308,7 @@ def _decode_err_code(err_code_hex): # Removed self
     """Provides a short description for an error code."""
     if err_code_hex == 'N/A':
         return "N/A"
-    
-    TARGET_MSG_LENGTH = 25
-    msg_text = f"Unknown Code ({err_code_hex})"
-    prefix = ""
-    if err_code_hex[0:8] == '80000001':
-        msg_text = 'Failed to access thermal sensor'
-    elif err_code_hex[0:8] == '80000004':
-        prefix = "(CRITICAL) "
-        msg_text = 'AC/DC Power Fail'
-    elif err_code_hex[0:8] == '80000005':
-        prefix = "(CRITICAL) "
-        msg_text = 'Main SoC CPU Power Fail'
-    elif err_code_hex[0:8] == '80000006':
-        prefix = "(CRITICAL) "
-        msg_text = 'Main SoC GFX Power Fail'
-    elif err_code_hex[0:8] == '80000007':
-        msg_text = 'Main SoC Thrm Hi Tempr Abnormal'
-    elif err_code_hex[0:8] == '80000008':
-        msg_text = 'Drive Dead Notify Timeout'
-    elif err_code_hex[0:8] == '80000009':
-        prefix = "(Common) "
-        msg_text = 'AC Detect CHECK PSU' # Your updated message
-    elif err_code_hex[0:8] == '8000000A':
-        prefix = "(CRITICAL) "
-        msg_text = 'VRM HOT Fatal'
-    elif err_code_hex[0:8] == '8000000B':
-        msg_text = 'Unexpected Thermal Shutdown'
-    elif err_code_hex[0:8] == '8000000C':
-        msg_text = 'MSoC Tempr Alert'
-    
-    # Catch-all for 8005xxxx should come after more specific 80050000 if any
-    elif err_code_hex[0:8] == '80050000':
-        prefix = "(CRITICAL) "
-        msg_text = 'SoC VRM Power Fail (CPU)'
-    elif err_code_hex[0:4] == '8005': # Catch-all for 8005 prefix
-        prefix = "(CRITICAL) "
-        msg_text = 'SoC VRM Power Fail (CPU)' 
-    
-    elif err_code_hex[0:8] == '80060000':
-        prefix = "(CRITICAL) "
-        msg_text = 'SoC VRM Power Fail (GFX)'
-    elif err_code_hex[0:4] == '8006': # Catch-all for 8006 prefix
-        prefix = "(CRITICAL) "
-        msg_text = 'SoC VRM Power Fail (GFX)'
-        
-    elif err_code_hex[0:4] == '8080': # Assuming this is an 8-char code family
-        prefix = "(CRITICAL) "
-        msg_text = 'Fatal Shutdown by OS request'
-    
-    elif err_code_hex[0:8] == '80810001':
-        prefix = "(CRITICAL) "
-        msg_text = 'PSQ Pre_Post Fail' # Simplified your example
-    elif err_code_hex[0:8] == '80810002':
-        msg_text = 'Power Seq: NVS Access Error'
-    elif err_code_hex[0:8] == '80810013':
-        msg_text = 'Power Seq: ScCmd DRAM Init Error'
-    elif err_code_hex[0:8] == '80810014':
-        msg_text = 'Power Seq: ScCmd Link Up Failure'
-        
-    elif err_code_hex[0:8] == '80830000':
-        msg_text = 'Main SoC Sync Flood'
-    elif err_code_hex[0:8] == '80840000':
-        prefix = "(Common) "
-        msg_text = 'PCIe Link Down'
-        
-    elif err_code_hex[0:8] == '80870001':
-        msg_text = 'Flash Cont:RAM Protect Error'
-    elif err_code_hex[0:8] == '80870002':
-        msg_text = 'Flash Cont:RAM Parity Error'
-    elif err_code_hex[0:8] == '80870003':
-        msg_text = 'Flash Cont:Boot Failed'
-    elif err_code_hex[0:8] == '80870004':
-        msg_text = 'Flash Cont:Boot Failed NoRecord'
-    elif err_code_hex[0:8] == '80870005':
-        msg_text = 'Flash Cont:Boot Failed State Err'
-    elif err_code_hex[0:6] == '808710': # 6-char prefix
-        msg_text = 'Flash Cont:ScCmd Response Error'
-        
-    elif err_code_hex[0:4] == '8088':
-        msg_text = 'Flash Cont:Boot EAP Error'
-    elif err_code_hex[0:4] == '8089':
-        msg_text = 'Flash Cont:Boot EFC Error'
-    elif err_code_hex[0:4] == '808A':
-        msg_text = 'Flash Cont:Temper Error'
-    elif err_code_hex[0:4] == '808B':
-        msg_text = 'Flash Cont:Watch Dog Timer'
-    elif err_code_hex[0:4] == '808C':
-        prefix = "(ERROR) "
-        msg_text = 'USB Type-C Error' # Corrected spelling
-        
-    elif err_code_hex[0:8] == '808D0000':
-        prefix = "(CRITICAL) "
-        msg_text = 'Thermal Shutdown: Main SoC'
-    elif err_code_hex[0:8] == '808D0001':
-        msg_text = 'Thermal Shutdown: Local Sensor 1'
-    elif err_code_hex[0:8] == '808D0002':
-        msg_text = 'Thermal Shutdown: Local Sensor 2'
-    elif err_code_hex[0:8] == '808D0003':
-        msg_text = 'Thermal Shutdown: Local Sensor 3'
-        
-    elif err_code_hex[0:8] == '808E0000':
-        msg_text = 'COM Err:Close Error'
-    elif err_code_hex[0:8] == '808E0001':
-        msg_text = 'COM Err:Open Error'
-    elif err_code_hex[0:8] == '808E0002':
-        msg_text = 'COM Err:Host Write Flag Error'
-    elif err_code_hex[0:8] == '808E0003':
-        msg_text = 'COM Err:EMC Read Flag Error'
-    elif err_code_hex[0:8] == '808E0004':
-        msg_text = 'COM Err:Write Flag Error'
-    elif err_code_hex[0:8] == '808E0005':
-        msg_text = 'COM Err:Wait SIG1 Error'
-    elif err_code_hex[0:8] == '808E0006':
-        msg_text = 'COM Err:Reset request from Host'
-    elif err_code_hex[0:8] == '808E0007':
-        msg_text = 'COM Err:Checksum Error'
-        
-    elif err_code_hex[0:8] == '808F0001':
-        msg_text = 'SMCU Com Err:Timeout'
-    elif err_code_hex[0:8] == '808F0002':
-        msg_text = 'SMCU Com Err:Reset'
-    elif err_code_hex[0:8] == '808F0003':
-        msg_text = 'SMCU Com Err:TIS Error'
-    elif err_code_hex[0:8] == '808F00FF':
-        msg_text = 'SMCU Com Err:Undefined'
-        
-    elif err_code_hex[0:4] == '8090':
-        prefix = "(CRITICAL) "
-        msg_text = 'Fatal Shutdown by Error Add Code'
-    elif err_code_hex[0:4] == '8091':
-        prefix = "(CRITICAL) "
-        msg_text = 'SSD PMIC Error'
-        
-    elif err_code_hex[0:8] == '80C00114':
-        msg_text = 'Watch Dog For SoC'
-    elif err_code_hex[0:8] == '80C00115':
-        msg_text = 'Watch Dog For EAP'
-    elif err_code_hex[0:8] == '80C0012C':
-        prefix = "(Common) "
-        msg_text = 'BD Drive Detached'
-    elif err_code_hex[0:8] == '80C0012D':
-        msg_text = 'EMC Watch Dog Timer Error'
-    elif err_code_hex[0:8] == '80C0012E':
-        msg_text = 'ADC Error (Button)'
-    elif err_code_hex[0:8] == '80C0012F':
-        msg_text = 'ADC Error (BD Drive)'
-    elif err_code_hex[0:8] == '80C00130':
-        msg_text = 'ADC Error (AC In Det)'
-    elif err_code_hex[0:8] == '80C00131':
-        prefix = "(ERROR) "
-        msg_text = 'USB Over Current'
-    elif err_code_hex[0:8] == '80C00132':
-        msg_text = 'FAN Storage Access Failed'
-    elif err_code_hex[0:8] == '80C00133':
-        msg_text = 'USB-BT FW Header Invalid'
-    elif err_code_hex[0:8] == '80C00134':
-        msg_text = 'USB-BT BT Command Error'
-    elif err_code_hex[0:8] == '80C00135':
-        msg_text = 'USB-BT Memory Malloc Failed'
-    elif err_code_hex[0:8] == '80C00136':
-        msg_text = 'USB-BT Device Not Found'
-    elif err_code_hex[0:8] == '80C00137':
-        msg_text = 'USB-BT MISC Error'
-    elif err_code_hex[0:8] == '80C00138':
-        msg_text = 'Flash Cont Interrupt HW Error'
-    elif err_code_hex[0:8] == '80C00139':
-        msg_text = 'BD Drive Eject Assert Delayed'
-        
-    elif err_code_hex[0:6] == '80D001': msg_text = 'USB-BT Error (Bulk Out)'
-    elif err_code_hex[0:6] == '80D002': msg_text = 'USB-BT Error (Bulk In)'
-    elif err_code_hex[0:6] == '80D003': msg_text = 'USB-BT Error (Bt Init)'
-    elif err_code_hex[0:6] == '80D004': msg_text = 'USB-BT Error (Download Firmware)'
-    elif err_code_hex[0:6] == '80D005': msg_text = 'USB-BT Error (Release Device)'
-    elif err_code_hex[0:6] == '80D006': msg_text = 'USB-BT Error (Exec Cmd0)'
-    elif err_code_hex[0:6] == '80D007': msg_text = 'USB-BT Error (Exec Cmd1)'
-        
-    elif err_code_hex[0:2] == 'B0': # B0xxxxxx
-        prefix = "(CRITICAL) "
-        msg_text = 'Sonics Bus Error'
-        
-    elif err_code_hex[0:4] == 'C001':
-        msg_text = 'Main SoC Access Error (I2C)'
-    elif err_code_hex[0:4] == 'C002':
-        prefix = "(Common) "
-        msg_text = 'SoC thermal sensor issue' # Your updated message
-    elif err_code_hex[0:4] == 'C003':
-        msg_text = 'Main SoC Access Error (SB-RMI)'
-    elif err_code_hex[0:4] == 'C00B':
-        msg_text = 'Serial Flash Access Error'
-    elif err_code_hex[0:4] == 'C00C':
-        msg_text = 'VRM Controller Access Error'
-    elif err_code_hex[0:4] == 'C00D':
-        msg_text = 'PMIC (Subsystem) Access Error'
-    elif err_code_hex[0:4] == 'C010':
-        msg_text = 'Flash Controller Access Error'
-    elif err_code_hex[0:4] == 'C011':
-        msg_text = 'Potentiometer Access Error'
-    elif err_code_hex[0:4] == 'C015':
-        msg_text = 'PCIe Redriver Access Errror'
-    elif err_code_hex[0:4] == 'C016':
-        msg_text = 'PMIC (SSD) Access Error'
-    elif err_code_hex[0:4] == 'C081':
-        msg_text = 'HDMI Tx Access Error'
-    elif err_code_hex[0:4] == 'C090':
-        msg_text = 'USB Type-C PD Cont Access Error'
-    elif err_code_hex[0:4] == 'C091':
-        msg_text = 'USB Type-C USB/DP Mux Accss Err'
-    elif err_code_hex[0:4] == 'C092':
-        msg_text = 'USB Type-C Redriver Access Error'
-    elif err_code_hex[0:4] == 'C0FE':
-        msg_text = 'Dummy Error Code'
-    padded_msg_text = msg_text.strip().ljust(TARGET_MSG_LENGTH)
-    final_msg = f"{prefix}{padded_msg_text}"
-
-    if msg_text == f"Unknown Code ({err_code_hex})" and prefix == "":
-         return f"Unknown Code ({err_code_hex})"
-
-    if len(msg_text.strip()) < TARGET_MSG_LENGTH and msg_text != f"Unknown Code ({err_code_hex})":
-        padded_msg_text = msg_text.strip().ljust(TARGET_MSG_LENGTH)
-    else:
-        padded_msg_text = msg_text.strip()
-
-    final_msg = f"{prefix}{padded_msg_text}"
-    return final_msg.strip()
+    return ERR_CODE_TABLE.lookup(err_code_hex) or f"Unknown Code ({err_code_hex})"
 
 
 def _decode_pw_state(pw_state_hex): # Removed self
@@ -424,36 +317,8 @@ def _decode_pw_state(pw_state_hex): # Removed self
     try:
         if not (len(pw_state_hex) == 8 and all(c in '0123456789abcdefABCDEF' for c in pw_state_hex)):
             return "Invalid PwState Hex"
-        # ... (rest of your _decode_pw_state logic, ensuring it doesn't use self) ...
-        msg1 = '        '
-        host_os_state_code = pw_state_hex[2:4].upper()
-        if host_os_state_code == '00': msg1 = 'SysReady:'
-        elif host_os_state_code == '01': msg1 = 'MaOnStby:'
-        elif host_os_state_code == '20': msg1 = 'BIOS____:'
-        elif host_os_state_code == '30': msg1 = 'BIOS____:'
-        elif host_os_state_code == '40': msg1 = 'EAP_Redy:'
-        elif host_os_state_code == 'FF': msg1 = 'HstOsOFF:'
-        else:
-            prefix_char = pw_state_hex[2].upper()
-            if prefix_char == '0': msg1 = 'Reserved:'
-            elif prefix_char == '1': msg1 = 'PSP____:'
-            elif prefix_char == '4': msg1 = 'EAP____:'
-            elif prefix_char in ['5','6','7','8','9','A','B']: msg1 = 'Kernel__:'
-            elif prefix_char in ['C','D','E','F']: msg1 = 'IntPrcss:'
-
-        emc_state_code = pw_state_hex[6:8].upper()
-        msg2 = '______'
-        if emc_state_code == '00': msg2 = 'ACIN_L'
-        elif emc_state_code == '01': msg2 = 'Stanby'
-        elif emc_state_code == '02': msg2 = 'PG2_ON'
-        elif emc_state_code == '03': msg2 = 'EFC_ON'
-        elif emc_state_code == '04': msg2 = 'EAP_ON'
-        elif emc_state_code == '05': msg2 = 'SOC_ON'
-        elif emc_state_code == '06': msg2 = 'ErrDET'
-        elif emc_state_code == '07': msg2 = 'FtlErr'
-        elif emc_state_code == '08': msg2 = 'NvrBot'
-        elif emc_state_code == '09': msg2 = 'FrcOFF'
-        elif emc_state_code == '0A': msg2 = 'FofBTd'
+        msg1 = HOST_OS_STATE_TABLE.lookup(pw_state_hex[2:4].upper())
+        msg2 = EMC_STATE_TABLE.lookup(pw_state_hex[6:8].upper())
         return msg1 + msg2
     except Exception:
         return "Decode PwState Error"
@@ -489,11 +354,14 @@ def convert_to_celsius(hex_value): # Removed self
     if hex_value == 'N/A' or not hex_value:
         return "N/A"
     try:
-        temp_celsius_float = int(hex_value, 16) / 256.0
-        return f"{temp_celsius_float:.2f} °C"
+        return format_celsius(int(hex_value, 16))
     except (ValueError, TypeError):
         return "Invalid Hex Temp"
 
+def format_celsius(raw_value):
+    """Formats an already parsed temperature (1/256 °C units) as a Celsius string."""
+    return f"{raw_value / 256.0:.2f} °C"
+
 def _decode_seq_no(seq_no_hex): # Removed self (this is the correct one, remove the duplicate)
     """Decodes sequence number hex using the SEQ_DATABASE."""
     if seq_no_hex == 'N/A' or not seq_no_hex:
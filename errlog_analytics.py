@@ -0,0 +1,190 @@
+# errlog_analytics.py
+# This file contains the fleet statistics over errlog history: code frequencies, RTC histograms and
+# SoC/ENV temperature distributions, computed with NumPy over typed columns rather than per-record loops.
+# NumPy is optional; load_numpy() reports whether it is installed and the GUI says so when it is not.
+
+import datetime
+
+import decoders
+
+np = None  # numpy, once load_numpy() has imported it
+NUMPY_AVAILABLE = None  # None until load_numpy() has run
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+DEFAULT_RTC_BINS = 24
+TEMP_BIN_CELSIUS = 10  # Width of a temperature column in the cross tab
+REPORT_TOP_CODES = 15  # Codes listed in each table of the report
+
+
+def load_numpy():
+    """Imports NumPy on first use. Returns True if it is available."""
+    global np, NUMPY_AVAILABLE
+    if NUMPY_AVAILABLE is None:
+        try:
+            import numpy
+            np, NUMPY_AVAILABLE = numpy, True
+        except ImportError:
+            NUMPY_AVAILABLE = False
+    return NUMPY_AVAILABLE
+
+
+class ErrlogColumns:
+    """
+    Errlog records held as NumPy columns, one element per record.
+
+    code and rtc are uint32, t_soc and t_env the raw uint16 readings (1/256
+    °C, unsigned as in decoders and ErrlogRecord) and console a uint16
+    number indexing console_names. Every aggregation works on whole
+    columns; only the report formatting loops, over its few output rows.
+    """
+
+    def __init__(self, code, rtc, t_soc, t_env, console, console_names):
+        self.code = code
+        self.rtc = rtc
+        self.t_soc = t_soc
+        self.t_env = t_env
+        self.console = console
+        self.console_names = list(console_names)
+
+    @classmethod
+    def from_values(cls, values, console, console_names):
+        """Builds the columns from an int64 array of (code, rtc, t_soc, t_env) rows and the console number of each row."""
+        # Through int64: astype() then keeps the low 32/16 bits instead of rejecting out-of-range values
+        values = values.reshape(-1, 4)
+        return cls(values[:, 0].astype(np.uint32), values[:, 1].astype(np.uint32), values[:, 2].astype(np.uint16),
+                   values[:, 3].astype(np.uint16), np.asarray(console, dtype=np.uint16), console_names)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Builds the columns from (console, code, rtc, t_soc, t_env) tuples or a cursor over them, e.g. ErrlogStore.columns()."""
+        if not load_numpy():
+            raise RuntimeError("NumPy is not installed")
+        table = np.array(rows.fetchall() if hasattr(rows, 'fetchall') else list(rows), dtype=object).reshape(-1, 5)
+        console_names, console = np.unique(table[:, 0].astype(str), return_inverse=True)
+        return cls.from_values(table[:, 1:].astype(np.int64), console.ravel(), console_names.tolist())
+
+    @classmethod
+    def from_records(cls, records, console="session"):
+        """Builds the columns from ErrlogRecord objects, all from one console."""
+        if not load_numpy():
+            raise RuntimeError("NumPy is not installed")
+        values = np.array([(record.code, record.rtc, record.t_soc, record.t_env) for record in records], dtype=np.int64)
+        return cls.from_values(values, np.zeros(len(values), dtype=np.uint16), [console])
+
+    def __len__(self):
+        return len(self.code)
+
+    def celsius(self, column):
+        """'soc' or 'env' readings in °C, as float32."""
+        return (self.t_soc if column == 'soc' else self.t_env).astype(np.float32) / 256.0
+
+    def timestamps(self):
+        """RTC values as UNIX timestamps (int64)."""
+        return self.rtc.astype(np.int64) + decoders.TIME_ZERO
+
+    def _code_groups(self):
+        """Distinct codes, the group number of every record and the size of each group."""
+        codes, inverse, counts = np.unique(self.code, return_inverse=True, return_counts=True)
+        return codes, inverse.ravel(), counts
+
+    def code_counts(self):
+        """(codes, record counts, console counts), most frequent code first."""
+        codes, inverse, counts = self._code_groups()
+        # Distinct (code, console) pairs, counted per code: on how many consoles each code was seen
+        pairs = np.unique(inverse.astype(np.int64) * (len(self.console_names) or 1) + self.console)
+        console_counts = np.bincount(pairs // (len(self.console_names) or 1), minlength=len(codes))
+        order = np.argsort(-counts, kind='stable')
+        return codes[order], counts[order], console_counts[order]
+
+    def percentiles(self, column, percentiles=DEFAULT_PERCENTILES):
+        """Percentiles of a temperature column ('soc' or 'env') over every record, in °C."""
+        return np.percentile(self.celsius(column), percentiles) if len(self) else np.full(len(percentiles), np.nan)
+
+    def percentiles_by_code(self, column, percentiles=DEFAULT_PERCENTILES):
+        """
+        (codes, counts, table) where table[i, j] is percentile j of the temperature column
+        for codes[i], in °C, with the same linear interpolation as np.percentile.
+        """
+        codes, inverse, counts = self._code_groups()
+        values = self.celsius(column)
+        order = np.lexsort((values, inverse))  # By code group, then temperature
+        ordered = values[order]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        table = np.empty((len(codes), len(percentiles)), dtype=np.float64)
+        for j, percentile in enumerate(percentiles):
+            position = percentile / 100.0 * (counts - 1)
+            low = np.floor(position).astype(np.int64)
+            high = np.minimum(low + 1, counts - 1)
+            fraction = position - low
+            table[:, j] = ordered[starts + low] * (1 - fraction) + ordered[starts + high] * fraction
+        return codes, counts, table
+
+    def rtc_histogram(self, bins=DEFAULT_RTC_BINS):
+        """(counts, edges) of the RTC times, edges as UNIX timestamps."""
+        return np.histogram(self.timestamps(), bins=bins)
+
+    def cross_tab(self, column, bin_celsius=TEMP_BIN_CELSIUS, codes=None):
+        """
+        Records per code and temperature band: (codes, band lower edges in °C, counts[code, band]).
+        codes limits the rows to those codes (in that order); by default every code appears.
+        """
+        all_codes, inverse, _ = self._code_groups()
+        bands = np.floor_divide(self.celsius(column), bin_celsius).astype(np.int64)
+        first_band = int(bands.min()) if len(bands) else 0
+        band_count = int(bands.max()) - first_band + 1 if len(bands) else 1
+        cells = np.bincount(inverse.astype(np.int64) * band_count + (bands - first_band), minlength=len(all_codes) * band_count)
+        table = cells.reshape(len(all_codes), band_count)
+        if codes is not None:
+            table = table[np.searchsorted(all_codes, codes)]
+            all_codes = np.asarray(codes)
+        return all_codes, (np.arange(band_count) + first_band) * bin_celsius, table
+
+
+def format_report(columns, describe=None, top=REPORT_TOP_CODES, percentiles=DEFAULT_PERCENTILES):
+    """
+    Renders the statistics of an ErrlogColumns as plain text for the statistics window.
+    describe(code_hex) returns the short description of a code (e.g. the decode cache).
+    """
+    lines = []
+    if not len(columns):
+        return "No errlog records to analyse."
+    stamps = columns.timestamps()
+    first, last = (datetime.datetime.fromtimestamp(int(t)).strftime('%Y-%m-%d') for t in (stamps.min(), stamps.max()))
+    lines.append(f"{len(columns):,} records from {len(columns.console_names)} console(s), RTC {first} to {last}")
+    lines.append("")
+
+    codes, counts, console_counts = columns.code_counts()
+    lines.append(f"Most frequent codes ({len(codes):,} distinct)")
+    lines.append(f"  {'Code':8s} {'Records':>9s} {'Share':>7s} {'Consoles':>9s}  Description")
+    for code, count, consoles in zip(codes[:top], counts[:top], console_counts[:top]):
+        code_hex = f"{int(code):08X}"
+        lines.append(f"  {code_hex} {int(count):9,d} {count / len(columns):7.1%} {int(consoles):9,d}  {describe(code_hex) if describe else ''}")
+    lines.append("")
+
+    header = " ".join(f"{'p' + str(p):>7s}" for p in percentiles)
+    lines.append(f"{'Temperatures (°C)':30s}{header}")
+    for column, label in (('soc', 'SoC'), ('env', 'ENV')):
+        lines.append(f"  {label:28s}" + " ".join(f"{value:7.1f}" for value in columns.percentiles(column, percentiles)))
+    lines.append("")
+
+    group_codes, group_counts, table = columns.percentiles_by_code('soc', percentiles)
+    lines.append(f"{'SoC temperature by code (°C)':30s}{header}")
+    for code, row in zip(codes[:top], np.searchsorted(group_codes, codes[:top])):
+        label = f"{int(code):08X} ({int(group_counts[row]):,} records)"
+        lines.append(f"  {label:28s}" + " ".join(f"{value:7.1f}" for value in table[row]))
+    lines.append("")
+
+    tab_codes, bands, tab = columns.cross_tab('soc', codes=codes[:top])
+    lines.append("Records per code and SoC band (°C)")
+    lines.append("  Code     " + "".join(f"{int(band):>4d}-{int(band) + TEMP_BIN_CELSIUS - 1:<3d}" for band in bands))
+    for code, row in zip(tab_codes, tab):
+        lines.append(f"  {int(code):08X} " + "".join(f"{int(count):8d}" if count else f"{'.':>8s}" for count in row))
+    lines.append("")
+
+    hist_counts, edges = columns.rtc_histogram()
+    lines.append("Records over time (RTC)")
+    scale = 40.0 / max(1, int(hist_counts.max()))
+    for count, edge in zip(hist_counts, edges):
+        day = datetime.datetime.fromtimestamp(int(edge)).strftime('%Y-%m-%d')
+        lines.append(f"  {day} {int(count):8,d} {'#' * int(round(count * scale))}")
+    return "\n".join(lines)
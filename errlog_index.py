@@ -0,0 +1,234 @@
+# errlog_index.py
+# This file contains the search indexes over captured errlog records and the filter queries run against them.
+# The indexes are updated one record at a time as records arrive, so a query never scans every record.
+
+import bisect
+import collections
+import math
+
+TEMP_BUCKET_CELSIUS = 5  # Width of one temperature bucket
+KEY_CHUNK_SIZE = 512  # Sorted items are split into chunks of up to twice this many
+CODE_DIGITS = 8  # Hex digits in an error code
+_ID_BITS = 32  # Index keys are (value << _ID_BITS) | record id, so equal values stay distinct and sorted by arrival
+_ID_MASK = (1 << _ID_BITS) - 1
+
+
+def parse_code_prefix(text):
+    """
+    Turns a code pattern such as '8080', '8080xxxx' or '8080*' into the (lowest, highest)
+    code it matches. Returns None for an empty pattern; raises ValueError if it is not hex.
+    """
+    prefix = text.strip().upper().rstrip('X*?')
+    if not prefix and not text.strip():
+        return None
+    if len(prefix) > CODE_DIGITS or any(c not in "0123456789ABCDEF" for c in prefix):
+        raise ValueError(f"Not a code prefix: {text.strip()}")
+    shift = 4 * (CODE_DIGITS - len(prefix))
+    low = int(prefix, 16) << shift if prefix else 0
+    return low, low | ((1 << shift) - 1)
+
+
+class SortedChunks:
+    """
+    Sorted items (ints, or tuples led by a unique int) kept in chunks, with the largest item of each chunk
+    in its own list.
+
+    A plain sorted list moves every later item on each insert, which adds up
+    when records arrive newest first, as an errlog sweep returns them. Here
+    an insert only moves the items of one chunk. Positions are counted over
+    the chunk lengths, so positional access costs one step per chunk.
+    """
+
+    def __init__(self, items=()):
+        self._chunks = []
+        self._maxes = []
+        items = sorted(items)
+        for start in range(0, len(items), KEY_CHUNK_SIZE):
+            self._chunks.append(items[start:start + KEY_CHUNK_SIZE]); self._maxes.append(self._chunks[-1][-1])
+        self._length = len(items)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        for item in self.items(index, index + 1):
+            return item
+        raise IndexError(index)
+
+    def add(self, item):
+        """Inserts item at its sorted place; returns (chunk, offset) it was put at."""
+        chunks, maxes = self._chunks, self._maxes
+        self._length += 1
+        if not chunks:
+            chunks.append([item]); maxes.append(item)
+            return 0, 0
+        i = bisect.bisect_left(maxes, item)
+        if i == len(maxes):  # Largest item so far
+            i -= 1
+            offset = len(chunks[i])
+            chunks[i].append(item); maxes[i] = item
+        else:
+            offset = bisect.bisect_left(chunks[i], item)
+            chunks[i].insert(offset, item)
+        chunk = chunks[i]
+        if len(chunk) > 2 * KEY_CHUNK_SIZE:
+            chunks.insert(i + 1, chunk[KEY_CHUNK_SIZE:]); del chunk[KEY_CHUNK_SIZE:]
+            maxes.insert(i, chunk[-1])
+        return i, offset
+
+    def insert(self, item):
+        """Inserts item and returns its position. A split after the insert leaves the chunk's start in place."""
+        i, offset = self.add(item)
+        return sum(map(len, self._chunks[:i])) + offset
+
+    def _position(self, item):
+        """(chunk, offset) of the first item >= item."""
+        i = bisect.bisect_left(self._maxes, item)
+        return (i, bisect.bisect_left(self._chunks[i], item)) if i < len(self._chunks) else (i, 0)
+
+    def position(self, item):
+        """Position of the first item >= item."""
+        i, offset = self._position(item)
+        return sum(map(len, self._chunks[:i])) + offset
+
+    def items(self, start, stop):
+        """Items at positions start to stop - 1, as a list."""
+        found = []
+        start, stop = max(0, start), min(stop, self._length)
+        for chunk in self._chunks:
+            if start >= stop:
+                break
+            if start < len(chunk):
+                found.extend(chunk[start:stop])
+            start, stop = max(0, start - len(chunk)), stop - len(chunk)
+        return found
+
+    def range(self, low, high):
+        """Items with low <= item < high, as (count, function returning them); counting copies nothing."""
+        (start_chunk, start), (end_chunk, end) = self._position(low), self._position(high)
+        chunks = self._chunks
+        if start_chunk == end_chunk:
+            count = end - start
+        else:
+            count = len(chunks[start_chunk]) - start + sum(len(chunks[i]) for i in range(start_chunk + 1, end_chunk)) + end
+        def items():
+            if start_chunk == end_chunk:
+                return chunks[start_chunk][start:end] if start_chunk < len(chunks) else []
+            found = chunks[start_chunk][start:]
+            for i in range(start_chunk + 1, end_chunk): found.extend(chunks[i])
+            if end_chunk < len(chunks): found.extend(chunks[end_chunk][:end])
+            return found
+        return count, items
+
+    def last(self):
+        return self._maxes[-1] if self._maxes else None
+
+    def clear(self):
+        self._chunks.clear(); self._maxes.clear()
+        self._length = 0
+
+
+class ErrlogQuery:
+    """
+    A filter over errlog records; every criterion that is set must match.
+    code_range is (lowest, highest) code, see parse_code_prefix(). RTC bounds are raw
+    RTC values and temperature bounds are in °C, all inclusive.
+    """
+
+    __slots__ = ('code_range', 'rtc_min', 'rtc_max', 'soc_min', 'env_min')
+
+    def __init__(self, code_range=None, rtc_min=None, rtc_max=None, soc_min=None, env_min=None):
+        self.code_range = code_range
+        self.rtc_min = rtc_min
+        self.rtc_max = rtc_max
+        self.soc_min = soc_min
+        self.env_min = env_min
+
+    def is_empty(self):
+        return all(getattr(self, name) is None for name in self.__slots__)
+
+    def matches(self, record):
+        if self.code_range and not self.code_range[0] <= record.code <= self.code_range[1]: return False
+        if self.rtc_min is not None and record.rtc < self.rtc_min: return False
+        if self.rtc_max is not None and record.rtc > self.rtc_max: return False
+        if self.soc_min is not None and record.t_soc_celsius < self.soc_min: return False
+        if self.env_min is not None and record.t_env_celsius < self.env_min: return False
+        return True
+
+
+class ErrlogIndex:
+    """
+    Code, RTC and temperature indexes over errlog records, in arrival order.
+
+    Codes and RTC values are kept in sorted keys, so a code prefix or a time
+    range is a pair of bisects. Temperatures go into TEMP_BUCKET_CELSIUS
+    wide buckets, so a threshold only visits the buckets at or above it.
+    query() counts the candidates of each criterion first, takes the records
+    of the most selective one and checks the other criteria on those alone.
+    """
+
+    def __init__(self, bucket_celsius=TEMP_BUCKET_CELSIUS):
+        self.records = []  # A record's position here is its id in the indexes
+        self.rows = []  # Whatever the caller passed to add() with each record (e.g. its rendered table row)
+        self._bucket_raw = bucket_celsius * 256  # Temperatures are stored in 1/256 °C units
+        self._code_keys = SortedChunks()
+        self._rtc_keys = SortedChunks()
+        self._soc_buckets = collections.defaultdict(list)  # Bucket number -> ids
+        self._env_buckets = collections.defaultdict(list)
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, record, row=None):
+        record_id = len(self.records)
+        self.records.append(record)
+        self.rows.append(row)
+        self._code_keys.add((record.code << _ID_BITS) | record_id)
+        self._rtc_keys.add((record.rtc << _ID_BITS) | record_id)
+        self._soc_buckets[record.t_soc // self._bucket_raw].append(record_id)
+        self._env_buckets[record.t_env // self._bucket_raw].append(record_id)
+        return record_id
+
+    def clear(self):
+        self.records.clear(); self.rows.clear()
+        self._code_keys.clear(); self._rtc_keys.clear()
+        self._soc_buckets.clear(); self._env_buckets.clear()
+
+    @property
+    def newest_rtc(self):
+        """Largest RTC value indexed, None while empty."""
+        newest = self._rtc_keys.last()
+        return None if newest is None else newest >> _ID_BITS
+
+    def _key_range(self, keys, low, high):
+        """Candidates whose value is between low and high: (count, function returning their ids)."""
+        count, matching_keys = keys.range(low << _ID_BITS, (high + 1) << _ID_BITS)
+        return count, lambda: [key & _ID_MASK for key in matching_keys()]
+
+    def _bucket_range(self, buckets, min_celsius):
+        """Candidates of the buckets that can hold a temperature of at least min_celsius."""
+        first = math.floor(min_celsius * 256) // self._bucket_raw
+        selected = [ids for bucket, ids in buckets.items() if bucket >= first]
+        return sum(map(len, selected)), lambda: [record_id for ids in selected for record_id in ids]
+
+    def query(self, query):
+        """Returns the ids of the records matching query, in arrival order."""
+        candidates = []
+        if query.code_range:
+            candidates.append(self._key_range(self._code_keys, *query.code_range))
+        if query.rtc_min is not None or query.rtc_max is not None:
+            rtc_min = query.rtc_min if query.rtc_min is not None else 0
+            rtc_max = query.rtc_max if query.rtc_max is not None else _ID_MASK
+            candidates.append(self._key_range(self._rtc_keys, rtc_min, rtc_max))
+        if query.soc_min is not None:
+            candidates.append(self._bucket_range(self._soc_buckets, query.soc_min))
+        if query.env_min is not None:
+            candidates.append(self._bucket_range(self._env_buckets, query.env_min))
+        if not candidates:
+            return list(range(len(self.records)))
+
+        count, candidate_ids = min(candidates, key=lambda candidate: candidate[0])
+        if not count:
+            return []
+        records, matches = self.records, query.matches
+        return sorted(record_id for record_id in candidate_ids() if matches(records[record_id]))
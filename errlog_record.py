@@ -0,0 +1,105 @@
+# errlog_record.py
+# This file contains the compact record type for parsed errlog lines.
+
+import re
+
+import decoders
+
+# Keys of the dict returned by ErrlogRecord.fields(), in line order
+FIELD_NAMES = ('Ack', 'Code', 'Rtc', 'PowState', 'UpCause', 'SeqNo', 'DevPm', 'T_SoC', 'T_Env')
+FIELD_WIDTHS = (8, 8, 8, 8, 8, 4, 8, 4, 4)  # Hex digits of each field, as the console prints them
+CHECKSUM_WIDTH = 2
+UNUSED_SLOT_CODE = 0xFFFFFFFF  # Code of the 'OK' reply for an errlog slot that holds no entry
+# int(x, 16) alone would also take a sign, a '0x' prefix or '_' separators
+_HEX_FIELDS = {width: re.compile(f"[0-9A-Fa-f]{{{width}}}") for width in set(FIELD_WIDTHS) | {CHECKSUM_WIDTH}}
+
+
+class ErrlogRecord:
+    """
+    One 'OK' errlog line with its fields parsed to integers once, at ingest.
+
+    The original line is kept as-is; the hex text of each field can be rebuilt
+    from it with fields() when a view needs the raw values (e.g. the detail window).
+    """
+
+    __slots__ = ('raw_line', 'ack', 'code', 'rtc', 'pow_state', 'up_cause', 'seq_no',
+                 'dev_pm', 't_soc', 't_env', 'checksum', 'entry_no')
+
+    def __init__(self, raw_line, ack, code, rtc, pow_state, up_cause, seq_no, dev_pm, t_soc, t_env, checksum=None):
+        self.raw_line = raw_line
+        self.ack = ack
+        self.code = code
+        self.rtc = rtc
+        self.pow_state = pow_state
+        self.up_cause = up_cause
+        self.seq_no = seq_no
+        self.dev_pm = dev_pm
+        self.t_soc = t_soc
+        self.t_env = t_env
+        self.checksum = checksum  # None if the line had no ':XX' suffix
+        self.entry_no = 0  # Arrival number, assigned by whoever keeps the records
+
+    @property
+    def code_hex(self):
+        return f"{self.code:08X}"
+
+    @property
+    def rtc_hex(self):
+        return f"{self.rtc:08X}"
+
+    @property
+    def seq_hex(self):
+        return f"{self.seq_no:04X}"
+
+    @property
+    def key(self):
+        """Identity of the entry itself; the ack and checksum of the line that carried it are left out."""
+        return (self.code, self.rtc, self.pow_state, self.up_cause, self.seq_no, self.dev_pm, self.t_soc, self.t_env)
+
+    @property
+    def rtc_timestamp(self):
+        """UNIX timestamp of the RTC value, used for sorting."""
+        return decoders.TIME_ZERO + self.rtc
+
+    @property
+    def t_soc_celsius(self):
+        return self.t_soc / 256.0
+
+    @property
+    def t_env_celsius(self):
+        return self.t_env / 256.0
+
+    def fields(self):
+        """Returns the raw hex text of every field, keyed like the old record dicts."""
+        parts = self.raw_line.split()
+        record_data = dict(zip(FIELD_NAMES, parts[1:10]))
+        t_env, sep, checksum = parts[9].partition(':')
+        record_data['T_Env'] = t_env
+        record_data['Checksum'] = checksum if sep else "N/A"
+        record_data['RawLine'] = self.raw_line
+        return record_data
+
+    def __repr__(self):
+        return f"ErrlogRecord(code={self.code_hex}, rtc={self.rtc_hex}, seq={self.seq_hex})"
+
+
+def parse_errlog_line(line):
+    """
+    Parses an 'OK <ack> <code> <rtc> <powstate> <upcause> <seqno> <devpm> <tsoc> <tenv>[:<checksum>]' line.
+    Returns None if the line is not an errlog entry, which includes the reply for an unused slot
+    (code UNUSED_SLOT_CODE); raises ValueError if a field is not hex of its width.
+    """
+    parts = line.split()
+    if len(parts) != 10 or parts[0] != "OK":
+        return None
+    t_env, sep, checksum = parts[9].partition(':')
+    fields = parts[1:9] + [t_env]
+    for name, text, width in zip(FIELD_NAMES, fields, FIELD_WIDTHS):
+        if not _HEX_FIELDS[width].fullmatch(text):
+            raise ValueError(f"{name} is not {width} hex digits: {text!r}")
+    if sep and checksum and not _HEX_FIELDS[CHECKSUM_WIDTH].fullmatch(checksum):
+        raise ValueError(f"Checksum is not {CHECKSUM_WIDTH} hex digits: {checksum!r}")
+    code = int(fields[1], 16)
+    if code == UNUSED_SLOT_CODE:
+        return None
+    return ErrlogRecord(line, *(int(text, 16) for text in fields), int(checksum, 16) if sep and checksum else None)
@@ -0,0 +1,141 @@
+# errlog_sequencer.py
+# This file contains the request/response state machine used to fetch errlog slots one after another.
+# It has no Tk or pyserial dependency; the caller sends the commands and runs the timers.
+
+from errlog_record import parse_errlog_line
+
+REPLY_TIMEOUT_MS = 750  # How long to wait for the OK/NG reply to one 'errlog N' before retrying
+MAX_RETRIES = 2  # Resends of one slot before it is given up on and the sequence moves on
+
+# Reply kinds returned by classify_reply()
+REPLY_RECORD = 'record'  # 'OK' line carrying an errlog entry
+REPLY_EMPTY = 'empty'  # 'OK' line without an entry, e.g. an unused slot (code FFFFFFFF)
+REPLY_NG = 'ng'  # Console refused the command or the slot
+
+
+def _parse_reply(line):
+    """Returns (reply kind, ErrlogRecord or None) for a received line; the kind is None if it is not a reply."""
+    status = line.split(None, 1)[0].partition(':')[0] if line else ""
+    if status == "NG":
+        return REPLY_NG, None
+    if status != "OK":
+        return None, None
+    try:
+        record = parse_errlog_line(line)
+    except ValueError:
+        return REPLY_EMPTY, None  # Answered, but not with a usable entry
+    return (REPLY_RECORD, record) if record is not None else (REPLY_EMPTY, None)
+
+
+def classify_reply(line):
+    """Returns the reply kind of a received line, or None if the line is not a reply to a command."""
+    return _parse_reply(line)[0]
+
+
+class ErrlogSequencer:
+    """
+    Walks a list of errlog indexes, one outstanding command at a time.
+
+    The next 'errlog N' is sent as soon as the reply to the current one has
+    been seen, so a dump runs at the speed of the link. A slot that does not
+    answer within timeout_ms is resent up to max_retries times, then skipped.
+    Replies do not say which slot they answer, so once a resent slot is
+    answered the sequence waits for the replies to its other sends (or one
+    more timeout) before moving on; otherwise a late reply would be taken
+    for the answer to the next slot and every later slot would be off by one.
+    For the same reason, when a slot is given up on, the next slot takes the
+    first replies it sees (one per send of the given-up slot) as late answers
+    to that slot, until a timeout passes without them.
+
+    Usage: send start(); for every received line call feed(line) and, when it
+    returns a reply kind, send advance(); when the timer fires send
+    handle_timeout(). A None command means the sequence is over.
+
+    For a history sweep, pass stop_on_empty=True to end at the first empty or
+    NG slot, and known_keys (ErrlogRecord.key values already collected) to end
+    at the first record that was fetched before, since everything older than
+    it has been fetched too.
+    """
+
+    def __init__(self, indexes, timeout_ms=REPLY_TIMEOUT_MS, max_retries=MAX_RETRIES, stop_on_empty=False, known_keys=None):
+        self._indexes = iter(indexes)
+        self.stop_on_empty = stop_on_empty
+        self.known_keys = known_keys or ()
+        self.timeout_ms = timeout_ms
+        self.max_retries = max_retries
+        self.current_index = None
+        self.attempts = 0
+        self.owed_replies = 0  # Replies still expected to earlier sends of the slot just answered
+        self.stale_replies = 0  # Replies still expected to the sends of the slot given up before the current one
+        self.finished = False
+        self.answered = 0  # Slots that got an OK/NG reply
+        self.retries = 0  # Resends over the whole sequence
+        self.failed_indexes = []  # Slots given up on after max_retries
+        self.stop_reason = None  # Why the sequence ended early, None if it ran through every index
+
+    def start(self):
+        """Returns the first command to send."""
+        return self.advance()
+
+    def feed(self, line):
+        """
+        Checks a received line; returns its reply kind once the outstanding command is answered
+        and the next one can be sent, else None.
+        """
+        if self.current_index is None:
+            return None
+        kind, record = _parse_reply(line)
+        if kind is None:
+            return None
+        if self.stale_replies:
+            self.stale_replies -= 1  # Late answer to the slot given up on
+            return None
+        if self.owed_replies:
+            self.owed_replies -= 1  # Another send of a slot already answered
+            return None if self.owed_replies else kind
+        index = self.current_index
+        self.answered += 1
+        if self.stop_on_empty and kind != REPLY_RECORD:
+            self.stop_reason = f"slot {index} is empty" if kind == REPLY_EMPTY else f"console answered NG at slot {index}"
+            self.finished = True
+        elif record is not None and record.key in self.known_keys:
+            self.stop_reason = f"slot {index} was already fetched"
+            self.finished = True
+        if not self.finished:
+            self.owed_replies = self.attempts - 1
+        return None if self.owed_replies else kind
+
+    def advance(self):
+        """Moves on to the next slot and returns its command, or None once the sequence is over."""
+        self.current_index = None
+        self.owed_replies = self.stale_replies = 0
+        if not self.finished:
+            self.current_index = next(self._indexes, None)
+        if self.current_index is None:
+            self.finished = True
+            return None
+        self.attempts = 1
+        return f"errlog {self.current_index}"
+
+    def handle_timeout(self):
+        """Called when the reply did not arrive in time; returns the command to send next (a resend or the next slot)."""
+        if self.current_index is None:
+            return None
+        if self.owed_replies:
+            return self.advance()  # Answered; the replies to its other sends were lost
+        # A whole timeout without them: the replies to the given-up slot were lost, and one
+        # taken for them may have been this slot's answer, so resend it as for a lost reply
+        self.stale_replies = 0
+        if self.attempts <= self.max_retries:
+            self.attempts += 1
+            self.retries += 1
+            return f"errlog {self.current_index}"
+        self.failed_indexes.append(self.current_index)
+        sends = self.attempts
+        command = self.advance()
+        self.stale_replies = sends if command else 0
+        return command
+
+    def cancel(self):
+        self.current_index = None
+        self.finished = True
@@ -0,0 +1,196 @@
+# errlog_store.py
+# This file contains the persistent SQLite store for decoded errlog records.
+# It has no Tk dependency, so the batch tools can query the same database file.
+
+import sqlite3
+import time
+
+from errlog_record import ErrlogRecord
+
+DEFAULT_DB_FILENAME = "errlog_history.db"
+DEFAULT_BATCH_SIZE = 256  # Pending records that force a write even before the next flush()
+DEFAULT_PAGE_SIZE = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS errlogs (
+    id          INTEGER PRIMARY KEY,
+    console     TEXT    NOT NULL,
+    received_at REAL    NOT NULL,
+    raw_line    TEXT    NOT NULL,
+    ack         INTEGER NOT NULL,
+    code        INTEGER NOT NULL,
+    rtc         INTEGER NOT NULL,
+    pow_state   INTEGER NOT NULL,
+    up_cause    INTEGER NOT NULL,
+    seq_no      INTEGER NOT NULL,
+    dev_pm      INTEGER NOT NULL,
+    t_soc       INTEGER NOT NULL,
+    t_env       INTEGER NOT NULL,
+    checksum    INTEGER
+);
+CREATE INDEX IF NOT EXISTS errlogs_code ON errlogs (code);
+CREATE INDEX IF NOT EXISTS errlogs_rtc ON errlogs (rtc DESC, id);
+CREATE INDEX IF NOT EXISTS errlogs_console_rtc ON errlogs (console, rtc DESC, id);
+CREATE INDEX IF NOT EXISTS errlogs_t_soc ON errlogs (t_soc);
+CREATE INDEX IF NOT EXISTS errlogs_t_env ON errlogs (t_env);
+"""
+
+# Columns pages can be sorted on; each has an index, so a page is read straight off it
+SORT_COLUMNS = ('id', 'rtc', 'code', 't_soc', 't_env')
+
+# One row per entry and console; a re-fetched entry differs at most in its ack and checksum
+_UNIQUE_INDEX = "CREATE UNIQUE INDEX IF NOT EXISTS errlogs_entry ON errlogs (console, code, rtc, pow_state, up_cause, seq_no, dev_pm, t_soc, t_env)"
+
+_COLUMNS = ('raw_line', 'ack', 'code', 'rtc', 'pow_state', 'up_cause', 'seq_no', 'dev_pm', 't_soc', 't_env', 'checksum')
+_INSERT = f"INSERT OR IGNORE INTO errlogs (console, received_at, {', '.join(_COLUMNS)}) VALUES ({', '.join('?' * (len(_COLUMNS) + 2))})"
+_SELECT = f"SELECT id, {', '.join(_COLUMNS)} FROM errlogs"
+
+
+class ErrlogStore:
+    """
+    Errlog history kept in a local SQLite database in WAL mode.
+
+    add() only queues a record; the queue is written in one transaction by
+    flush(), which the GUI calls once per queue tick, or as soon as
+    batch_size records are waiting. Every record carries the identity of the
+    console it came from (the port name unless the caller knows better).
+
+    Pages come back newest RTC first, records with equal RTC in arrival
+    order, the same order as the errlog list in the GUI, or sorted on any
+    of SORT_COLUMNS. Equal values keep the order their index walks them
+    in: arrival order when the index runs the same way as the sort (RTC
+    descending, the other columns ascending), newest arrival first when
+    the sort is reversed. Pages are keyset pages: the next one starts after
+    the (value, id) of the last row shown, so reading deep into the archive
+    costs no more than its first page.
+
+    Entries already stored for the same console are ignored on insert, so
+    dumping a console again after a reconnect adds nothing.
+    """
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = []
+        self.removed_duplicates = 0  # Repeated rows deleted when an older database got its unique index
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")  # Readers never block the writer
+        self.connection.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, no fsync per commit
+        self.connection.executescript(_SCHEMA)
+        self._create_unique_index()
+
+    def _create_unique_index(self):
+        if self.connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'errlogs_entry'").fetchone():
+            return
+        with self.connection:
+            # Databases written before the index existed may hold duplicates; keep the first copy of each
+            self.removed_duplicates = self.connection.execute(
+                "DELETE FROM errlogs WHERE id NOT IN (SELECT MIN(id) FROM errlogs "
+                "GROUP BY console, code, rtc, pow_state, up_cause, seq_no, dev_pm, t_soc, t_env)").rowcount
+            self.connection.execute(_UNIQUE_INDEX)
+
+    def add(self, record, console):
+        self._pending.append((console, time.time()) + tuple(getattr(record, name) for name in _COLUMNS))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Writes all queued records in a single transaction. Returns the number of new rows."""
+        if not self._pending:
+            return 0
+        rows, self._pending = self._pending, []
+        with self.connection:
+            return self.connection.executemany(_INSERT, rows).rowcount
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.connection.close()
+
+    def _where(self, console, code, sort=None):
+        clauses, params = [], []
+        if console is not None:
+            # Only the rtc order has a per-console index; for the others, '+' keeps SQLite on the sort
+            # column's index (filtering consoles as it walks) instead of sorting a console's whole history
+            clauses.append("console = ?" if sort in (None, 'rtc') else "+console = ?"); params.append(console)
+        if code is not None:
+            clauses.append("code = ?"); params.append(code)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def count(self, console=None, code=None):
+        self.flush()
+        where, params = self._where(console, code)
+        return self.connection.execute(f"SELECT COUNT(*) FROM errlogs{where}", params).fetchone()[0]
+
+    @staticmethod
+    def _order(sort, descending, reverse=False):
+        """(ORDER BY clause, keyset condition selecting the rows after a (value, id) key, its parameter count)."""
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort on {sort}")
+        id_descending = descending != (sort == 'rtc')  # The way the column's index has equal values
+        if reverse:
+            descending, id_descending = not descending, not id_descending
+        id_order = "id DESC" if id_descending else "id"
+        if sort == 'id':
+            return id_order, f"id {'<' if id_descending else '>'} ?", 1
+        # The value bound comes first so it can seek in the column's index; the NOT skips the rows
+        # with the same value on the other side of the key
+        condition = f"{sort} {'<=' if descending else '>='} ? AND NOT ({sort} = ? AND id {'>=' if id_descending else '<='} ?)"
+        return f"{sort}{' DESC' if descending else ''}, {id_order}", condition, 3
+
+    @staticmethod
+    def _key_params(key, param_count):
+        return [key[1]] if param_count == 1 else [key[0], key[0], key[1]]
+
+    def page(self, limit=DEFAULT_PAGE_SIZE, console=None, code=None, after=None, before=None, sort='rtc', descending=True):
+        """
+        Returns up to limit ErrlogRecord objects in the order of sort (a SORT_COLUMNS name); entry_no holds the row id.
+        after=(value, id) returns the rows that follow that row, before=(value, id) the rows just above it.
+        """
+        self.flush()
+        where, params = self._where(console, code, sort)
+        order, condition, param_count = self._order(sort, descending, reverse=before is not None)
+        key = after if after is not None else before
+        if key is not None:
+            where += (" AND " if where else " WHERE ") + condition
+            params += self._key_params(key, param_count)
+        rows = self.connection.execute(f"{_SELECT}{where} ORDER BY {order} LIMIT ?", params + [limit])
+        records = []
+        for row in rows:
+            record = ErrlogRecord(*row[1:])
+            record.entry_no = row[0]
+            records.append(record)
+        if before is not None:
+            records.reverse()
+        return records
+
+    def key_at(self, position, console=None, sort='rtc', descending=True):
+        """
+        (value, id) of the row at a position of the order, None past the end. Counts through the
+        column's index without reading rows; only jumps (e.g. a scrollbar drag) need this, paging does not.
+        """
+        self.flush()
+        where, params = self._where(console, None, sort)
+        order, _, _ = self._order(sort, descending)
+        return self.connection.execute(f"SELECT {sort}, id FROM errlogs{where} ORDER BY {order} LIMIT 1 OFFSET ?",
+                                       params + [position]).fetchone()
+
+    def position(self, key, console=None, sort='rtc', descending=True):
+        """Position of the row with key (value, id) in the order: the number of rows before it."""
+        self.flush()
+        where, params = self._where(console, None, sort)
+        _, condition, param_count = self._order(sort, descending, reverse=True)
+        where += (" AND " if where else " WHERE ") + condition
+        return self.connection.execute(f"SELECT COUNT(*) FROM errlogs{where}", params + self._key_params(key, param_count)).fetchone()[0]
+
+    def columns(self, console=None):
+        """Returns a cursor over (console, code, rtc, t_soc, t_env) of every stored record, for errlog_analytics."""
+        self.flush()
+        where, params = self._where(console, None)
+        return self.connection.execute(f"SELECT console, code, rtc, t_soc, t_env FROM errlogs{where}", params)
+
+    def consoles(self):
+        """Returns the identities of every console with stored records."""
+        self.flush()
+        return [row[0] for row in self.connection.execute("SELECT DISTINCT console FROM errlogs ORDER BY console")]
@@ -0,0 +1,386 @@
+# errlog_table.py
+# This file contains the errlog table: a sortable model of rendered rows and a canvas view
+# that only draws the rows in sight, so the cost of a redraw does not depend on the record count.
+
+import time
+import tkinter as tk
+import tkinter.font as tkfont
+from operator import attrgetter
+from tkinter import ttk
+
+from errlog_index import SortedChunks
+from errlog_store import DEFAULT_PAGE_SIZE
+
+# (name, heading, width in characters) of each column; the last one takes the remaining width
+COLUMNS = (('no', '#', 5), ('rtc', 'RTC', 22), ('soc', 'SoC °C', 9), ('env', 'ENV °C', 9), ('code', 'Code', 0))
+
+# Sortable columns and the integer record field they sort on, parsed once at ingest
+SORT_KEYS = {
+    'no': attrgetter('entry_no'),
+    'rtc': attrgetter('rtc'),
+    'soc': attrgetter('t_soc'),
+    'env': attrgetter('t_env'),
+    'code': attrgetter('code'),
+}
+
+# Store column each sortable column sorts on in the history table (the entry number there is the row id)
+HISTORY_SORT_COLUMNS = {'no': 'id', 'rtc': 'rtc', 'soc': 't_soc', 'env': 't_env', 'code': 'code'}
+HISTORY_WINDOW_PAGES = 4  # Pages of stored rows the history table keeps around the ones on screen
+
+ROW_PADDING = 4  # Pixels between two rows
+WHEEL_ROWS = 3  # Rows scrolled per mouse wheel step
+
+
+class ErrlogTableModel:
+    """
+    Errlog records in table order, each with its rendered row (cells, colour).
+
+    Rows are rendered once by whoever adds the record. Sorting reorders the
+    records and their rows together by an integer field and the arrival
+    number, so nothing is decoded again. Entries are kept in SortedChunks,
+    so an insert into a large table only moves the entries of one chunk.
+    """
+
+    def __init__(self, sort_column='rtc', descending=True):
+        self._entries = SortedChunks()  # (sort key, record, row)
+        self.sort_column = sort_column
+        self.descending = descending
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _key(self, record):
+        value = SORT_KEYS[self.sort_column](record)
+        # One integer, value then arrival number: equal values stay in arrival order whichever way
+        # the column is sorted, and ints compare faster than tuples on 100k-row sorts
+        return ((-value if self.descending else value) << 32) + record.entry_no
+
+    def insert(self, record, row):
+        """Adds a record at its sorted position and returns that position."""
+        return self._entries.insert((self._key(record), record, row))
+
+    def replace(self, records, rows):
+        """Shows the given records instead, in the model's order."""
+        self._entries = SortedChunks(zip(map(self._key, records), records, rows))
+
+    def sort(self, column, descending):
+        self.sort_column, self.descending = column, descending
+        self._entries = SortedChunks((self._key(record), record, row) for _, record, row in self._entries.items(0, len(self._entries)))
+
+    def clear(self):
+        self._entries.clear()
+
+    def record(self, index):
+        return self._entries[index][1]
+
+    def rows_in(self, start, stop):
+        """Rendered rows at positions start to stop - 1."""
+        return [entry[2] for entry in self._entries.items(start, stop)]
+
+    def position(self, record):
+        """Position of a record of this model, None if it is not in it."""
+        index = self._entries.position((self._key(record),))
+        return index if index < len(self._entries) and self._entries[index][1] is record else None
+
+
+class ErrlogHistoryModel:
+    """
+    Stored errlog records in table order, read from an ErrlogStore as the table scrolls.
+
+    Only a window of rows around the ones on screen is held. Scrolling
+    extends the window with keyset pages from its first or last row; a jump
+    elsewhere (e.g. dragging the scrollbar) seeks the key at the new position
+    in the sort column's index and pages on from there. Sorting asks the
+    store for another order, so the whole history can be sorted without
+    loading it. render(record) returns the row shown for a record.
+    """
+
+    def __init__(self, store, render, console=None, sort_column='rtc', descending=True, page_size=DEFAULT_PAGE_SIZE):
+        self.store = store
+        self.render = render
+        self.console = console
+        self.sort_column = sort_column
+        self.descending = descending
+        self.page_size = page_size
+        self.reload()
+
+    def reload(self):
+        """Forgets the rows read so far and counts the records again, e.g. after more were stored."""
+        self._count = self.store.count(console=self.console)
+        self._start = 0  # Position of the first row in the window
+        self._records = []
+        self._rows = []
+
+    def __len__(self):
+        return self._count
+
+    def _sort(self):
+        return HISTORY_SORT_COLUMNS[self.sort_column]
+
+    def _key(self, record):
+        return (record.entry_no if self.sort_column == 'no' else getattr(record, self._sort()), record.entry_no)
+
+    def _fetch(self, after=None, before=None):
+        records = self.store.page(self.page_size, console=self.console, after=after, before=before,
+                                  sort=self._sort(), descending=self.descending)
+        return records, [self.render(record) for record in records]
+
+    def _load(self, start, stop):
+        """Makes sure the window holds positions start to stop - 1."""
+        start, stop = max(0, start), min(stop, self._count)
+        if start >= stop:
+            return
+        if not self._records or not self._start <= start <= self._start + len(self._records) and not start < self._start <= stop:
+            # A jump: seek the row before start in the index, then page on from it
+            key = self.store.key_at(start - 1, console=self.console, sort=self._sort(), descending=self.descending) if start else None
+            self._records, self._rows = self._fetch(after=key)
+            self._start = start
+        while start < self._start:  # Scrolled up past the window: page back from its first row
+            records, rows = self._fetch(before=self._key(self._records[0]))
+            self._records[:0] = records; self._rows[:0] = rows
+            self._start -= len(records)
+            if not records or self._start < 0:  # Rows were stored or deleted since the count; start over at the top
+                self._count -= self._start; self._start = 0
+                break
+        while self._records and self._start + len(self._records) < stop:  # Scrolled down past the window
+            records, rows = self._fetch(after=self._key(self._records[-1]))
+            if not records:
+                self._count = self._start + len(self._records)
+                break
+            self._records += records; self._rows += rows
+        limit = HISTORY_WINDOW_PAGES * self.page_size
+        if len(self._records) > limit:  # Keep the rows asked for with a margin around them
+            low = max(0, start - (limit - (stop - start)) // 2 - self._start)
+            del self._records[low + limit:], self._rows[low + limit:]
+            del self._records[:low], self._rows[:low]
+            self._start += low
+
+    def record(self, index):
+        self._load(index, index + 1)
+        offset = index - self._start
+        return self._records[offset] if 0 <= offset < len(self._records) else None
+
+    def rows_in(self, start, stop):
+        self._load(start, stop)
+        return self._rows[max(0, start - self._start):max(0, stop - self._start)]
+
+    def position(self, record):
+        return self.store.position(self._key(record), console=self.console, sort=self._sort(), descending=self.descending)
+
+    def sort(self, column, descending):
+        self.sort_column, self.descending = column, descending
+        self._start, self._records, self._rows = 0, [], []
+
+
+class ErrlogTable(ttk.Frame):
+    """
+    Virtualized view of an ErrlogTableModel or ErrlogHistoryModel.
+
+    The canvas holds one set of items per row that fits on screen; scrolling
+    and model changes only re-text those items, and rows that did not change
+    are skipped. Redraws requested while handling a burst of inserts collapse
+    into one when Tk is idle. Selection, bind() and the other methods the GUI
+    used on its Listbox work the same way, with <<ListboxSelect>> raised when
+    the user changes the selection.
+    """
+
+    def __init__(self, parent, model, font, bg, fg, select_bg, select_fg, header_bg, header_fg,
+                 height=8, sortable=True, scrollbar_style=None, on_redraw=None):
+        super().__init__(parent, style="TFrame")
+        self.model = model
+        self.sortable = sortable
+        self.on_redraw = on_redraw  # Called with the seconds each redraw took
+        self.font = tkfont.Font(font=font)
+        self.colors = {'fg': fg, 'select_bg': select_bg, 'select_fg': select_fg}
+        self.row_height = self.font.metrics('linespace') + ROW_PADDING
+        self.top = 0  # Model index of the first row on screen
+        self._selection = None
+        self._slots = []  # (background rectangle, [text item per column]) per visible row
+        self._drawn = []  # What each slot shows, to skip unchanged rows
+        self._redraw_id = None
+
+        char_width = self.font.measure('0')
+        self._column_x = []
+        x = 6
+        for _, _, width in COLUMNS:
+            self._column_x.append(x)
+            x += width * char_width
+
+        self.header = tk.Canvas(self, height=self.row_height + 2, bg=header_bg, highlightthickness=0, bd=0)
+        self.header.grid(row=0, column=0, sticky="ew")
+        self._header_items = {}
+        for (name, heading, _), x in zip(COLUMNS, self._column_x):
+            item = self._header_items[name] = self.header.create_text(x, 2, text=heading, anchor="nw", fill=header_fg,
+                                                                       font=(self.font.actual('family'), self.font.actual('size'), 'bold'))
+            if sortable and name in SORT_KEYS:
+                self.header.tag_bind(item, "<Button-1>", lambda event, name=name: self.sort_by(name))
+
+        self.body = tk.Canvas(self, height=height * self.row_height, bg=bg, highlightthickness=0, bd=0, takefocus=1)
+        self.body.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview, **({'style': scrollbar_style} if scrollbar_style else {}))
+        self.scrollbar.grid(row=0, column=1, rowspan=2, sticky="ns")
+        self.columnconfigure(0, weight=1); self.rowconfigure(1, weight=1)
+
+        self.body.bind("<Configure>", self._on_resize)
+        self.body.bind("<Button-1>", self._on_click)
+        self.body.bind("<MouseWheel>", lambda event: self._scroll_rows(-WHEEL_ROWS if event.delta > 0 else WHEEL_ROWS))
+        self.body.bind("<Button-4>", lambda event: self._scroll_rows(-WHEEL_ROWS))  # X11 wheel
+        self.body.bind("<Button-5>", lambda event: self._scroll_rows(WHEEL_ROWS))
+        for key_name, move in (("<Up>", 'up'), ("<Down>", 'down'), ("<Prior>", 'page_up'), ("<Next>", 'page_down'), ("<Home>", 'home'), ("<End>", 'end')):
+            self.body.bind(key_name, lambda event, move=move: self._on_key(move))
+        self._update_header()
+
+    # --- Listbox-compatible interface ---
+
+    def bind(self, sequence=None, func=None, add=None):
+        """Binds on the rows, so mouse, key and <<ListboxSelect>> handlers work as they did on a Listbox."""
+        return self.body.bind(sequence, func, add)
+
+    def size(self):
+        return len(self.model)
+
+    def curselection(self):
+        return () if self._selection is None else (self._selection,)
+
+    def selection_clear(self, first=0, last=None):
+        self._selection = None
+        self.refresh()
+
+    def selection_set(self, index):
+        self._selection = index if 0 <= index < len(self.model) else None
+        self.refresh()
+
+    def activate(self, index):
+        pass  # The selected row is the active one
+
+    def see(self, index):
+        visible = self._full_rows()
+        if index < self.top: self._set_top(index)
+        elif index >= self.top + visible: self._set_top(index - visible + 1)
+
+    def yview(self, *args):
+        """Scrollbar command: 'moveto fraction' or 'scroll n units|pages'."""
+        if args[0] == 'moveto':
+            self._set_top(int(float(args[1]) * len(self.model)))
+        elif args[0] == 'scroll':
+            step = self._full_rows() if args[2] == 'pages' else 1
+            self._set_top(self.top + int(args[1]) * step)
+
+    # --- Model changes ---
+
+    def row_inserted(self, index):
+        """Call after model.insert(); keeps the selection on its record and the rows in sight in place."""
+        if self._selection is not None and index <= self._selection: self._selection += 1
+        if 0 < self.top and index < self.top: self.top += 1
+        self.refresh()
+
+    def set_model(self, model):
+        """Shows another model, e.g. the records matching a filter."""
+        self.model = model
+        self._update_header()
+        self.reset()
+
+    def reset(self):
+        """Call after the model was cleared or replaced."""
+        self._selection = None
+        self.top = 0
+        self.refresh()
+
+    def sort_by(self, column):
+        """Sorts on a column; a second click on the same column reverses the order."""
+        model = self.model
+        descending = not model.descending if column == model.sort_column else column != 'code'
+        selected = model.record(self._selection) if self._selection is not None else None
+        model.sort(column, descending)
+        if selected is not None:
+            self._selection = model.position(selected)
+            if self._selection is not None: self.see(self._selection)
+        self._update_header()
+        self.refresh()
+
+    def refresh(self):
+        """Schedules a redraw for when Tk is idle."""
+        if self._redraw_id is None: self._redraw_id = self.after_idle(self._redraw)
+
+    # --- Drawing ---
+
+    def _full_rows(self):
+        return max(1, self.body.winfo_height() // self.row_height)
+
+    def _set_top(self, top):
+        top = max(0, min(top, len(self.model) - self._full_rows()))
+        if top != self.top:
+            self.top = top
+            self.refresh()
+
+    def _scroll_rows(self, rows):
+        self._set_top(self.top + rows)
+
+    def _on_resize(self, event):
+        slots_needed = event.height // self.row_height + 1
+        while len(self._slots) < slots_needed:
+            y = len(self._slots) * self.row_height
+            rect = self.body.create_rectangle(0, y, 10000, y + self.row_height, fill="", outline="")
+            texts = [self.body.create_text(x, y + ROW_PADDING // 2, text="", anchor="nw", font=self.font) for x in self._column_x]
+            self._slots.append((rect, texts)); self._drawn.append(None)
+        while len(self._slots) > slots_needed:
+            rect, texts = self._slots.pop(); self._drawn.pop()
+            self.body.delete(rect, *texts)
+        self._set_top(self.top)
+        self.refresh()
+
+    def _redraw(self):
+        self._redraw_id = None
+        if not self.winfo_exists(): return  # Window closed while the redraw was pending
+        start = time.perf_counter()
+        self.top = max(0, min(self.top, len(self.model) - self._full_rows()))
+        rows = self.model.rows_in(self.top, self.top + len(self._slots))
+        count = len(self.model)  # After rows_in(), which may find the history shorter than counted
+        colors = self.colors
+        for slot, (rect, texts) in enumerate(self._slots):
+            row = self.top + slot
+            if slot < len(rows):
+                cells, color = rows[slot]
+                selected = row == self._selection
+                drawn = (cells, color, selected)
+            else:
+                drawn = None
+            if drawn == self._drawn[slot]: continue
+            self._drawn[slot] = drawn
+            if drawn is None:
+                self.body.itemconfigure(rect, fill="")
+                for item in texts: self.body.itemconfigure(item, text="")
+                continue
+            self.body.itemconfigure(rect, fill=colors['select_bg'] if selected else "")
+            fill = colors['select_fg'] if selected else (color or colors['fg'])
+            for item, text in zip(texts, cells): self.body.itemconfigure(item, text=text, fill=fill)
+        if count: self.scrollbar.set(self.top / count, min(1.0, (self.top + self._full_rows()) / count))
+        else: self.scrollbar.set(0.0, 1.0)
+        if self.on_redraw: self.on_redraw(time.perf_counter() - start)
+
+    def _update_header(self):
+        for name, heading, _ in COLUMNS:
+            if name == self.model.sort_column and self.sortable: heading += " ▼" if self.model.descending else " ▲"
+            self.header.itemconfigure(self._header_items[name], text=heading)
+
+    # --- User input ---
+
+    def _on_click(self, event):
+        self.body.focus_set()
+        row = self.top + event.y // self.row_height
+        if row < len(self.model) and row != self._selection:
+            self.selection_set(row)
+            self.body.event_generate("<<ListboxSelect>>")
+
+    def _on_key(self, move):
+        count = len(self.model)
+        if not count: return "break"
+        current = self._selection if self._selection is not None else -1
+        page = max(1, self._full_rows() - 1)
+        row = {'up': current - 1, 'down': current + 1, 'page_up': current - page, 'page_down': current + page,
+               'home': 0, 'end': count - 1}[move]
+        row = max(0, min(count - 1, row))
+        if row != self._selection:
+            self.selection_set(row); self.see(row)
+            self.body.event_generate("<<ListboxSelect>>")
+        return "break"
@@ -3,28 +3,48 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, Toplevel
-import serial
-import serial.tools.list_ports
+import serial # serial.tools.list_ports is imported by the port scan thread, it is slow to load
 import threading
 import time
 import datetime # Keep for general datetime operations if any, though specific decoding is in decoders.py
 import queue
+import collections
 import os
 import sys
+import sqlite3
+import math
 
-# Attempt to import Pillow for image handling
-try:
-    from PIL import Image, ImageTk
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-    # This print statement will appear in the console when gui.py is loaded
-    # if Pillow is not available.
-    print("Pillow library (PIL) not found. Image display will be disabled. Install with: pip install Pillow")
+# Pillow is imported the first time an image is needed (see _load_pil), not while the window is starting up
+Image = ImageTk = None
+PIL_AVAILABLE = None # None until _load_pil() has run
+
+def _load_pil():
+    """Imports Pillow on first use. Returns True if it is available."""
+    global Image, ImageTk, PIL_AVAILABLE
+    if PIL_AVAILABLE is None:
+        try:
+            from PIL import Image, ImageTk
+            PIL_AVAILABLE = True
+        except ImportError:
+            PIL_AVAILABLE = False
+            # This print statement will appear in the console the first time an image is needed
+            print("Pillow library (PIL) not found. Image display will be disabled. Install with: pip install Pillow")
+    return PIL_AVAILABLE
 
 # Import functions from our other modules
 import decoders
-import error_databases # Assuming error_databases.py contains cod3r_database
+import decode_cache
+from serial_reader import LineFramer, read_available, filter_echo, format_command, calculate_checksum
+from console import TextConsole
+from prefix_rules import PrefixRuleSet
+from errlog_record import parse_errlog_line
+from errlog_sequencer import ErrlogSequencer
+from errlog_store import ErrlogStore, DEFAULT_DB_FILENAME
+from metrics import PipelineMetrics
+from image_cache import AssetIndex, ImageCache, ImageLoader, DEFAULT_IMAGE
+from errlog_table import ErrlogTable, ErrlogTableModel, ErrlogHistoryModel
+from errlog_index import ErrlogIndex, ErrlogQuery, parse_code_prefix
+import errlog_analytics # NumPy is only imported when the analytics window first opens
 
 # Set working directory to the script's directory
 # This is important for finding resources like images in the 'src' subdirectory.
@@ -37,6 +57,31 @@ else:
 # We don't os.chdir() here as it's better to construct full paths to resources.
 # application_path will be used for that.
 
+# Serial queue scheduling
+QUEUE_DRAIN_BUDGET = 0.008 # Seconds of line processing per Tk tick before yielding
+QUEUE_ACTIVE_INTERVAL_MS = 15 # Reschedule interval while data is flowing
+QUEUE_IDLE_INTERVAL_MAX_MS = 250 # Longest back-off when the port is quiet
+CONSOLE_MAX_LINES = 5000 # UART console history kept in the output pane
+SOC_WARNING_CELSIUS = 50 # Rows above this SoC temperature are highlighted
+PORT_SCAN_POLL_MS = 50 # How often the Tk thread checks whether the background port scan has finished
+DEFERRED_STARTUP_MS = 100 # Work that can wait (e.g. opening the history store) runs this long after the first paint
+IMAGE_POLL_INTERVAL_MS = 15 # How often finished image loads are picked up while any are running
+DETAIL_IMAGE_SIZE = (380, 200) # Bounding box of the code image in the detail window
+SOY_LOGO_SIZE = (100, 100) # soy.png is stretched to exactly this size
+METRICS_SAMPLE_INTERVAL_MS = 1000 # How often the pipeline metrics are sampled for the stats panel
+METRICS_FILE_ENV = "PS5_UART_METRICS_FILE" # If set, every sample is appended to this file as a JSON line
+DETAIL_FIELDS = [ # (label, record key, decode_cache field or None) of each row of the detail window
+    ('Raw Line:', 'RawLine', None), ('Code:', 'Code', 'Code'),
+    ('RTC:', 'Rtc', 'Rtc'), ('Powerstate:', 'PowState', 'PowState'),
+    ('UPCAUSE:', 'UpCause', 'UpCause'), ('SeqNo (PSQ):', 'SeqNo', 'SeqNo'),
+    ('DevPM:', 'DevPm', 'DevPm'), ('TSOC:', 'T_SoC', 'T_SoC'),
+    ('TENV:', 'T_Env', 'T_Env'), ('Description:', 'Code', 'Description')]
+ERRLOG_HEADER_TEXT = "PARSED ERROR LOGS (Double-Click to Open Log Data)"
+ERRLOG_SWEEP_DEFAULT_MAX = 64 # Default number of errlog slots a history sweep may walk
+ERRLOG_SWEEP_LIMIT = 1024 # Largest value the sweep maximum can be set to
+FILTER_PERIODS = { # Filter bar time ranges, in seconds back from the newest entry (the console clock is rarely set right)
+    "Any time": None, "Last 24 hours": 86400, "Last 7 days": 7 * 86400, "Last 30 days": 30 * 86400, "Last year": 365 * 86400}
+
 class UartTerminalGUI:
     # Constants like TIME_ZERO and SEQ_DATABASE are now in decoders.py
     # and will be accessed via the decoders module if needed directly here,
@@ -55,20 +100,68 @@ class UartTerminalGUI:
         self.serial_thread = None
         self.stop_serial_thread = threading.Event()
         self.data_queue = queue.Queue()
-        self.parsed_errlogs = []
+        self._rx_backlog = collections.deque() # Lines taken off data_queue but not yet processed
+        self._queue_poll_interval = QUEUE_ACTIVE_INTERVAL_MS
+        self._queue_after_id = None
+        self._init_ingest_state(PipelineMetrics(queue_depth=lambda: self.data_queue.qsize() + len(self._rx_backlog)))
+        self.last_metrics = None # Most recent metrics snapshot, shown by the stats panel
+        self._metrics_sample_id = None # Pending _sample_metrics call, None while nothing needs samples
+        self.stats_window = None
+        self.metrics_file = os.environ.get(METRICS_FILE_ENV)
         self.sending_errlogs_active = False
-        self.current_errlog_index_for_sequence = 0
-
-        # To store PhotoImage objects and prevent garbage collection
-        self.image_references = {} # Initialize as an instance variable
-
+        self.errlog_sequencer = None # ErrlogSequencer while an errlog sequence is running
+        self._errlog_timeout_id = None
+
+        # Resized PhotoImages, reused across windows; widgets showing one also keep a reference to it
+        self.image_cache = ImageCache()
+        self._asset_index = None # Listing of src/, built after the first paint (see assets)
+        self.image_loader = ImageLoader() # Decodes and resizes images off the Tk thread
+        self._image_poll_id = None
+
+        # Detail window, built on the first double-click and then reused for every record
+        self.detail_window = None
+        self._detail_rows = []
+        self._detail_record = None
+        self._detail_source = None # (table, lookup) the shown record was picked from
+        self._detail_refresh_id = None
+
+        self._port_scan_thread = None
         self.create_gui_elements()
 
         self.master.geometry("1000x850")
         self.master.protocol("WM_DELETE_WINDOW", self.on_closing)
-        self.populate_com_ports()
+        self.populate_com_ports() # Runs on a background thread, the dropdown fills in when it is done
         self.process_serial_queue()
         self._update_interactive_button_states()
+        self.master.after(DEFERRED_STARTUP_MS, self._deferred_startup)
+
+
+    def _init_ingest_state(self, metrics):
+        """
+        Sets up everything parse_and_add_errlog_entry uses besides the errlog widgets: the table model,
+        indexes, duplicate keys, history store and row colours. Needs no Tk, so the benchmarks call it too.
+        """
+        self.metrics = metrics
+        self.errlog_model = ErrlogTableModel() # Records and their rendered rows, newest first until another column is sorted
+        self.errlog_index = ErrlogIndex() # Code, RTC and temperature indexes over every listed record, for the filter bar
+        self.errlog_filter = None # ErrlogQuery of the filter bar, None while every record is shown
+        self.filter_model = None # Records matching errlog_filter, shown by the table instead of errlog_model
+        self._errlog_entry_counter = 0
+        self._errlog_keys = set() # ErrlogRecord.key of every listed record, for O(1) duplicate checks at ingest
+        self.duplicate_errlog_count = 0 # Records dropped because they were already listed
+        self.errlog_store = None # ErrlogStore every parsed record is written to, None if it could not be opened
+        self.store_console = None # Console identity records are stored under (the connected port)
+
+        self.warning_temp_color = "#FF8C00" # DarkOrange
+        self.critical_error_color = "#FF6347" # Default critical, can be overridden by specific codes
+        # Listbox colour per error code prefix (codes are always 8 hex digits).
+        # Longest matching prefix wins; add more of your specific coloring rules here.
+        self.code_color_table = PrefixRuleSet([
+            ("8080", self.critical_error_color),
+            ("C0020303", "#C5FC00"), # Lime Green
+            ("8081", self.critical_error_color),
+            ("80000009", "#00FC00"), # Bright Green
+        ])
 
 
     def setup_styles(self):
@@ -76,8 +169,6 @@ class UartTerminalGUI:
         self.style.theme_use('clam')
 
         self.error_tag_color = "#FF6347" # Tomato Red
-        self.warning_temp_color = "#FF8C00" # DarkOrange
-        self.critical_error_color = "#FF6347" # Default critical, can be overridden by specific codes
 
         bg_dark = "#1E1E1E"
         bg_medium = "#2C2C2C"
@@ -180,6 +271,11 @@ class UartTerminalGUI:
         self.version_button.pack(side="left", padx=5)
         self.errlog_button = ttk.Button(buttons_container, text="GET Error Logs (5)", command=self.send_errlog_command, state=tk.DISABLED, style='TButton')
         self.errlog_button.pack(side="left", padx=5)
+        self.sweep_button = ttk.Button(buttons_container, text="Sweep History", command=self.send_errlog_sweep_command, state=tk.DISABLED, style='TButton')
+        self.sweep_button.pack(side="left", padx=(5,2))
+        self.sweep_max_var = tk.StringVar(value=str(ERRLOG_SWEEP_DEFAULT_MAX))
+        self.sweep_max_spinbox = ttk.Spinbox(buttons_container, from_=1, to=ERRLOG_SWEEP_LIMIT, textvariable=self.sweep_max_var, width=5, font=(self.font_family, 9))
+        self.sweep_max_spinbox.pack(side="left", padx=(0,5))
         self.custom_cmd_button = ttk.Button(buttons_container, text="Send Custom Command", command=self.open_custom_command_dialog, state=tk.DISABLED, style='TButton')
         self.custom_cmd_button.pack(side="left", padx=5)
         self.clear_errlog_button = ttk.Button(buttons_container, text="Clear Error Logs", command=self.clear_error_logs, state=tk.DISABLED, style='TButton')
@@ -188,6 +284,12 @@ class UartTerminalGUI:
         self.wiring_guide_button.pack(side="left", padx=5)
         self.pinout_button = ttk.Button(buttons_container, text="Pinout", command=self.open_pinout_window, state=tk.NORMAL, style='TButton')
         self.pinout_button.pack(side="left", padx=5)
+        self.history_button = ttk.Button(buttons_container, text="History", command=self.open_history_window, state=tk.NORMAL, style='TButton')
+        self.history_button.pack(side="left", padx=5)
+        self.stats_button = ttk.Button(buttons_container, text="Stats", command=self.open_stats_window, state=tk.NORMAL, style='TButton')
+        self.stats_button.pack(side="left", padx=5)
+        self.analytics_button = ttk.Button(buttons_container, text="Analytics", command=self.open_analytics_window, state=tk.NORMAL, style='TButton')
+        self.analytics_button.pack(side="left", padx=5)
 
         # --- Main Output Area (Console and Logs) ---
         output_area_frame = ttk.Frame(self.master, style="TFrame")
@@ -208,6 +310,7 @@ class UartTerminalGUI:
             highlightbackground=self.border_color, highlightcolor=self.accent_color)
         self.general_output_text.pack(side="left", fill="both", expand=False) # Console fixed width, but can expand height
         self.general_output_text.configure(state='disabled')
+        self.console = TextConsole(self.general_output_text, max_lines=CONSOLE_MAX_LINES)
 
         intro_text_content = (
             "\n🛠️ Welcome to the UART Tool! Here's how to get started:\n\n"
@@ -227,19 +330,41 @@ class UartTerminalGUI:
 
         logs_section_frame = ttk.Frame(output_area_frame, style="TFrame", padding=(0,0,0,0))
         logs_section_frame.pack(fill="both", expand=True, pady=(5,0))
-        ttk.Label(logs_section_frame, text="PARSED ERROR LOGS (Double-Click to Open Log Data)", style="Header.TLabel").pack(fill='x', padx=(10,0))
-        listbox_container_frame = ttk.Frame(logs_section_frame, style="TFrame")
-        listbox_container_frame.pack(padx=10, pady=(5,0), fill="both", expand=True)
-        self.listbox = tk.Listbox(listbox_container_frame, font=("Segoe UI Emoji", 10), selectmode=tk.SINGLE, height=8,
-                                bg=self.bg_light, fg=self.fg_text,
-                                selectbackground=self.accent_color, selectforeground=self.white_text,
-                                relief="solid", borderwidth=1, highlightthickness=0,
-                                exportselection=False, bd=0, highlightbackground=self.border_color)
-        self.listbox.pack(side="left", fill="both", expand=True)
-        self.scrollbar = ttk.Scrollbar(listbox_container_frame, orient="vertical", command=self.listbox.yview, style='Vertical.TScrollbar')
-        self.scrollbar.pack(side="right", fill="y")
-        self.listbox.config(yscrollcommand=self.scrollbar.set)
-        self.listbox.bind("<Double-Button-1>", self.on_double_click_listbox)
+        self.errlog_header_label = ttk.Label(logs_section_frame, text=ERRLOG_HEADER_TEXT, style="Header.TLabel")
+        self.errlog_header_label.pack(fill='x', padx=(10,0))
+        filter_frame = ttk.Frame(logs_section_frame, style="TFrame"); filter_frame.pack(fill='x', padx=10, pady=(5,0))
+        self.filter_code_var, self.filter_soc_var, self.filter_env_var = tk.StringVar(), tk.StringVar(), tk.StringVar()
+        self.filter_period_var = tk.StringVar(value="Any time")
+        filter_entries = []
+        ttk.Label(filter_frame, text="Code:", style="TLabel").pack(side="left", padx=(0,2))
+        filter_entries.append(ttk.Entry(filter_frame, textvariable=self.filter_code_var, width=10, font=(self.font_family, 9)))
+        filter_entries[-1].pack(side="left", padx=(0,10))
+        ttk.Combobox(filter_frame, textvariable=self.filter_period_var, width=13, style='Dark.TCombobox', state='readonly',
+                     values=list(FILTER_PERIODS)).pack(side="left", padx=(0,10))
+        ttk.Label(filter_frame, text="SoC ≥", style="TLabel").pack(side="left", padx=(0,2))
+        filter_entries.append(ttk.Entry(filter_frame, textvariable=self.filter_soc_var, width=5, font=(self.font_family, 9)))
+        filter_entries[-1].pack(side="left", padx=(0,2))
+        ttk.Label(filter_frame, text="°C  ENV ≥", style="TLabel").pack(side="left", padx=(0,2))
+        filter_entries.append(ttk.Entry(filter_frame, textvariable=self.filter_env_var, width=5, font=(self.font_family, 9)))
+        filter_entries[-1].pack(side="left", padx=(0,2))
+        ttk.Label(filter_frame, text="°C", style="TLabel").pack(side="left", padx=(0,10))
+        ttk.Button(filter_frame, text="Filter", command=self.apply_errlog_filter, style="TButton").pack(side="left", padx=(0,5))
+        ttk.Button(filter_frame, text="Show All", command=self.clear_errlog_filter, style="TButton").pack(side="left")
+        self.filter_status_label = ttk.Label(filter_frame, text="", style="TLabel"); self.filter_status_label.pack(side="right")
+        for entry in filter_entries: entry.bind("<Return>", self.apply_errlog_filter)
+
+        # Only the rows in sight are drawn; click a column heading to sort on it
+        self.errlog_table = self._create_errlog_table(logs_section_frame, self.errlog_model, height=8)
+        self.errlog_table.pack(padx=10, pady=(5,0), fill="both", expand=True)
+        self.errlog_table.bind("<Double-Button-1>", self.on_double_click_listbox)
+        self.errlog_table.bind("<Return>", self.on_double_click_listbox)
+        self.errlog_table.bind("<<ListboxSelect>>", lambda event: self._on_table_select(self.errlog_table, self._session_record))
+
+    def _create_errlog_table(self, parent, model, height, sortable=True):
+        return ErrlogTable(parent, model, font=("Segoe UI Emoji", 10), bg=self.bg_light, fg=self.fg_text,
+                           select_bg=self.accent_color, select_fg=self.white_text, header_bg=self.bg_medium, header_fg=self.fg_text,
+                           height=height, sortable=sortable, scrollbar_style='Vertical.TScrollbar',
+                           on_redraw=self.metrics.render_time.add)
 
     def _update_interactive_button_states(self):
         is_connected = self.serial_connection and self.serial_connection.is_open
@@ -248,33 +373,50 @@ class UartTerminalGUI:
             self.version_button.config(state=tk.NORMAL)
             # Disable errlog button only if sequence is active, otherwise enable if connected
             self.errlog_button.config(state=tk.DISABLED if self.sending_errlogs_active else tk.NORMAL)
+            self.sweep_button.config(state=tk.DISABLED if self.sending_errlogs_active else tk.NORMAL)
             self.custom_cmd_button.config(state=tk.NORMAL)
             self.clear_errlog_button.config(state=tk.NORMAL)
         else:
             self.version_button.config(state=tk.DISABLED)
             self.errlog_button.config(state=tk.DISABLED)
+            self.sweep_button.config(state=tk.DISABLED)
             self.custom_cmd_button.config(state=tk.DISABLED)
             self.clear_errlog_button.config(state=tk.DISABLED)
 
     def log_to_general_output(self, message, tag=None):
-        self.general_output_text.configure(state='normal')
-        if not message.endswith('\n'): message += '\n'
-        if tag: self.general_output_text.insert(tk.END, message, (tag,))
-        else: self.general_output_text.insert(tk.END, message)
-        self.general_output_text.see(tk.END)
-        self.general_output_text.configure(state='disabled')
+        # Coalesced by the console and written once the Tk loop is idle
+        self.console.write(message, tag)
 
     def populate_com_ports(self):
         """
         Populates the COM port dropdown with available ports and their descriptions.
         The com_port_var will store a string like "COMx - Description".
+        Enumerating ports can take a while (especially on Windows), so it runs on a
+        background thread and the dropdown is filled in by _finish_port_scan.
         """
+        if self._port_scan_thread and self._port_scan_thread.is_alive(): return # A scan is already running
+        self.refresh_ports_button.config(state=tk.DISABLED)
+        result = [] # Filled by the scan thread with the port list or the exception
+        def scan():
+            try:
+                import serial.tools.list_ports
+                # Format each entry to include both device and description
+                # e.g., "COM3 - USB Serial Port (COM3)"
+                # or "COM4 - Prolific USB-to-Serial Comm Port"
+                result.append([f"{port.device} - {port.description}" for port in serial.tools.list_ports.comports()])
+            except Exception as e: result.append(e)
+        self._port_scan_thread = threading.Thread(target=scan, daemon=True)
+        self._port_scan_thread.start()
+        self.master.after(PORT_SCAN_POLL_MS, self._finish_port_scan, result)
+
+    def _finish_port_scan(self, result):
+        if not result: self.master.after(PORT_SCAN_POLL_MS, self._finish_port_scan, result); return # Still scanning
+        is_connected = self.serial_connection and self.serial_connection.is_open
+        if not is_connected: self.refresh_ports_button.config(state=tk.NORMAL)
         try:
-            com_port_objects = serial.tools.list_ports.comports()
-            # Format each entry to include both device and description
-            # e.g., "COM3 - USB Serial Port (COM3)"
-            # or "COM4 - Prolific USB-to-Serial Comm Port"
-            port_details = [f"{port.device} - {port.description}" for port in com_port_objects]
+            if isinstance(result[0], Exception): raise result[0]
+            port_details = result[0]
+            if is_connected: return # Leave the connected port selected; the list is used on the next connect
             
             self.com_port_combo['values'] = port_details
             
@@ -304,6 +446,7 @@ class UartTerminalGUI:
         try:
             self.serial_connection = serial.Serial(port, int(baud), timeout=0.1)
             self.log_to_general_output(f"Connected to {port} at {baud} baud.", tag="info_tag")
+            self.store_console = port
             self.connect_button.config(text="Disconnect")
             for widget in [self.com_port_combo, self.baud_rate_combo, self.adapter_type_combo, self.refresh_ports_button]:
                 widget.config(state=tk.DISABLED)
@@ -311,6 +454,8 @@ class UartTerminalGUI:
             self.stop_serial_thread.clear()
             self.serial_thread = threading.Thread(target=self.read_serial_data, daemon=True)
             self.serial_thread.start()
+            self._wake_serial_queue()
+            self._schedule_metrics_sample()
         except (serial.SerialException, ValueError) as e:
             error_msg = f"(PC ERROR) Connection failed: {e}"
             if isinstance(e, ValueError): error_msg = f"(PC ERROR) Invalid Baud Rate: {e}"
@@ -321,7 +466,7 @@ class UartTerminalGUI:
             self._update_interactive_button_states() # Re-enable connection widgets
 
     def disconnect_serial(self):
-        self.sending_errlogs_active = False # Stop any ongoing errlog sequence
+        self._stop_errlog_sequence() # Stop any ongoing errlog sequence
         if self.serial_thread and self.serial_thread.is_alive():
             self.stop_serial_thread.set()
             try:
@@ -339,10 +484,8 @@ class UartTerminalGUI:
             widget.config(state='readonly') # Re-enable as readonly
         self.refresh_ports_button.config(state=tk.NORMAL)
         self._update_interactive_button_states() # Update command buttons
-        self.listbox.delete(0, tk.END) # Clear listbox on disconnect
-        self.general_output_text.configure(state='normal')
-        self.general_output_text.delete("1.0", tk.END)
-        self.general_output_text.configure(state='disabled')
+        self._clear_errlog_view() # Clear the errlog table on disconnect
+        self.console.clear()
         self.log_to_general_output("Disconnected.", tag="info_tag") # Log after clearing
 
     def open_custom_command_dialog(self):
@@ -360,13 +503,11 @@ class UartTerminalGUI:
         dialog.bind('<Return>', lambda event: send_command_local())
 
     def clear_error_logs(self):
-        self.listbox.delete(0, tk.END); self.parsed_errlogs.clear()
+        self._clear_errlog_view()
         self.send_command("errlog clear") # Send command to device if needed
 
     def _calculate_checksum(self, data_string):
-        csum = 0
-        for char_val in data_string.encode('utf-8', errors='replace'): csum = (csum + char_val) & 0xFF
-        return csum
+        return calculate_checksum(data_string)
 
     def send_command(self, command_str):
         if self.serial_connection and self.serial_connection.is_open:
@@ -376,17 +517,10 @@ class UartTerminalGUI:
                 # Track last command for echo detection
                 self.last_sent_command = command_str.strip()
                 
-                if adapter_type in ["CH341", "Generic USB-to-TTL(Prolific)", "Other"]:
-                    checksum = self._calculate_checksum(command_str)
-                    checksum_hex = f"{checksum:02X}"
-                    full_command = f"{command_str}:{checksum_hex}\n"
-                    log_msg = f"Sent (Chksum: {checksum_hex}): {command_str}"
-                else:  # Pico or no-checksum
-                    full_command = f"{command_str}\n"
-                    log_msg = f"Sent: {command_str}"
-                
-                self.serial_connection.write(full_command.encode('utf-8', errors='replace'))
+                full_command, log_msg = format_command(command_str, adapter_type) # Adds the checksum if the adapter needs it
+                self.serial_connection.write(full_command)
                 self.log_to_general_output(log_msg, tag="sent_tag")
+                self._wake_serial_queue() # Expect a reply soon
 
             except serial.SerialException as e:
                 self.log_to_general_output(f"Error sending command '{command_str}': {e}", tag="error_tag")
@@ -404,69 +538,90 @@ class UartTerminalGUI:
     def send_version_command(self): self.send_command("version")
 
     def send_errlog_command(self):
+        self._start_errlog_sequence(ErrlogSequencer(range(6)), "Starting errlog sequence (0 to 5)...")
+
+    def send_errlog_sweep_command(self):
+        """Walks the errlog history until an empty/NG slot, an entry already listed, or the configured maximum."""
+        try: max_slots = max(1, min(int(self.sweep_max_var.get()), ERRLOG_SWEEP_LIMIT))
+        except ValueError: max_slots = ERRLOG_SWEEP_DEFAULT_MAX
+        self.sweep_max_var.set(str(max_slots))
+        known_keys = set(self._errlog_keys) # Snapshot, so records fetched by this sweep do not stop it
+        self._start_errlog_sequence(ErrlogSequencer(range(max_slots), stop_on_empty=True, known_keys=known_keys),
+                                    f"Starting errlog history sweep (up to {max_slots} slots)...")
+
+    def _start_errlog_sequence(self, sequencer, start_message):
         if self.sending_errlogs_active: self.log_to_general_output("Errlog sequence already in progress.", tag="info_tag"); return
         if not (self.serial_connection and self.serial_connection.is_open): messagebox.showwarning("Not Connected", "Please connect first."); return
-        self.sending_errlogs_active = True; self.errlog_button.config(state=tk.DISABLED) # Disable during sequence
-        self.log_to_general_output("Starting errlog sequence (0 to 5)...", tag="info_tag")
-        self.current_errlog_index_for_sequence = 0; self._send_one_errlog_in_sequence()
-
-    def _send_one_errlog_in_sequence(self):
-        if not self.sending_errlogs_active:
-            if self.serial_connection and self.serial_connection.is_open: self.errlog_button.config(state=tk.NORMAL) # Re-enable if still connected
-            else: self.errlog_button.config(state=tk.DISABLED)
-            return
+        self.sending_errlogs_active = True; self._update_interactive_button_states() # Disable errlog buttons during sequence
+        self.log_to_general_output(start_message, tag="info_tag")
+        # Each 'errlog N' goes out as soon as the previous one is answered, not on a fixed timer
+        self.errlog_sequencer = sequencer
+        self._send_one_errlog_in_sequence(self.errlog_sequencer.start())
+
+    def _send_one_errlog_in_sequence(self, command_to_send):
+        self._cancel_errlog_timeout()
+        if not self.sending_errlogs_active: return
+        if command_to_send is None: self._finish_errlog_sequence(); return
+        if not (self.serial_connection and self.serial_connection.is_open):
+            self.log_to_general_output(f"Connection lost. Aborting errlog sequence.", tag="error_tag")
+            self._stop_errlog_sequence(); self._update_interactive_button_states(); return
+        self.send_command(command_to_send)
+        if self.sending_errlogs_active: # send_command disconnects on a write error
+            self._errlog_timeout_id = self.master.after(self.errlog_sequencer.timeout_ms, self._on_errlog_timeout)
+
+    def _on_errlog_reply(self, line):
+        """Called for every received line while a sequence runs; sends the next command once the current one is answered."""
+        if self.errlog_sequencer.feed(line) is not None:
+            self._send_one_errlog_in_sequence(self.errlog_sequencer.advance())
+
+    def _on_errlog_timeout(self):
+        self._errlog_timeout_id = None
+        if not self.sending_errlogs_active: return
+        index = self.errlog_sequencer.current_index
+        if self.errlog_sequencer.owed_replies: self._send_one_errlog_in_sequence(self.errlog_sequencer.handle_timeout()); return # Slot answered, its resends were not
+        command_to_send = self.errlog_sequencer.handle_timeout()
+        if command_to_send == f"errlog {index}": self.log_to_general_output(f"No reply to 'errlog {index}', retrying...", tag="info_tag")
+        else: self.log_to_general_output(f"No reply to 'errlog {index}', skipping it.", tag="error_tag")
+        self._send_one_errlog_in_sequence(command_to_send)
+
+    def _finish_errlog_sequence(self):
+        sequencer = self.errlog_sequencer
+        summary = f"Finished errlog sequence: {sequencer.answered} slot(s) answered"
+        if sequencer.retries: summary += f", {sequencer.retries} resend(s)"
+        if sequencer.failed_indexes: summary += f", no reply from {', '.join(map(str, sequencer.failed_indexes))}"
+        if sequencer.stop_reason: summary += f"; stopped early, {sequencer.stop_reason}"
+        self.log_to_general_output(summary + ".", tag="info_tag")
+        self._stop_errlog_sequence()
+        self._update_interactive_button_states()
 
-        if self.current_errlog_index_for_sequence <= 5:
-            command_to_send = f"errlog {self.current_errlog_index_for_sequence}"
-            if not (self.serial_connection and self.serial_connection.is_open):
-                self.log_to_general_output(f"Connection lost. Aborting errlog sequence.", tag="error_tag")
-                self.sending_errlogs_active = False; self.errlog_button.config(state=tk.DISABLED); return
-            self.send_command(command_to_send)
-            self.current_errlog_index_for_sequence += 1
-            if self.current_errlog_index_for_sequence <= 5: self.master.after(250, self._send_one_errlog_in_sequence)
-            else:
-                self.log_to_general_output("Finished sending all errlog parts (0-5).", tag="info_tag")
-                self.sending_errlogs_active = False
-                if self.serial_connection and self.serial_connection.is_open: self.errlog_button.config(state=tk.NORMAL)
-        else: # Should not be reached if logic is correct
-            self.log_to_general_output("Errlog sequence completed (unexpected state).", tag="info_tag")
-            self.sending_errlogs_active = False
-            if self.serial_connection and self.serial_connection.is_open: self.errlog_button.config(state=tk.NORMAL)
+    def _stop_errlog_sequence(self):
+        self._cancel_errlog_timeout()
+        if self.errlog_sequencer: self.errlog_sequencer.cancel()
+        self.errlog_sequencer = None
+        self.sending_errlogs_active = False
+
+    def _cancel_errlog_timeout(self):
+        if self._errlog_timeout_id is not None:
+            self.master.after_cancel(self._errlog_timeout_id)
+            self._errlog_timeout_id = None
 
 
     def read_serial_data(self):
-        buffer = ""
+        framer = LineFramer()
         echo_handled = False
 
         while not self.stop_serial_thread.is_set():
             try:
                 if self.serial_connection and self.serial_connection.is_open:
-                    if self.serial_connection.in_waiting > 0:
-                        data = self.serial_connection.read(self.serial_connection.in_waiting)
-                        buffer += data.decode('utf-8', errors='replace')
+                    # Blocks on the port for up to its read timeout, so the stop flag is still checked regularly
+                    data = read_available(self.serial_connection)
+                    if not data: continue
+                    lines = framer.feed(data)
+                    self.metrics.rx_bytes.add(len(data)); self.metrics.rx_lines.add(len(lines))
+                    batch, echo_handled = filter_echo(lines, getattr(self, 'last_sent_command', None), echo_handled)
 
-                        while '\n' in buffer:
-                            line, buffer = buffer.split('\n', 1)
-                            clean_line = line.strip('\r').strip()
-
-                            if not clean_line:
-                                continue
-
-                            if hasattr(self, 'last_sent_command') and self.last_sent_command:
-                                sent = self.last_sent_command.strip()
-
-                                # Echo handling: print once if exact match
-                                if clean_line.lower() == sent.lower():
-                                    if not echo_handled:
-                                        self.data_queue.put(f"> {sent}")
-                                        echo_handled = True
-                                    continue
-
-                            # Any non-empty non-echo line
-                            self.data_queue.put(clean_line)
-
-                            # Reset echo flag if new valid line received
-                            echo_handled = False
+                    # One hand-over per read; status messages are still queued as plain strings
+                    if batch: self.data_queue.put(batch)
 
                 else:
                     if not self.stop_serial_thread.is_set():
@@ -483,284 +638,511 @@ class UartTerminalGUI:
                     self.data_queue.put(f"UNEXPECTED_READ_ERROR: {e}")
                 break
 
-            time.sleep(0.02)
-
-
-
-
-
     def process_serial_queue(self):
+        """Drains received line batches within a per-tick time budget and reschedules itself."""
+        self._queue_after_id = None
+        tick_start = time.perf_counter()
+        deadline = tick_start + QUEUE_DRAIN_BUDGET
+        backlog = self._rx_backlog
+        received = []
         try:
-            while not self.data_queue.empty():
-                line = self.data_queue.get_nowait()
-                if line in ["SERIAL_CONNECTION_LOST", "(PC ERROR) COM PORT UNPLUGGED OR BUSY"] or \
-                   (isinstance(line, str) and (line.startswith("SERIAL_READ_ERROR:") or line.startswith("UNEXPECTED_READ_ERROR:"))):
-                    self.log_to_general_output(f"Serial issue: {line}", tag="error_tag")
-                    self.disconnect_serial() # This handles UI updates
-                    return # Stop processing queue for now
-                self.log_to_general_output(f"> {line.strip()}", tag="recv_tag")
+            while True:
+                if not backlog:
+                    try: item = self.data_queue.get_nowait()
+                    except queue.Empty: break
+                    if isinstance(item, str): # Status message from the reader thread
+                        if received: self.log_to_general_output("\n".join(received), tag="recv_tag"); received = []
+                        self.log_to_general_output(f"Serial issue: {item}", tag="error_tag")
+                        self.disconnect_serial() # This handles UI updates
+                        return # Stop processing queue for now
+                    backlog.extend(item)
+                    continue
+                if time.perf_counter() >= deadline: break
+                line = backlog.popleft()
+                received.append(f"> {line.strip()}")
                 if line.startswith("OK "): self.parse_and_add_errlog_entry(line)
+                if self.errlog_sequencer: self._on_errlog_reply(line) # After parsing, so the entry is listed before the next request
         finally:
-            self.master.after(100, self.process_serial_queue) # Reschedule
+            self._flush_errlog_store() # One transaction per tick for all records parsed in it
+            # One console insert per tick instead of one per line
+            if received:
+                self.log_to_general_output("\n".join(received), tag="recv_tag")
+                self.metrics.drain_time.add(time.perf_counter() - tick_start); self.metrics.sample_queue_depth()
+            if backlog or not self.data_queue.empty(): self._queue_poll_interval = 1 # Out of budget, yield to Tk and continue
+            elif received: self._queue_poll_interval = QUEUE_ACTIVE_INTERVAL_MS
+            else: self._queue_poll_interval = min(self._queue_poll_interval * 2, QUEUE_IDLE_INTERVAL_MAX_MS) # Back off on a quiet port
+            self._queue_after_id = self.master.after(self._queue_poll_interval, self.process_serial_queue) # Reschedule
+
+    def _wake_serial_queue(self):
+        """Brings the queue tick back to the active rate, e.g. when a reply is expected."""
+        self._queue_poll_interval = QUEUE_ACTIVE_INTERVAL_MS
+        if self._queue_after_id is not None:
+            self.master.after_cancel(self._queue_after_id)
+            self._queue_after_id = self.master.after(QUEUE_ACTIVE_INTERVAL_MS, self.process_serial_queue)
 
     def parse_and_add_errlog_entry(self, line):
-        parts = line.split()
-        if parts and parts[0] == "OK" and len(parts) == 10:
+        try:
+            record = parse_errlog_line(line) # Fields are parsed to integers once, here
+            if record is None: return
+            key = record.key # Fields without the checksum, so a re-fetched entry matches its first copy
+            if key in self._errlog_keys:
+                self.duplicate_errlog_count += 1; self._update_errlog_header(); return
+            self._errlog_keys.add(key)
+            self._errlog_entry_counter += 1
+            record.entry_no = self._errlog_entry_counter
+            self._insert_errlog_record(record)
+            if self.errlog_store:
+                try: self.errlog_store.add(record, self.store_console or "unknown") # Written in batches by _flush_errlog_store
+                except sqlite3.Error as e: self._disable_errlog_store(e) # A batch write failed; the entry itself is fine
+            self._update_errlog_header()
+        except Exception as e:
+            self.log_to_general_output(f"Error processing errlog line '{line.strip()}': {e}", tag="error_tag")
+
+    def _insert_errlog_record(self, record):
+        """Renders one record, inserts it at its sorted position and indexes it; the table redraws once the batch is done."""
+        decode_start = time.perf_counter()
+        row = self._render_errlog_row(record)
+        self.metrics.decode_time.add(time.perf_counter() - decode_start)
+        index = self.errlog_model.insert(record, row)
+        self.errlog_index.add(record, row)
+        if self.errlog_filter is None: self.errlog_table.row_inserted(index)
+        elif self.errlog_filter.matches(record): self.errlog_table.row_inserted(self.filter_model.insert(record, row)) # Live rows join the filtered view
+        self.metrics.records.add()
+
+    def _deferred_startup(self):
+        """Start-up work that does not need to hold up the first paint."""
+        self.open_errlog_store()
+        if self._asset_index is None: self._scan_assets() # List src/ once, so detail windows never probe the disk
+        self._prewarm_images()
+
+    def _prewarm_images(self):
+        """Loads the images detail windows use most into the cache in the background."""
+        for name in self.assets.names():
+            stem, ext = os.path.splitext(name)
+            if ext.lower() == ".png" and len(stem) in (6, 8) and all(c in "0123456789abcdefABCDEF" for c in stem):
+                self._request_photo(name, *DETAIL_IMAGE_SIZE) # Code and code group images
+        if DEFAULT_IMAGE in self.assets: self._request_photo(DEFAULT_IMAGE, *DETAIL_IMAGE_SIZE)
+        if "soy.png" in self.assets: self._request_photo("soy.png", *SOY_LOGO_SIZE, exact=True)
+
+    def _scan_assets(self):
+        self._asset_index = AssetIndex(os.path.join(application_path, "src"))
+        return self._asset_index
+
+    @property
+    def assets(self):
+        """AssetIndex of the src/ directory, scanned on first use."""
+        return self._scan_assets() if self._asset_index is None else self._asset_index
+
+    def open_errlog_store(self):
+        db_path = os.path.join(application_path, DEFAULT_DB_FILENAME)
+        try:
+            self.errlog_store = ErrlogStore(db_path)
+        except (sqlite3.Error, OSError) as e:
+            self.errlog_store = None
+            self.log_to_general_output(f"Errlog history disabled, cannot open {db_path}: {e}", tag="error_tag")
+            return
+        if self.errlog_store.removed_duplicates:
+            self.log_to_general_output(f"Errlog history: removed {self.errlog_store.removed_duplicates} repeated entries from {db_path}.", tag="info_tag")
+
+    def _flush_errlog_store(self):
+        if not self.errlog_store: return
+        try: self.errlog_store.flush()
+        except sqlite3.Error as e: self._disable_errlog_store(e)
+
+    def _disable_errlog_store(self, error):
+        """Logs a failed history write once and stops writing, so later lines are not reported for it."""
+        self.log_to_general_output(f"Errlog history disabled, write failed: {error}", tag="error_tag")
+        self.errlog_store = None
+
+    def _clear_errlog_view(self):
+        self.errlog_model.clear(); self.errlog_index.clear()
+        if self.filter_model is not None: self.filter_model.clear()
+        self.errlog_table.reset()
+        self._errlog_entry_counter = 0
+        self._errlog_keys.clear(); self.duplicate_errlog_count = 0
+        self._update_errlog_header()
+
+    def apply_errlog_filter(self, event=None):
+        """Shows the records matching the filter bar, looked up in errlog_index; an empty filter shows them all."""
+        try:
+            query = ErrlogQuery(code_range=parse_code_prefix(self.filter_code_var.get()),
+                                soc_min=self._filter_celsius(self.filter_soc_var, "SoC"), env_min=self._filter_celsius(self.filter_env_var, "ENV"))
+        except ValueError as e:
+            self.filter_status_label.config(text=str(e)); return
+        period, newest = FILTER_PERIODS.get(self.filter_period_var.get()), self.errlog_index.newest_rtc
+        if period and newest is not None: query.rtc_min = newest - period
+        if query.is_empty(): self.clear_errlog_filter(); return
+
+        start = time.perf_counter()
+        ids = self.errlog_index.query(query)
+        elapsed = time.perf_counter() - start
+        shown = self.errlog_table.model # Keep the order the table is sorted in
+        model = ErrlogTableModel(shown.sort_column, shown.descending)
+        model.replace([self.errlog_index.records[i] for i in ids], [self.errlog_index.rows[i] for i in ids])
+        self.errlog_filter, self.filter_model = query, model
+        self.errlog_table.set_model(model)
+        self.filter_status_label.config(text=f"{len(ids):,} of {len(self.errlog_index):,} match ({elapsed * 1e3:.1f} ms)")
+
+    def clear_errlog_filter(self):
+        self.filter_code_var.set(""); self.filter_soc_var.set(""); self.filter_env_var.set(""); self.filter_period_var.set("Any time")
+        self.filter_status_label.config(text="")
+        if self.filter_model is None: return
+        shown = self.filter_model
+        if (shown.sort_column, shown.descending) != (self.errlog_model.sort_column, self.errlog_model.descending):
+            self.errlog_model.sort(shown.sort_column, shown.descending) # Come back in the order last picked
+        self.errlog_filter = self.filter_model = None
+        self.errlog_table.set_model(self.errlog_model)
+
+    @staticmethod
+    def _filter_celsius(var, name):
+        text = var.get().strip()
+        if not text: return None
+        try: value = float(text)
+        except ValueError: value = math.nan
+        if not math.isfinite(value): raise ValueError(f"{name} must be a number of °C") # float() also takes 'nan' and 'inf'
+        return value
+
+    def _update_errlog_header(self):
+        text = ERRLOG_HEADER_TEXT
+        if self.errlog_model: text += f" - {len(self.errlog_model)} entries"
+        if self.duplicate_errlog_count: text += f", {self.duplicate_errlog_count} duplicates suppressed"
+        self.errlog_header_label.config(text=text)
+
+    def _schedule_metrics_sample(self):
+        """Keeps sampling going while a port is open or the stats window is shown; an idle app takes no samples."""
+        if self._metrics_sample_id is not None: return
+        connected = self.serial_connection is not None and self.serial_connection.is_open
+        if connected or (self.stats_window is not None and self.stats_window.winfo_exists()):
+            self._metrics_sample_id = self.master.after(METRICS_SAMPLE_INTERVAL_MS, self._sample_metrics)
+
+    def _sample_metrics(self):
+        """Takes a metrics snapshot every METRICS_SAMPLE_INTERVAL_MS and appends it to the metrics file if one is set."""
+        self._metrics_sample_id = None
+        self.last_metrics = self.metrics.snapshot()
+        if self.metrics_file:
+            try: self.metrics.dump(self.metrics_file, self.last_metrics)
+            except OSError as e:
+                self.log_to_general_output(f"Metrics dump disabled, cannot write {self.metrics_file}: {e}", tag="error_tag")
+                self.metrics_file = None
+        self._schedule_metrics_sample()
+
+    def open_stats_window(self):
+        """Shows the pipeline metrics, refreshed with every sample."""
+        if self.stats_window is not None and self.stats_window.winfo_exists(): self.stats_window.lift(); return
+        stats_window = self.stats_window = Toplevel(self.master); stats_window.title("Pipeline Stats")
+        stats_window.configure(bg=self.bg_medium); stats_window.resizable(False, False)
+        container = ttk.Frame(stats_window, style="TFrame", padding=(15,10,15,10)); container.pack(fill="both", expand=True)
+        rows = [ # (label, function of a snapshot returning the text)
+            ("Serial read", lambda m: f"{m['rx_bytes']['per_sec']:,.0f} B/s, {m['rx_lines']['per_sec']:,.0f} lines/s ({m['rx_bytes']['total']:,} B total)"),
+            ("Queue depth", lambda m: f"{m['queue_depth']} batches/lines waiting (max {m['max_queue_depth']})"),
+            ("Queue drain", lambda m: f"{m['drain_tick']['mean_ms']:.2f} ms/tick mean, {m['drain_tick']['max_ms']:.2f} ms max"),
+            ("Records", lambda m: f"{m['records']['per_sec']:,.1f}/s ({m['records']['total']:,} total)"),
+            ("Decode", lambda m: f"{m['decode_record']['mean_ms'] * 1000:.1f} µs/record mean, {m['decode_record']['max_ms']:.2f} ms max"),
+            ("Table redraw", lambda m: f"{m['listbox_render']['mean_ms']:.3f} ms mean, {m['listbox_render']['max_ms']:.2f} ms max"),
+        ]
+        value_labels = []
+        for r, (label_text, _) in enumerate(rows):
+            ttk.Label(container, text=f"{label_text}:", style="TLabel", font=(self.font_family, 9, "bold")).grid(row=r, column=0, sticky="w", padx=(0,10), pady=2)
+            value_label = ttk.Label(container, text="-", style="TLabel", font=(self.font_family, 9)); value_label.grid(row=r, column=1, sticky="w", pady=2)
+            value_labels.append(value_label)
+        dump_text = f"Writing samples to {self.metrics_file}" if self.metrics_file else f"Set {METRICS_FILE_ENV} to log samples as JSON lines"
+        ttk.Label(container, text=dump_text, style="TLabel").grid(row=len(rows), column=0, columnspan=2, sticky="w", pady=(8,0))
+        def refresh():
+            if not stats_window.winfo_exists(): return
+            if self.last_metrics:
+                for value_label, (_, fmt) in zip(value_labels, rows): value_label.config(text=fmt(self.last_metrics))
+            stats_window.after(METRICS_SAMPLE_INTERVAL_MS, refresh)
+        self._schedule_metrics_sample()
+        refresh()
+
+    def open_analytics_window(self):
+        """Code frequencies, temperature distributions and RTC histogram of the session or the stored history."""
+        if not errlog_analytics.load_numpy():
+            messagebox.showinfo("Analytics", "The analytics window needs NumPy.\nInstall it with: pip install numpy"); return
+        self._flush_errlog_store()
+        analytics_window = Toplevel(self.master); analytics_window.title("Errlog Analytics")
+        analytics_window.configure(bg=self.bg_medium); analytics_window.geometry("900x700")
+        top_frame = ttk.Frame(analytics_window, style="TFrame", padding=(10,10,10,5)); top_frame.pack(fill='x')
+        ttk.Label(top_frame, text="Records:", style="TLabel").pack(side="left", padx=(0,2))
+        session_source, history_source = "This session", "History: all consoles"
+        sources = [session_source] + ([history_source] + [f"History: {console}" for console in self.errlog_store.consoles()] if self.errlog_store else [])
+        source_var = tk.StringVar(value=history_source if self.errlog_store else session_source)
+        source_combo = ttk.Combobox(top_frame, textvariable=source_var, width=30, style='Dark.TCombobox', state='readonly', values=sources)
+        source_combo.pack(side="left", padx=(0,10))
+        status_label = ttk.Label(top_frame, text="", style="TLabel"); status_label.pack(side="right")
+        report_text = scrolledtext.ScrolledText(analytics_window, font=("Consolas", 9), wrap=tk.NONE,
+                                                bg=self.bg_light, fg=self.fg_text, insertbackground=self.white_text,
+                                                selectbackground=self.accent_color, selectforeground=self.white_text)
+        report_text.pack(fill="both", expand=True, padx=10, pady=(0,10))
+
+        def refresh():
+            source = source_var.get()
+            start = time.perf_counter()
             try:
-                record_data = {'RawLine': line, 'Ack': parts[1], 'Code': parts[2], 'Rtc': parts[3],
-                               'PowState': parts[4], 'UpCause': parts[5], 'SeqNo': parts[6],
-                               'DevPm': parts[7], 'T_SoC': parts[8]}
-                t_env_checksum_part = parts[9]
-                if ':' in t_env_checksum_part: record_data['T_Env'], record_data['Checksum'] = t_env_checksum_part.split(':', 1)
-                else: record_data['T_Env'] = t_env_checksum_part; record_data['Checksum'] = "N/A"
-
-                # Use TIME_ZERO from the decoders module
-                record_data['Rtc_Decoded'] = decoders._decode_rtc(record_data['Rtc'])
-                # Store timestamp for sorting if decoding was successful
-                if record_data['Rtc_Decoded'] != "Invalid RTC":
-                     record_data['Rtc_UnixTimestamp'] = decoders.TIME_ZERO + int(record_data['Rtc'], 16)
-                else:
-                    record_data['Rtc_UnixTimestamp'] = 0 # For sorting purposes if RTC is invalid
-
-                self.parsed_errlogs.append(record_data)
-                self.update_errlog_listbox()
-            except Exception as e:
-                self.log_to_general_output(f"Error processing errlog line '{line.strip()}': {e}", tag="error_tag")
-
-    def update_errlog_listbox(self):
-        self.parsed_errlogs.sort(key=lambda record: record.get('Rtc_UnixTimestamp', 0), reverse=True)
-        self.listbox.delete(0, tk.END)
-        default_fg = self.listbox.cget('fg')
-
-        for i, record in enumerate(self.parsed_errlogs):
-            raw_code = record.get('Code', 'N/A')
-            rtc_decoded = record.get('Rtc_Decoded', 'N/A') # Already decoded
-            # Use decoders module for functions
-            decoded_error_message = decoders._decode_err_code(raw_code).strip() if raw_code != 'N/A' else 'N/A'
-            seq_display_part_str = f"SEQ: {decoders._decode_seq_no(record.get('SeqNo', 'N/A'))}" if raw_code == "80810001" else ""
-            decoded_t_soc_compact = decoders._decode_temp_soc(record.get('T_SoC', 'N/A')).replace(' °C', '')
-            decoded_t_env_compact = decoders._decode_temp_env(record.get('T_Env', 'N/A')).replace(' °C', '')
-
-            listbox_entry_parts = [f"➔", f"{i:02d}", f"RTC: {rtc_decoded}", f"Code: {raw_code} ({decoded_error_message})"]
-            if seq_display_part_str: listbox_entry_parts.append(seq_display_part_str)
-            listbox_entry_parts.extend([f"SoC: {decoded_t_soc_compact}°", f"ENV: {decoded_t_env_compact}°"])
-            self.listbox.insert(tk.END, " | ".join(filter(None, listbox_entry_parts)))
-
-            item_index = self.listbox.size() - 1; current_item_color = default_fg; colored = False
-            # Simplified coloring logic for brevity in this example, use your full logic
-            if raw_code.startswith("8080") and len(raw_code) == 8: current_item_color = self.critical_error_color; colored = True
-            elif raw_code.startswith("C0020303"): current_item_color = "#C5FC00"; colored = True # Lime Green
-            elif raw_code.startswith("8081"): current_item_color = self.critical_error_color; colored = True
-            # ... (add more of your specific coloring rules)
-            elif raw_code.startswith("80000009"): current_item_color = "#00FC00"; colored = True # Bright Green
-
-            if colored: self.listbox.itemconfig(item_index, {'fg': current_item_color})
-            elif not colored and decoded_t_soc_compact not in ['N/A', "Invalid Hex Temp"]:
-                try:
-                    if float(decoded_t_soc_compact) > 50: self.listbox.itemconfig(item_index, {'fg': self.warning_temp_color})
-                except ValueError: pass
+                if source == session_source:
+                    columns = errlog_analytics.ErrlogColumns.from_records(self.errlog_index.records, self.store_console or "session")
+                elif self.errlog_store:
+                    self._flush_errlog_store()
+                    console = None if source == history_source else source.split(": ", 1)[1]
+                    columns = errlog_analytics.ErrlogColumns.from_rows(self.errlog_store.columns(console))
+                else: return
+                report = errlog_analytics.format_report(columns, describe=lambda code_hex: decode_cache.decode('Code', code_hex).strip())
+            except sqlite3.Error as e:
+                status_label.config(text=f"Query failed: {e}"); return
+            report_text.config(state='normal'); report_text.delete('1.0', tk.END)
+            report_text.insert(tk.END, report); report_text.config(state='disabled')
+            status_label.config(text=f"{len(columns):,} records analysed in {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+        ttk.Button(top_frame, text="Refresh", command=refresh, style="TButton").pack(side="left", padx=5)
+        source_combo.bind("<<ComboboxSelected>>", lambda event: refresh())
+        refresh()
+
+    def _render_errlog_row(self, record):
+        """Decodes a record once and returns its table cells (see errlog_table.COLUMNS) and colour (None for the default colour)."""
+        raw_code = record.code_hex
+        # Decoded through the shared cache, so repeated records cost no decoding
+        rtc_decoded = decode_cache.decode('Rtc', record.rtc_hex)
+        decoded_error_message = decode_cache.decode('Code', raw_code).strip()
+        code_text = f"{raw_code} ({decoded_error_message})"
+        if raw_code == "80810001": code_text += f" | SEQ: {decode_cache.decode('SeqNo', record.seq_hex)}"
+        # Temperatures are already integers, no hex parsing needed
+        decoded_t_soc_compact = decoders.format_celsius(record.t_soc).replace(' °C', '')
+        decoded_t_env_compact = decoders.format_celsius(record.t_env).replace(' °C', '')
+
+        # Rows are numbered in arrival order so inserting a record never renumbers the others
+        cells = (f"{record.entry_no:02d}", rtc_decoded, decoded_t_soc_compact, decoded_t_env_compact, code_text)
+
+        current_item_color = self.code_color_table.lookup(raw_code)
+        if current_item_color is None and record.t_soc_celsius > SOC_WARNING_CELSIUS: current_item_color = self.warning_temp_color
+        return cells, current_item_color
 
     def on_double_click_listbox(self, event):
-        sel = self.listbox.curselection()
+        sel = self.errlog_table.curselection()
         if sel:
-            if 0 <= sel[0] < len(self.parsed_errlogs): self.show_detail_window(sel[0])
-            else: messagebox.showerror("Error", "Invalid selection."); self.log_to_general_output("Invalid listbox selection.", "error_tag")
-
-    def show_detail_window(self, index):
-        if not (0 <= index < len(self.parsed_errlogs)): return
-        record_data = self.parsed_errlogs[index]
-        detail_window = Toplevel(self.master); detail_window.configure(bg=self.bg_soy)
-        detail_window.title(f"Log Details - Index {index:02d}"); detail_window.transient(self.master)
-        detail_window.grab_set(); detail_window.minsize(800, 700)
-
-        field_info = [ # Use functions from decoders and error_databases modules
-            ('Raw Line:', 'RawLine', None), ('Code:', 'Code', decoders._decode_err_code),
-            ('RTC:', 'Rtc', decoders._decode_rtc), ('Powerstate:', 'PowState', decoders._decode_pw_state),
-            ('UPCAUSE:', 'UpCause', decoders._decode_upcause), ('SeqNo (PSQ):', 'SeqNo', decoders._decode_seq_no),
-            ('DevPM:', 'DevPm', decoders._decode_devpower), ('TSOC:', 'T_SoC', decoders._decode_temp_soc),
-            ('TENV:', 'T_Env', decoders._decode_temp_env), ('Description:', 'Code', error_databases.cod3r_database)] # Updated call
+            found = self._session_record(sel[0])
+            if found: self.show_detail_window(*found)
+            else: messagebox.showerror("Error", "Invalid selection."); self.log_to_general_output("Invalid errlog table selection.", "error_tag")
+
+    def _session_record(self, row):
+        """(entry number, record) of a row of the errlog table, None if the row does not exist."""
+        model = self.errlog_table.model # The filtered records while a filter is on
+        if not 0 <= row < len(model): return None
+        record = model.record(row)
+        return record.entry_no, record
+
+    def show_detail_window(self, index, record=None, source=None):
+        """
+        Shows a record in the detail window, which is built once and then only updated.
+        source is (table, lookup) the record was picked from, lookup(row) returning (index, record) or None;
+        the window follows that table's selection and steps through it with the arrow keys.
+        """
+        if record is None: # Index into the session list unless the caller passes the record (e.g. from the history window)
+            if not (0 <= index < len(self.errlog_model)): return
+            record = self.errlog_model.record(index)
+        self._detail_source = source or (self.errlog_table, self._session_record)
+        if self.detail_window is None or not self.detail_window.winfo_exists(): self._build_detail_window()
+        self._fill_detail_window(index, record)
+        if self.detail_window.state() == 'withdrawn': self.detail_window.deiconify()
+        self.detail_window.lift()
+
+    def _build_detail_window(self):
+        """Creates the detail window and one set of labels per field; _fill_detail_window only changes their text."""
+        detail_window = self.detail_window = Toplevel(self.master); detail_window.configure(bg=self.bg_soy)
+        detail_window.title("Log Details"); detail_window.transient(self.master); detail_window.minsize(800, 700)
+        detail_window.protocol("WM_DELETE_WINDOW", detail_window.withdraw) # Hidden, not destroyed, so the next open is instant
+        for key_name, step in (("<Up>", -1), ("<Down>", 1), ("<Prior>", -10), ("<Next>", 10)):
+            detail_window.bind(key_name, lambda event, step=step: self._step_detail_selection(step))
 
         container = ttk.Frame(detail_window, style='TFrame', padding=(10,5,10,5)); container.pack(fill="both", expand=True)
         container.columnconfigure(0, weight=0); container.columnconfigure(1, weight=1); container.columnconfigure(2, weight=2)
-        r = 0
-        for lbl_txt, key, dec_fn in field_info:
-            if lbl_txt == 'System Notes:':
-                # Get raw values
-                raw_line_raw = record_data.get('RawLine', 'N/A')
-                code_raw = record_data.get('Code', 'N/A')
-                seq_raw = record_data.get('SeqNo', 'N/A')
-
-                # Decode values (handle None or 'N/A')
-                raw_line_dec = raw_line_raw if raw_line_raw == 'N/A' else str(raw_line_raw)  # No decoder for RawLine
-                code_dec = decoders._decode_err_code(code_raw) if code_raw != 'N/A' else "N/A"
-                seq_dec = decoders._decode_seq_no(seq_raw) if seq_raw != 'N/A' else "N/A"
-
-                # Get cod3r_database description (safe fallback)
-                cod3r_desc = error_databases.cod3r_database(code_raw) if code_raw != 'N/A' else "N/A"
-                if not cod3r_desc:
-                    cod3r_desc = f"No description found for code {code_raw}"
-
-                # Font styles
-                lbl_fnt = (self.font_family, 12, "bold")
-                lbl_fg = "#2E86C1"
-                dec_fnt = (self.font_family, 11)
-                dec_fg = self.white_text
-
-                if r > 0:
-                    ttk.Separator(container, orient='horizontal').grid(row=r, column=0, columnspan=3, sticky='ew', pady=(8,8))
-                    r += 1
-
-                # Label for "Description:"
-                ttk.Label(container, text="Description:", font=lbl_fnt, foreground=lbl_fg).grid(
-                    row=r, column=0, padx=(0,0.2), pady=6, sticky="nw"
-                )
-
-                # Text to copy (only first 3 lines)
-                copy_text = (
-                    f"{raw_line_dec}\n"
-                    f"Code: {code_dec}\n"
-                    f"SeqNo (PSQ): {seq_raw} — {seq_dec}"
-                )
-
-                def copy_to_clipboard():
-                    detail_window.clipboard_clear()
-                    detail_window.clipboard_append(copy_text)
-                    detail_window.update()
-
-                # Copy button next to the description label
-                copy_btn = ttk.Button(container, text="Copy Code To Clipboard", command=copy_to_clipboard)
-                copy_btn.grid(row=r, column=1, padx=(5,10), pady=6, sticky="w")
-
-                # Build combined multi-line string with cod3r_database desc appended
-                combined_text = (
-                    f"{raw_line_dec}\n"
-                    f"Code: {code_dec}\n"
-                    f"SeqNo (PSQ): {seq_raw} — {seq_dec}\n\n"
-                    f"{cod3r_desc}"
-                )
-
-                ttk.Label(
-                    container,
-                    text=combined_text,
-                    font=dec_fnt,
-                    foreground=dec_fg,
-                    wraplength=600,
-                    justify="left"
-                ).grid(row=r, column=2, padx=(0,5), pady=6, sticky="w")
-
-                r += 1
-                continue
-
-
-
-
-
-            # Normal handling for other fields
-            raw_val = record_data.get(key, 'N/A')
-            dec_val_str = dec_fn(raw_val) if dec_fn and raw_val != 'N/A' else ("N/A" if dec_fn else "")
-            lbl_fnt, lbl_fg, val_fnt, dec_fnt, dec_fg = (self.font_family,8,"bold"), self.fg_text, ("Segoe UI Emoji",10), (self.font_family,10,"bold"), self.fg_text
-
-            ttk.Label(container,text=lbl_txt,font=lbl_fnt,foreground=lbl_fg).grid(row=r,column=0,padx=(0,0.2),pady=6,sticky="nw")
-            ttk.Label(container,text=str(raw_val),font=val_fnt,foreground=lbl_fg,wraplength=250).grid(row=r,column=1,padx=(0,0.2),pady=6,sticky="w")
-            if dec_val_str:
-                cur_fg = dec_fg
-                if dec_val_str == "N/A" or "Unknown" in dec_val_str or "Invalid" in dec_val_str:
-                    cur_fg = "#AAAAAA"
-                elif "Error" in dec_val_str:
-                    cur_fg = self.error_tag_color
-                ttk.Label(container,text=dec_val_str,font=dec_fnt,foreground=cur_fg,wraplength=350).grid(row=r,column=2,padx=(0,5),pady=6,sticky="w")
-            r += 1
-        
-        # --- Add Error Code Specific Image / Default Image ---
-        if PIL_AVAILABLE:
-            err_code_val = record_data.get('Code', '')
-            image_to_load = None
-            placeholder_text_for_image = "No specific image available."
-            default_image_filename = "default_image.png"  # User needs to provide this in src/
-
-            # Try full code first (e.g., 80801001.png)
-            if err_code_val:
-                full_code_image = f"{err_code_val}.png"
-                full_code_path = os.path.join(application_path, "src", full_code_image)
-                if os.path.exists(full_code_path):
-                    image_to_load = full_code_image
-                    placeholder_text_for_image = f"Context image for {err_code_val}"
-            
-            # If no exact match, try 6-digit group image (e.g., 808010.png)
-            if not image_to_load and len(err_code_val) >= 6:
-                group_code_image = f"{err_code_val[:6]}.png"
-                group_code_path = os.path.join(application_path, "src", group_code_image)
-                if os.path.exists(group_code_path):
-                    image_to_load = group_code_image
-                    placeholder_text_for_image = f"Context image for group {err_code_val[:6]}"
-
-            # If no group match, use default image
-            if not image_to_load:
-                default_image_path = os.path.join(application_path, "src", default_image_filename)
-                if os.path.exists(default_image_path):
-                    image_to_load = default_image_filename
-                    placeholder_text_for_image = "Default context image"
-
-            # Display the image if any was found
-            if image_to_load:
-                code_image_label = ttk.Label(container, style="TLabel", background=self.bg_light, relief="solid", anchor="center")
-                code_image_label.grid(row=r, column=0, columnspan=3, sticky="nsew", padx=5, pady=10)
-                self._load_and_display_image(code_image_label, image_to_load, placeholder_text_for_image, max_width=380, max_height=200)
-                r += 1
-
-            # else:
-                # Optionally, add a text label saying "No image available" if neither specific nor default is found
-                # no_image_label = ttk.Label(container, text="No context image available.", style="TLabel")
-                # no_image_label.grid(row=r, column=0, columnspan=3, sticky="ew", padx=5, pady=10)
-                # r += 1
-
+        lbl_fnt, val_fnt, dec_fnt = (self.font_family,8,"bold"), ("Segoe UI Emoji",10), (self.font_family,10,"bold")
+        self._detail_rows = [] # (record key, decode_cache field or None, raw value label, decoded label)
+        for r, (lbl_txt, key, dec_field) in enumerate(DETAIL_FIELDS):
+            ttk.Label(container,text=lbl_txt,font=lbl_fnt,foreground=self.fg_text).grid(row=r,column=0,padx=(0,0.2),pady=6,sticky="nw")
+            raw_label = ttk.Label(container,text="",font=val_fnt,foreground=self.fg_text,wraplength=250); raw_label.grid(row=r,column=1,padx=(0,0.2),pady=6,sticky="w")
+            dec_label = ttk.Label(container,text="",font=dec_fnt,foreground=self.fg_text,wraplength=350); dec_label.grid(row=r,column=2,padx=(0,5),pady=6,sticky="w")
+            self._detail_rows.append((key, dec_field, raw_label, dec_label))
+        r = len(DETAIL_FIELDS)
+        ttk.Button(container, text="Copy Code To Clipboard", command=self._copy_detail_to_clipboard).grid(row=r, column=1, padx=(0,10), pady=6, sticky="w")
+        r += 1
+
+        # Code image, swapped in place as the record changes; the label stays empty without Pillow or images
+        self._detail_image_label = ttk.Label(container, style="TLabel", background=self.bg_light, relief="solid", anchor="center")
+        self._detail_image_name = None
 
         # soy.png (small logo, placed separately)
-        if PIL_AVAILABLE: 
-            try:
-                img_path = os.path.join(application_path, "src", "soy.png") 
-                if os.path.exists(img_path):
-                    pil_img = Image.open(img_path).resize((100, 100), Image.Resampling.LANCZOS)
-                    self.image_references['soy_detail_logo'] = ImageTk.PhotoImage(pil_img)
-                    soy_label = ttk.Label(detail_window, image=self.image_references['soy_detail_logo'], background=self.bg_medium)
-                    soy_label.place(relx=1.0,rely=1.0,anchor="se",x=-10,y=-10)
-            except Exception as e: self.log_to_general_output(f"Error loading soy.png for detail window: {e}", "error_tag")
+        if _load_pil() and "soy.png" in self.assets:
+            def show_soy(soy_photo, error):
+                if error is not None: self.log_to_general_output(f"Error loading soy.png for detail window: {error}", "error_tag"); return
+                if not detail_window.winfo_exists(): return # Closed before the image was ready
+                soy_label = ttk.Label(detail_window, image=soy_photo, background=self.bg_medium)
+                soy_label.image = soy_photo # Keep it alive with the label, even if the cache drops it
+                soy_label.place(relx=1.0,rely=1.0,anchor="se",x=-10,y=-10)
+            self._request_photo("soy.png", *SOY_LOGO_SIZE, exact=True, on_ready=show_soy)
+
+    def _fill_detail_window(self, index, record):
+        """Updates the detail labels in place for another record; decoded values come from decode_cache."""
+        self._detail_record = record
+        record_data = record.fields() # Raw hex text of each field
+        self.detail_window.title(f"Log Details - Index {index:02d}")
+        for key, dec_field, raw_label, dec_label in self._detail_rows:
+            raw_val = record_data.get(key, 'N/A')
+            dec_val_str = decode_cache.decode(dec_field, raw_val) if dec_field and raw_val != 'N/A' else ("N/A" if dec_field else "")
+            cur_fg = self.fg_text
+            if dec_val_str == "N/A" or "Unknown" in dec_val_str or "Invalid" in dec_val_str: cur_fg = "#AAAAAA"
+            elif "Error" in dec_val_str: cur_fg = self.error_tag_color
+            raw_label.config(text=str(raw_val)); dec_label.config(text=dec_val_str, foreground=cur_fg)
+
+        # --- Error Code Specific Image / Default Image ---
+        if _load_pil():
+            # Full code first (e.g. 80801001.png), then its 6-digit group (808010.png), then default_image.png
+            image_to_load, placeholder_text_for_image = self.assets.image_for_code(record_data.get('Code', ''))
+            if image_to_load != self._detail_image_name: # Records with the same image keep the one on screen
+                self._detail_image_name = image_to_load
+                if image_to_load:
+                    self._detail_image_label.grid(row=len(DETAIL_FIELDS) + 1, column=0, columnspan=3, sticky="nsew", padx=5, pady=10)
+                    self._load_and_display_image(self._detail_image_label, image_to_load, placeholder_text_for_image, *DETAIL_IMAGE_SIZE)
+                else: self._detail_image_label.grid_remove()
+
+    def _copy_detail_to_clipboard(self):
+        """Copies the raw line, decoded code and sequence number of the record in the detail window."""
+        record = self._detail_record
+        if record is None: return
+        seq_raw = record.seq_hex
+        copy_text = (f"{record.raw_line}\n"
+                     f"Code: {decode_cache.decode('Code', record.code_hex)}\n"
+                     f"SeqNo (PSQ): {seq_raw} — {decode_cache.decode('SeqNo', seq_raw)}")
+        self.detail_window.clipboard_clear(); self.detail_window.clipboard_append(copy_text)
+
+    def _detail_window_visible(self):
+        return self.detail_window is not None and self.detail_window.winfo_exists() and self.detail_window.state() != 'withdrawn'
+
+    def _on_table_select(self, table, lookup):
+        """Makes an open detail window follow the selection of the table it was opened from."""
+        if not self._detail_window_visible() or self._detail_source[0] is not table: return
+        self._detail_source = (table, lookup)
+        # Held-down arrow keys queue many selection events; one redraw once they are handled is enough
+        if self._detail_refresh_id is None: self._detail_refresh_id = self.master.after_idle(self._refresh_detail_from_selection)
+
+    def _refresh_detail_from_selection(self):
+        self._detail_refresh_id = None
+        table, lookup = self._detail_source
+        if not self._detail_window_visible() or not table.winfo_exists(): return
+        sel = table.curselection()
+        found = lookup(sel[0]) if sel else None
+        if found: self._fill_detail_window(*found)
+
+    def _step_detail_selection(self, step):
+        """Arrow keys in the detail window move the selection of its source table, which the window then follows."""
+        table, lookup = self._detail_source
+        if not table.winfo_exists() or not table.size(): return
+        sel = table.curselection()
+        row = max(0, min(table.size() - 1, (sel[0] if sel else -1) + step))
+        table.selection_clear(0, tk.END); table.selection_set(row); table.activate(row); table.see(row)
+        self._on_table_select(table, lookup)
 
     def _load_and_display_image(self, label_widget, image_filename, placeholder_text, max_width=320, max_height=200):
         """Helper to load, resize, and display an image or show placeholder text."""
-        if not PIL_AVAILABLE:
+        if not _load_pil():
             label_widget.config(text=placeholder_text, image='', font=(self.font_family, 10, "italic"), padding=(10,50))
             return
 
-        image_path = os.path.join(application_path, "src", image_filename) 
         try:
-            if not os.path.exists(image_path):
+            if image_filename not in self.assets:
                 # If the primary image (specific or default) is not found, display the placeholder text.
                 label_widget.config(text=f"{placeholder_text}\n(File not found: {image_filename})", image='', font=(self.font_family, 8, "italic"), padding=(10,10))
                 # self.log_to_general_output(f"Image not found: {image_filename}", "info_tag") # Less alarming than error
                 return # Stop here if file not found
 
-            pil_img = Image.open(image_path)
-            original_width, original_height = pil_img.size
-            if original_width == 0 or original_height == 0 : 
-                raise ValueError("Image has zero width or height")
-
-            ratio = min(max_width / original_width, max_height / original_height) if original_width > 0 and original_height > 0 else 1
-            new_width = int(original_width * ratio)
-            new_height = int(original_height * ratio)
-            
-            new_width = max(1, new_width) 
-            new_height = max(1, new_height)
-
-            resized_img = pil_img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            img_ref_key = f"{label_widget.winfo_id()}_{image_filename}" 
-            self.image_references[img_ref_key] = ImageTk.PhotoImage(resized_img)
-            
-            label_widget.config(image=self.image_references[img_ref_key], text="", padding=(0,0)) 
-        except Exception as e: # Catch other PIL errors or general exceptions
+            def show_photo(photo, error):
+                if not label_widget.winfo_exists(): return # Window closed while the image was loading
+                if label_widget.image_request != image_filename: return # The label moved on to another image meanwhile
+                if error is not None: # Catch PIL errors or general exceptions from the worker
+                    label_widget.config(text=f"{placeholder_text}\n(Error loading: {str(error)[:50]})", image='', font=(self.font_family, 8, "italic"), padding=(10,10))
+                    # self.log_to_general_output(f"Error loading image {image_filename}: {error}", "error_tag")
+                    return
+                label_widget.config(image=photo, text="", padding=(0,0))
+                label_widget.image = photo # Keep it alive with the label, even if the cache drops it
+            label_widget.image_request = image_filename
+            # Placeholder until the worker pool has the image ready (immediately on a cache hit)
+            label_widget.config(text=f"{placeholder_text}\n(Loading...)", image='', font=(self.font_family, 8, "italic"), padding=(10,10))
+            self._request_photo(image_filename, max_width, max_height, on_ready=show_photo)
+        except Exception as e: # Catch other errors
             label_widget.config(text=f"{placeholder_text}\n(Error loading: {str(e)[:50]})", image='', font=(self.font_family, 8, "italic"), padding=(10,10))
-            # self.log_to_general_output(f"Error loading image {image_filename}: {e}", "error_tag")
+
+    def _request_photo(self, image_filename, max_width, max_height, exact=False, on_ready=None):
+        """
+        Gets the resized PhotoImage of an asset and passes it to on_ready(photo, error) on the Tk thread.
+        Cache hits call on_ready straight away; misses are decoded and resampled by the worker pool.
+        """
+        key = ImageCache.make_key(image_filename, max_width, max_height, self.assets.mtime(image_filename), exact)
+        photo = self.image_cache.get(key)
+        if photo is not None:
+            if on_ready: on_ready(photo, None)
+            return
+        def loaded(pil_image, error):
+            photo = None
+            if error is None:
+                try:
+                    photo = self.image_cache.get(key) # Made by an earlier callback of the same job
+                    if photo is None and _load_pil():
+                        photo = ImageTk.PhotoImage(pil_image) # Tk objects are only created on the Tk thread
+                        self.image_cache.put(key, photo)
+                except Exception as e: error = e
+            if on_ready: on_ready(photo, error)
+        self.image_loader.submit(key, self.assets.path(image_filename), max_width, max_height, exact, callback=loaded)
+        if self._image_poll_id is None: self._image_poll_id = self.master.after(IMAGE_POLL_INTERVAL_MS, self._poll_image_loader)
+
+    def _poll_image_loader(self):
+        self._image_poll_id = None
+        if self.image_loader.poll(): # Jobs still running
+            self._image_poll_id = self.master.after(IMAGE_POLL_INTERVAL_MS, self._poll_image_loader)
+
+    def open_history_window(self):
+        """Browses every stored errlog record; the table reads the rows it shows straight from the store."""
+        if not self.errlog_store: messagebox.showinfo("History", "Errlog history is not available."); return
+        self._flush_errlog_store()
+        history_window = Toplevel(self.master); history_window.title("Errlog History")
+        history_window.configure(bg=self.bg_medium); history_window.geometry("950x500")
+        top_frame = ttk.Frame(history_window, style="TFrame", padding=(10,10,10,5)); top_frame.pack(fill='x')
+        ttk.Label(top_frame, text="Console:", style="TLabel").pack(side="left", padx=(0,2))
+        all_consoles = "All consoles"
+        console_var = tk.StringVar(value=all_consoles)
+        console_combo = ttk.Combobox(top_frame, textvariable=console_var, width=20, style='Dark.TCombobox', state='readonly',
+                                     values=[all_consoles] + self.errlog_store.consoles())
+        console_combo.pack(side="left", padx=(0,10))
+        status_label = ttk.Label(top_frame, text="", style="TLabel"); status_label.pack(side="right")
+
+        try: history_model = ErrlogHistoryModel(self.errlog_store, self._render_errlog_row) # Holds a few pages around the rows on screen
+        except sqlite3.Error as e: messagebox.showerror("History", f"Errlog history query failed: {e}"); history_window.destroy(); return
+        history_table = self._create_errlog_table(history_window, history_model, height=16)
+        history_table.pack(fill="both", expand=True, padx=10)
+
+        def load():
+            """Shows the history of another console (or all of them) in the order the table is sorted in."""
+            console = None if console_var.get() == all_consoles else console_var.get()
+            shown = history_table.model
+            try: model = ErrlogHistoryModel(self.errlog_store, self._render_errlog_row, console, shown.sort_column, shown.descending)
+            except sqlite3.Error as e: status_label.config(text=f"Query failed: {e}"); return
+            history_table.set_model(model)
+            status_label.config(text=f"{len(model):,} records")
+        def open_selected(event):
+            sel = history_table.curselection()
+            found = lookup(sel[0]) if sel else None
+            if found: self.show_detail_window(*found, source=(history_table, lookup))
+        def lookup(row):
+            model = history_table.model
+            try: record = model.record(row) if 0 <= row < len(model) else None
+            except sqlite3.Error: return None
+            return (record.entry_no, record) if record else None
+
+        bottom_frame = ttk.Frame(history_window, style="TFrame", padding=(10,5,10,10)); bottom_frame.pack(fill='x')
+        ttk.Button(bottom_frame, text="Refresh", command=load, style="TButton").pack(side="left", padx=5) # Picks up records stored since
+        console_combo.bind("<<ComboboxSelected>>", lambda event: load())
+        history_table.bind("<Double-Button-1>", open_selected)
+        history_table.bind("<Return>", open_selected)
+        history_table.bind("<<ListboxSelect>>", lambda event: self._on_table_select(history_table, lookup))
+        status_label.config(text=f"{len(history_model):,} records")
 
     def open_wiring_guide_window(self):
         wiring_window = Toplevel(self.master)
@@ -970,6 +1352,11 @@ The CH341A typically has a mode selection jumper (often labeled P/S - Programmer
     def on_closing(self):
         self.log_to_general_output("Application closing...", tag="info_tag")
         self.disconnect_serial()
+        if self.errlog_store:
+            try: self.errlog_store.close()
+            except sqlite3.Error: pass
+            self.errlog_store = None
+        self.image_loader.shutdown()
         if hasattr(self, 'master') and self.master.winfo_exists(): 
              try: self.master.destroy()
              except tk.TclError: pass 
@@ -982,6 +1369,7 @@ The CH341A typically has a mode selection jumper (often labeled P/S - Programmer
         return decoders._decode_rtc(rtc_hex)
 
     def cod3r_database(self, err_code_hex):
+        import error_databases # Loaded on first use, like in decode_cache
         return error_databases.cod3r_database(err_code_hex)
 
     def _decode_err_code(self, err_code_hex):
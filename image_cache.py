@@ -0,0 +1,178 @@
+# image_cache.py
+# This file contains the index of the image assets in src/ and the LRU cache of resized images.
+# Pillow is only imported by load_resized(), so the rest works without it.
+
+import collections
+import concurrent.futures
+import os
+
+DEFAULT_MAX_IMAGES = 32  # Resized images kept before the least recently used is dropped
+DEFAULT_IMAGE = "default_image.png"  # Shown for codes without an image of their own
+DEFAULT_LOADER_WORKERS = 2  # Pillow releases the GIL while decoding and resampling, so threads run in parallel
+
+
+class AssetIndex:
+    """
+    Names and modification times of the files in the asset directory.
+
+    The directory is listed once, so finding the image for a code costs a
+    dict lookup instead of a disk probe per candidate. Names are matched
+    case-insensitively, like os.path.exists on Windows.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._files = {}  # Lower-case name -> (actual name, mtime)
+        self.rescan()
+
+    def rescan(self):
+        files = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        files[entry.name.lower()] = (entry.name, entry.stat().st_mtime)
+        except OSError:
+            pass  # A missing asset directory just means there are no images
+        self._files = files
+
+    def __contains__(self, name):
+        return name.lower() in self._files
+
+    def __len__(self):
+        return len(self._files)
+
+    def names(self):
+        return [actual_name for actual_name, _ in self._files.values()]
+
+    def path(self, name):
+        actual_name = self._files.get(name.lower(), (name, None))[0]
+        return os.path.join(self.directory, actual_name)
+
+    def mtime(self, name):
+        """Modification time recorded by the last scan, None if the file does not exist."""
+        entry = self._files.get(name.lower())
+        return entry[1] if entry else None
+
+    def image_for_code(self, code):
+        """
+        Returns (file name, description) of the image for an error code: the full
+        code (e.g. 80801001.png), its 6-character group (808010.png) or the default
+        image, whichever exists first; (None, None) if there is none.
+        """
+        if code:
+            if f"{code}.png" in self:
+                return f"{code}.png", f"Context image for {code}"
+            if len(code) >= 6 and f"{code[:6]}.png" in self:
+                return f"{code[:6]}.png", f"Context image for group {code[:6]}"
+        if DEFAULT_IMAGE in self:
+            return DEFAULT_IMAGE, "Default context image"
+        return None, None
+
+
+def fit_size(width, height, max_width, max_height):
+    """Largest size with the same aspect ratio that fits in max_width x max_height (at least 1x1)."""
+    ratio = min(max_width / width, max_height / height)
+    return max(1, int(width * ratio)), max(1, int(height * ratio))
+
+
+def load_resized(path, max_width, max_height, exact=False):
+    """
+    Opens an image and resizes it with LANCZOS, to fit in max_width x max_height
+    keeping its aspect ratio, or to exactly that size when exact is True.
+    Returns a fully loaded PIL image.
+    """
+    from PIL import Image
+    with Image.open(path) as pil_img:
+        if pil_img.width == 0 or pil_img.height == 0:
+            raise ValueError("Image has zero width or height")
+        size = (max_width, max_height) if exact else fit_size(pil_img.width, pil_img.height, max_width, max_height)
+        return pil_img.resize(size, Image.Resampling.LANCZOS)
+
+
+class ImageCache:
+    """
+    LRU cache of resized images keyed on (file name, target size, mtime).
+
+    Holding the Tk PhotoImage here also keeps it alive while it is shown;
+    widgets that display one keep their own reference too, so evicting an
+    entry never blanks an open window. A changed file gets a new mtime and
+    therefore a new key, and its stale entry ages out.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_IMAGES):
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(name, max_width, max_height, mtime, exact=False):
+        return (name.lower(), max_width, max_height, exact, mtime)
+
+    def get(self, key):
+        image = self._entries.get(key)
+        if image is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return image
+
+    def put(self, key, image):
+        self._entries[key] = image
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+class ImageLoader:
+    """
+    Opens and resizes images on a small worker pool.
+
+    Only the PIL work runs on the workers. Callbacks run on whichever thread
+    calls poll() (the Tk thread in the GUI), which is where the PhotoImage
+    is then created. Requests for a key that is already being loaded share
+    that job instead of decoding the file twice.
+    """
+
+    def __init__(self, workers=DEFAULT_LOADER_WORKERS):
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-loader")
+        self._jobs = {}  # key -> (future, [callbacks])
+
+    def submit(self, key, path, max_width, max_height, exact=False, callback=None):
+        """Queues a load_resized() call; callback(image, error) runs from poll() once it is done."""
+        job = self._jobs.get(key)
+        if job is None:
+            future = self._executor.submit(load_resized, path, max_width, max_height, exact)
+            job = self._jobs[key] = (future, [])
+        if callback is not None:
+            job[1].append(callback)
+
+    def is_loading(self, key):
+        return key in self._jobs
+
+    def poll(self):
+        """Runs the callbacks of finished jobs. Returns True while jobs are still running."""
+        for key in [key for key, (future, _) in self._jobs.items() if future.done()]:
+            future, callbacks = self._jobs.pop(key)
+            error = future.exception()
+            image = None if error else future.result()
+            for callback in callbacks:
+                callback(image, error)
+        return bool(self._jobs)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._jobs.clear()
@@ -1,16 +1,57 @@
 # main.py
 # This is the main entry point for the UART Terminal Application.
+# "python main.py decode [FILE ...]" runs the headless batch decoder instead of the GUI.
+# "python main.py capture PORT [PORT ...]" captures several consoles at once without the GUI.
+# "python main.py simulate" runs a fake console on a pseudo-terminal for testing.
+# "python main.py --startup-report" starts the GUI and prints where the start-up time went.
 
-import tkinter as tk
-import gui # Import the gui module where UartTerminalGUI is defined
+import sys
+import contextlib
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "decode":
+        # Headless mode: batch_decode never imports tkinter, pyserial or PIL
+        import batch_decode
+        sys.exit(batch_decode.main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "capture":
+        import capture_engine
+        sys.exit(capture_engine.main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "simulate":
+        import uart_simulator
+        sys.exit(uart_simulator.main(sys.argv[2:]))
+
+    report = None
+    if "--startup-report" in sys.argv[1:]:
+        from startup_report import StartupReport
+        report = StartupReport()
+        report.start_import_timing()
+
+    def phase(name):
+        # No-op unless a start-up report was asked for
+        return report.phase(name) if report else contextlib.nullcontext()
+
+    with phase("import tkinter"):
+        import tkinter as tk
+    with phase("import gui"):
+        import gui # Import the gui module where UartTerminalGUI is defined
+
     # Create the main application window
-    root = tk.Tk()
+    with phase("create Tk root"):
+        root = tk.Tk()
 
     # Instantiate the UartTerminalGUI class from the gui module
     # The UartTerminalGUI class itself will handle its title, geometry, etc.
-    app = gui.UartTerminalGUI(root)
+    with phase("build main window"):
+        app = gui.UartTerminalGUI(root)
+
+    if report:
+        report.stop_import_timing()
+        def first_paint():
+            report.mark("first paint")
+            try: path = report.write_report()
+            except OSError as e: app.log_to_general_output(f"Start-up report could not be written: {e}", tag="error_tag"); return
+            if path: app.log_to_general_output(f"Start-up report written to {path}", tag="info_tag") # Windowed build, no stderr
+        root.after(1, lambda: root.after_idle(first_paint)) # Idle again once the mapped window has been drawn
 
     # Start the Tkinter event loop
     root.mainloop()
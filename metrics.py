@@ -0,0 +1,104 @@
+# metrics.py
+# This file contains the counters and timers used to watch the capture pipeline while it runs.
+# No Tk dependency; the GUI shows snapshot() in its stats panel and can append it to a JSON lines file.
+
+import os
+import threading
+import time
+
+
+class RateCounter:
+    """A running total that also reports its rate since the previous snapshot."""
+
+    __slots__ = ('total', '_last_total', '_last_time')
+
+    def __init__(self):
+        self.total = 0
+        self._last_total = 0
+        self._last_time = time.perf_counter()
+
+    def add(self, amount=1):
+        self.total += amount
+
+    def snapshot(self, now):
+        elapsed = now - self._last_time
+        rate = (self.total - self._last_total) / elapsed if elapsed > 0 else 0.0
+        self._last_total, self._last_time = self.total, now
+        return {'total': self.total, 'per_sec': round(rate, 1)}
+
+
+class TimingStat:
+    """Count, mean, max and last of a repeated duration, in milliseconds."""
+
+    __slots__ = ('count', 'total', 'max', 'last')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def snapshot(self):
+        mean = self.total / self.count if self.count else 0.0
+        return {'count': self.count, 'mean_ms': round(mean * 1e3, 4), 'max_ms': round(self.max * 1e3, 4),
+                'last_ms': round(self.last * 1e3, 4)}
+
+
+class PipelineMetrics:
+    """
+    Counters for each stage of the serial pipeline.
+
+    The reader thread only touches rx_bytes and rx_lines, everything else is
+    updated on the Tk thread, so no locking is needed on the hot path; the
+    small race on a snapshot taken mid-update only shifts a count between
+    two snapshots. queue_depth is a callable sampled at snapshot time.
+    """
+
+    def __init__(self, queue_depth=None):
+        self.rx_bytes = RateCounter()  # Bytes read from the port
+        self.rx_lines = RateCounter()  # Lines framed by the reader
+        self.records = RateCounter()  # Errlog records ingested
+        self.drain_time = TimingStat()  # process_serial_queue ticks that had work
+        self.decode_time = TimingStat()  # Parsing and decoding of one errlog record
+        self.render_time = TimingStat()  # Listbox updates
+        self.queue_depth = queue_depth or (lambda: 0)
+        self.max_queue_depth = 0
+        self.started = time.time()
+        self._snapshot_lock = threading.Lock()
+
+    def sample_queue_depth(self):
+        depth = self.queue_depth()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+        return depth
+
+    def snapshot(self):
+        """Returns every metric as a JSON-friendly dict; rates cover the time since the previous snapshot."""
+        with self._snapshot_lock:
+            now = time.perf_counter()
+            return {
+                'time': round(time.time(), 3),
+                'uptime_s': round(time.time() - self.started, 1),
+                'rx_bytes': self.rx_bytes.snapshot(now),
+                'rx_lines': self.rx_lines.snapshot(now),
+                'records': self.records.snapshot(now),
+                'queue_depth': self.sample_queue_depth(),
+                'max_queue_depth': self.max_queue_depth,
+                'drain_tick': self.drain_time.snapshot(),
+                'decode_record': self.decode_time.snapshot(),
+                'listbox_render': self.render_time.snapshot(),
+            }
+
+    def dump(self, path, snapshot=None):
+        """Appends one snapshot as a JSON line to path, tagged with the machine it was taken on."""
+        import json, platform  # Only needed when dumping, kept off the start-up path
+        entry = dict(snapshot or self.snapshot(), host=platform.node(), pid=os.getpid())
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, sort_keys=True) + "\n")
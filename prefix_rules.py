@@ -0,0 +1,74 @@
+# prefix_rules.py
+# This file contains the prefix rule engine shared by the code decoders and the GUI colouring.
+
+
+class _Node:
+    __slots__ = ('children', 'prefix', 'value')
+
+    def __init__(self):
+        self.children = {}
+        self.prefix = None  # Set when a rule ends at this node
+        self.value = None
+
+
+class PrefixRuleSet:
+    """
+    A table of (prefix, value) rules compiled into a character trie.
+
+    Lookups return the value of the longest rule that is a prefix of the key,
+    so a specific code such as '80050000' wins over a catch-all such as '8005'
+    regardless of the order the rules were added in. A lookup walks at most
+    as many nodes as the longest rule has characters.
+    """
+
+    def __init__(self, rules=(), default=None):
+        self._root = _Node()
+        self.default = default
+        self._count = 0
+        for prefix, value in rules:
+            self.add(prefix, value)
+
+    def add(self, prefix, value):
+        """Adds a rule. Adding the same prefix again replaces its value."""
+        node = self._root
+        for char in prefix:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _Node()
+            node = child
+        if node.prefix is None:
+            self._count += 1
+        node.prefix = prefix
+        node.value = value
+
+    def match(self, key):
+        """Returns (prefix, value) of the longest matching rule, or (None, default)."""
+        node = self._root
+        best = node if node.prefix is not None else None
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.prefix is not None:
+                best = node
+        if best is None:
+            return None, self.default
+        return best.prefix, best.value
+
+    def lookup(self, key, default=None):
+        """Returns the value of the longest matching rule, or the given/set default."""
+        prefix, value = self.match(key)
+        if prefix is None:
+            return self.default if default is None else default
+        return value
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, prefix):
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return False
+        return node.prefix is not None
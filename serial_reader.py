@@ -0,0 +1,111 @@
+# serial_reader.py
+# This file contains the line framing, echo filtering and command formatting shared by the serial readers.
+
+READ_CHUNK_SIZE = 4096  # Upper bound for a single blocking read from the port
+
+
+class LineFramer:
+    """
+    Splits a raw UART byte stream into decoded text lines.
+
+    Incoming bytes are appended to a bytearray and complete lines are sliced out
+    through a memoryview, so each byte is copied once on the way in and once when
+    its line is decoded. Partial lines stay as bytes until their newline arrives.
+    """
+
+    def __init__(self, encoding='utf-8'):
+        self.encoding = encoding
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """Adds received bytes and returns the list of complete, stripped, non-empty lines."""
+        if not data:
+            return []
+        buf = self._buffer
+        search_from = len(buf)
+        buf += data
+
+        newline = buf.find(b'\n', search_from)
+        if newline < 0:
+            return []
+
+        lines = []
+        start = 0
+        view = memoryview(buf)
+        try:
+            while newline >= 0:
+                line = str(view[start:newline], self.encoding, 'replace').strip()
+                if line:
+                    lines.append(line)
+                start = newline + 1
+                newline = buf.find(b'\n', start)
+        finally:
+            view.release()  # A bytearray cannot be resized while a view is exported
+        del buf[:start]
+        return lines
+
+    def pending(self):
+        """Number of buffered bytes still waiting for a newline."""
+        return len(self._buffer)
+
+    def reset(self):
+        """Drops any partial line, e.g. after reconnecting."""
+        self._buffer.clear()
+
+
+def read_available(serial_connection):
+    """
+    Blocks until data arrives or the port timeout expires, then returns everything buffered.
+
+    Reading a single byte lets pyserial wait on the driver instead of sleep-polling;
+    whatever else is already queued is collected without waiting again.
+    """
+    data = serial_connection.read(1)
+    if data:
+        waiting = serial_connection.in_waiting
+        if waiting:
+            data += serial_connection.read(min(waiting, READ_CHUNK_SIZE))
+    return data
+
+
+def filter_echo(lines, last_sent_command, echo_handled):
+    """
+    Replaces the console's echo of the last sent command with a single '> command' line.
+    Returns (lines to show, echo_handled); pass echo_handled back in on the next call.
+    """
+    sent = last_sent_command.strip() if last_sent_command else ""
+    sent_lower = sent.lower()
+    shown = []
+    for clean_line in lines:
+        # Echo handling: print once if exact match
+        if sent and clean_line.lower() == sent_lower:
+            if not echo_handled:
+                shown.append(f"> {sent}")
+                echo_handled = True
+            continue
+        # Any non-empty non-echo line; reset echo flag
+        shown.append(clean_line)
+        echo_handled = False
+    return shown, echo_handled
+
+
+# Adapters that need a ':XX' checksum appended to every command (the Pico firmware adds it itself)
+CHECKSUM_ADAPTERS = ("CH341", "Generic USB-to-TTL(Prolific)", "Other")
+
+
+def calculate_checksum(data_string):
+    csum = 0
+    for char_val in data_string.encode('utf-8', errors='replace'): csum = (csum + char_val) & 0xFF
+    return csum
+
+
+def format_command(command_str, adapter_type):
+    """Returns the bytes to write for a command and the message to log for it."""
+    if adapter_type in CHECKSUM_ADAPTERS:
+        checksum_hex = f"{calculate_checksum(command_str):02X}"
+        full_command = f"{command_str}:{checksum_hex}\n"
+        log_msg = f"Sent (Chksum: {checksum_hex}): {command_str}"
+    else:  # Pico or no-checksum
+        full_command = f"{command_str}\n"
+        log_msg = f"Sent: {command_str}"
+    return full_command.encode('utf-8', errors='replace'), log_msg
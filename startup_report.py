@@ -0,0 +1,94 @@
+# startup_report.py
+# This file contains the start-up timing report printed by "python main.py --startup-report".
+# It works in the PyInstaller build too, where "python -X importtime" is not available; that build has
+# no console (sys.stderr is None), so the report goes to a file next to the exe instead.
+
+import builtins
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+REPORT_TOP_IMPORTS = 15  # Slowest modules listed in the report
+REPORT_FILENAME = "startup_report.txt"  # Written next to the exe when there is no console to print to
+
+
+class StartupReport:
+    """
+    Times the start-up phases and every module imported during them.
+
+    Imports are timed by wrapping builtins.__import__ while the report is
+    active; each module is charged its own time, excluding the modules it
+    imports in turn (the "self" column of -X importtime).
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []  # (name, seconds)
+        self.import_times = {}  # Module name -> self time in seconds
+        self.marks = {}  # Point name -> seconds since the report was created
+        self._original_import = None
+
+    def start_import_timing(self):
+        original_import = self._original_import = builtins.__import__
+        import_times = self.import_times
+        stack = []  # Time spent in nested imports, one entry per import in progress
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules:  # Already loaded: nothing worth timing
+                return original_import(name, globals, locals, fromlist, level)
+            start = time.perf_counter()
+            stack.append(0.0)
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = stack.pop()
+                import_times[name] = import_times.get(name, 0.0) + elapsed - nested
+                if stack:
+                    stack[-1] += elapsed
+
+        builtins.__import__ = timed_import
+
+    def stop_import_timing(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def mark(self, name):
+        """Records a point in time (e.g. the first paint), measured from when the report was created."""
+        self.phases.append((name, None))
+        self.marks[name] = time.perf_counter() - self.started
+
+    def write_report(self):
+        """Prints the report to stderr, or writes it to REPORT_FILENAME when there is none. Returns that file's path or None."""
+        if sys.stderr is not None:
+            self.print_report(sys.stderr)
+            return None
+        base = os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+        path = os.path.join(base, REPORT_FILENAME)
+        with open(path, 'w', encoding='utf-8') as f:
+            self.print_report(f)
+        return path
+
+    def print_report(self, out):
+        print("Start-up report", file=out)
+        for name, seconds in self.phases:
+            if seconds is None:
+                print(f"  {name:36s} at {self.marks[name] * 1e3:8.1f} ms", file=out)
+            else:
+                print(f"  {name:36s} {seconds * 1e3:11.1f} ms", file=out)
+        slowest = sorted(self.import_times.items(), key=lambda item: item[1], reverse=True)[:REPORT_TOP_IMPORTS]
+        if slowest:
+            print(f"Slowest imports (self time, {len(self.import_times)} modules imported):", file=out)
+            for name, seconds in slowest:
+                print(f"  {name:36s} {seconds * 1e3:11.1f} ms", file=out)
+        out.flush()
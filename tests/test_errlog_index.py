@@ -0,0 +1,78 @@
+# test_errlog_index.py
+# The chunked sorted keys and the filter indexes, checked against plain lists and a scan of every record.
+
+import random
+
+import pytest
+
+import errlog_index
+from errlog_index import ErrlogIndex, ErrlogQuery, SortedChunks, parse_code_prefix
+from errlog_record import parse_errlog_line
+from uart_simulator import generate_errlog_lines
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(errlog_index, 'KEY_CHUNK_SIZE', 4)  # Many chunks and splits with few items
+
+
+def test_sorted_chunks_match_sorted_list(small_chunks):
+    rng = random.Random(0)
+    expected = rng.sample(range(10000), 50)
+    chunks = SortedChunks(expected)
+    expected.sort()
+    for _ in range(500):
+        item = rng.randrange(10000)
+        while item in expected:
+            item = rng.randrange(10000)
+        assert chunks.insert(item) == len([x for x in expected if x < item])
+        expected.append(item); expected.sort()
+    assert len(chunks) == len(expected)
+    assert chunks.items(0, len(chunks)) == expected
+    for _ in range(200):
+        start = rng.randrange(-5, len(expected) + 5)
+        stop = start + rng.randrange(0, 40)
+        assert chunks.items(start, stop) == expected[max(0, start):max(0, stop)]
+        low, high = sorted(rng.randrange(10000) for _ in range(2))
+        count, items = chunks.range(low, high)
+        assert items() == [x for x in expected if low <= x < high] and count == len(items())
+        assert chunks.position(low) == len([x for x in expected if x < low])
+    assert chunks[3] == expected[3] and chunks.last() == expected[-1]
+    with pytest.raises(IndexError):
+        chunks[len(expected)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("8080", (0x80800000, 0x8080FFFF)),
+    ("8080xxxx", (0x80800000, 0x8080FFFF)),
+    ("c0*", (0xC0000000, 0xC0FFFFFF)),
+    ("80801105", (0x80801105, 0x80801105)),
+    ("", None),
+])
+def test_parse_code_prefix(text, expected):
+    assert parse_code_prefix(text) == expected
+
+
+@pytest.mark.parametrize("text", ["80G0", "808011050", "-1"])
+def test_parse_code_prefix_rejects(text):
+    with pytest.raises(ValueError):
+        parse_code_prefix(text)
+
+
+def test_query_matches_scan(small_chunks):
+    rng = random.Random(1)
+    records = [parse_errlog_line(line) for line in generate_errlog_lines(2000, seed=1)]
+    index = ErrlogIndex()
+    for record in reversed(records):  # Oldest first, as an errlog sweep does not deliver them
+        index.add(record)
+    rtcs = sorted(record.rtc for record in records)
+    for _ in range(300):
+        rtc_min, rtc_max = sorted(rng.choice(rtcs) for _ in range(2))
+        query = ErrlogQuery(
+            code_range=rng.choice([None, parse_code_prefix(rng.choice(["80", "8080", "C0", "8000000"]))]),
+            rtc_min=rng.choice([None, rtc_min]), rtc_max=rng.choice([None, rtc_max]),
+            soc_min=rng.choice([None, rng.uniform(20, 100)]), env_min=rng.choice([None, rng.uniform(10, 50), 30]))
+        expected = [record_id for record_id, record in enumerate(index.records) if query.matches(record)]
+        assert index.query(query) == expected
+    assert index.newest_rtc == rtcs[-1]
+    assert index.query(ErrlogQuery()) == list(range(len(records)))
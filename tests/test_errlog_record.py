@@ -0,0 +1,58 @@
+# test_errlog_record.py
+# Parsing of errlog reply lines and decoding of the 808011xx RAM bank codes.
+
+import pytest
+
+import error_databases
+from errlog_record import parse_errlog_line
+from uart_simulator import UNUSED_SLOT_REPLY, generate_errlog_lines, with_checksum
+
+LINE = "OK 00000000 80801105 0A19E3AF 20000001 D5F4B3B2 1BB2 C4647159 5902 210B"
+
+
+def test_parses_fields():
+    record = parse_errlog_line(with_checksum(LINE))
+    assert (record.code_hex, record.rtc_hex, record.seq_hex) == ("80801105", "0A19E3AF", "1BB2")
+    assert record.t_soc == 0x5902 and record.t_env_celsius == 0x210B / 256.0
+    assert record.checksum is not None
+    assert record.fields()['T_Env'] == "210B"
+    assert parse_errlog_line(LINE).checksum is None
+
+
+def test_generated_lines_parse():
+    for line in generate_errlog_lines(5000, seed=4):
+        assert parse_errlog_line(with_checksum(line)) is not None
+
+
+@pytest.mark.parametrize("line", ["NG E0000003", "OK 00000000 SIMULATED-UART 1.00", "errlog 0", "", UNUSED_SLOT_REPLY])
+def test_not_an_entry(line):
+    assert parse_errlog_line(line) is None
+
+
+@pytest.mark.parametrize("line", [
+    "OK 00000000 -1 0x10 1_0 0 0 0 -100 0",
+    "OK 00000000 -0000001 0A19E3AF 20000001 D5F4B3B2 1BB2 C4647159 5902 210B",
+    "OK 00000000 80801105 0x19E3AF 20000001 D5F4B3B2 1BB2 C4647159 5902 210B",
+    "OK 00000000 80801105 0A19E3AF 20000001 D5F4B3B2 1BB2 C4647159 -100 210B",
+    "OK 00000000 80801105 0A19E3AF 20000001 D5F4B3B2 1_B2 C4647159 5902 210B",
+    "OK 00000000 80801105 0A19E3AF 20000001 D5F4B3B2 1BB2 C4647159 5902 210",
+    "OK 00000000 80801105 0A19E3AF 20000001 D5F4B3B2 1BB2 C4647159 5902 210B:G1",
+])
+def test_rejects_malformed_fields(line):
+    with pytest.raises(ValueError):
+        parse_errlog_line(line)
+
+
+@pytest.mark.parametrize("code, banks", [
+    ("80801100", "No Bank"),
+    ("80801101", "Bank 1"),
+    ("80801105", "Bank 1,3"),
+    ("80801184", "Bank 3,8"),
+    ("808011FF", "Bank 1,2,3,4,5,6,7,8"),
+])
+def test_gddr6_bank_codes(code, banks):
+    assert error_databases.cod3r_database(code) == error_databases.GDDR6_BANK_MESSAGE.format(banks)
+
+
+def test_gddr6_bank_code_needs_hex_mask():
+    assert error_databases.cod3r_database("808011ZZ") == error_databases.DEFAULT_MESSAGE.format("808011ZZ")
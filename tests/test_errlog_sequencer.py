@@ -0,0 +1,166 @@
+# test_errlog_sequencer.py
+# The errlog request/response state machine, driven by the simulated console's replies.
+
+import os
+
+import pytest
+
+from errlog_sequencer import REPLY_EMPTY, REPLY_NG, REPLY_RECORD, ErrlogSequencer, classify_reply
+from uart_simulator import UartSimulator, with_checksum
+
+
+def replies(simulator, command):
+    """What the console sends back for a command, as the sequencer sees it (echo filtered, checksum on)."""
+    return [with_checksum(line) for line in simulator.reply_to(command)]
+
+
+def run(sequencer, simulator, lost=()):
+    """
+    Runs a sequence to the end, answering each command with the simulator. Sends listed in lost
+    (numbered from 0 in send order) get no reply, so the timeout fires. Returns the record lines
+    received, each once, as the errlog list would show them.
+    """
+    fetched, sends = [], 0
+    command = sequencer.start()
+    while command is not None:
+        answered = sends not in lost
+        sends += 1
+        if not answered:
+            command = sequencer.handle_timeout()
+            continue
+        for line in replies(simulator, command):
+            if classify_reply(line) == REPLY_RECORD and line not in fetched:
+                fetched.append(line)
+            if sequencer.feed(line) is not None:
+                command = sequencer.advance()
+                break
+        else:
+            command = sequencer.handle_timeout()
+    return fetched
+
+
+@pytest.fixture
+def simulator():
+    return UartSimulator(slots=5, seed=1, capacity=8)
+
+
+def test_classify_reply(simulator):
+    assert classify_reply(replies(simulator, "errlog 0")[0]) == REPLY_RECORD
+    assert classify_reply(replies(simulator, "errlog 6")[0]) == REPLY_EMPTY  # Unused slot, all FFFFFFFF
+    assert classify_reply(replies(simulator, "errlog 8")[0]) == REPLY_NG  # Past the last slot
+    assert classify_reply("errlog 0") is None
+
+
+def test_fetches_every_slot_in_order(simulator):
+    sequencer = ErrlogSequencer(range(5))
+    assert run(sequencer, simulator) == [with_checksum(line) for line in simulator.errlog_lines]
+    assert sequencer.answered == 5 and sequencer.retries == 0 and sequencer.finished
+
+
+def test_sweep_stops_at_unused_slot(simulator):
+    sequencer = ErrlogSequencer(range(64), stop_on_empty=True)
+    assert len(run(sequencer, simulator)) == 5
+    assert sequencer.stop_reason == "slot 5 is empty"
+
+
+def test_sweep_stops_at_ng(simulator):
+    simulator.capacity = 5
+    sequencer = ErrlogSequencer(range(64), stop_on_empty=True)
+    assert len(run(sequencer, simulator)) == 5
+    assert sequencer.stop_reason == "console answered NG at slot 5"
+
+
+def test_sweep_stops_at_known_record(simulator):
+    from errlog_record import parse_errlog_line
+    known = {parse_errlog_line(simulator.errlog_lines[2]).key}
+    sequencer = ErrlogSequencer(range(64), stop_on_empty=True, known_keys=known)
+    assert len(run(sequencer, simulator)) == 3
+    assert sequencer.stop_reason == "slot 2 was already fetched"
+
+
+def test_lost_reply_is_resent(simulator):
+    sequencer = ErrlogSequencer(range(5))
+    assert run(sequencer, simulator, lost={1}) == [with_checksum(line) for line in simulator.errlog_lines]
+    assert sequencer.retries == 1 and not sequencer.failed_indexes
+
+
+def test_slot_given_up_after_max_retries(simulator):
+    sequencer = ErrlogSequencer(range(3), max_retries=2)
+    fetched = run(sequencer, simulator, lost={0, 1, 2})
+    assert sequencer.failed_indexes == [0]
+    assert fetched == [with_checksum(line) for line in simulator.errlog_lines[1:3]]
+
+
+def test_late_reply_after_resend_is_not_taken_for_next_slot(simulator):
+    lines = [with_checksum(line) for line in simulator.errlog_lines]
+    sequencer = ErrlogSequencer(range(3))
+    assert sequencer.start() == "errlog 0"
+    assert sequencer.handle_timeout() == "errlog 0"  # Resend
+    assert sequencer.feed(lines[0]) is None  # Answer to one send; the other one's reply is still owed
+    assert sequencer.feed(lines[0]) == REPLY_RECORD  # The late one: now slot 0 is done
+    assert sequencer.advance() == "errlog 1"
+    assert sequencer.feed(lines[1]) == REPLY_RECORD and sequencer.current_index == 1
+
+
+def test_owed_reply_lost_moves_on_after_timeout(simulator):
+    lines = [with_checksum(line) for line in simulator.errlog_lines]
+    sequencer = ErrlogSequencer(range(3))
+    sequencer.start(); sequencer.handle_timeout()
+    assert sequencer.feed(lines[0]) is None and sequencer.owed_replies == 1
+    assert sequencer.handle_timeout() == "errlog 1"  # Not a resend: slot 0 was answered
+    assert sequencer.retries == 1 and not sequencer.failed_indexes
+
+
+def test_late_reply_after_give_up_is_not_taken_for_next_slot(simulator):
+    lines = [with_checksum(line) for line in simulator.errlog_lines]
+    sequencer = ErrlogSequencer(range(3), max_retries=2)
+    sequencer.start()
+    for _ in range(2):
+        assert sequencer.handle_timeout() == "errlog 0"
+    assert sequencer.handle_timeout() == "errlog 1"  # Slot 0 given up after three sends
+    assert sequencer.feed(lines[0]) is None  # Late reply to slot 0
+    assert sequencer.current_index == 1
+    assert sequencer.feed(lines[0]) is None and sequencer.feed(lines[0]) is None
+    assert sequencer.feed(lines[1]) == REPLY_RECORD and sequencer.current_index == 1
+
+
+def test_give_up_replies_lost_resends_next_slot(simulator):
+    lines = [with_checksum(line) for line in simulator.errlog_lines]
+    sequencer = ErrlogSequencer(range(3), max_retries=1)
+    sequencer.start(); sequencer.handle_timeout()
+    assert sequencer.handle_timeout() == "errlog 1"  # Slot 0 given up after two sends
+    assert sequencer.feed(lines[1]) is None  # Can't be told from a late reply to slot 0
+    assert sequencer.handle_timeout() == "errlog 1"  # Nothing more came: slot 0's replies were lost, ask again
+    assert sequencer.feed(lines[1]) is None  # The answer; the one taken for slot 0's is owed to the first send
+    assert sequencer.current_index == 1 and sequencer.owed_replies == 1
+    assert sequencer.handle_timeout() == "errlog 2"
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="the simulator needs a pseudo-terminal")
+def test_sweep_over_simulated_port():
+    serial = pytest.importorskip("serial")
+    from serial_reader import LineFramer
+    framer, fetched = LineFramer(), []
+
+    def reply_kind(port, sequencer):
+        """Reads lines until one answers the outstanding command."""
+        while True:
+            data = port.read(port.in_waiting or 1)
+            assert data, "no reply from the simulator"
+            for line in framer.feed(data):
+                kind = sequencer.feed(line)  # The echo is not a reply, so it is ignored here
+                if kind is not None:
+                    if kind == REPLY_RECORD:
+                        fetched.append(line)
+                    return kind
+
+    with UartSimulator(slots=4, seed=2, capacity=8, baud=1000000) as simulator:
+        with serial.Serial(simulator.port_name, timeout=2) as port:
+            sequencer = ErrlogSequencer(range(64), stop_on_empty=True)
+            command = sequencer.start()
+            while command is not None:
+                port.write(f"{command}\n".encode())
+                reply_kind(port, sequencer)
+                command = sequencer.advance()
+    assert fetched == [with_checksum(line) for line in simulator.errlog_lines]
+    assert sequencer.stop_reason == "slot 4 is empty"
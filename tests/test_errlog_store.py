@@ -0,0 +1,102 @@
+# test_errlog_store.py
+# Keyset paging of the errlog history, checked against a full ORDER BY, with many equal sort values.
+
+import random
+
+import pytest
+
+from errlog_record import ErrlogRecord
+from errlog_store import SORT_COLUMNS, ErrlogStore
+from errlog_table import HISTORY_SORT_COLUMNS, ErrlogHistoryModel
+
+CONSOLES = ("COM3", "COM4")
+
+
+@pytest.fixture(scope='module')
+def store(tmp_path_factory):
+    rng = random.Random(2)
+    store = ErrlogStore(str(tmp_path_factory.mktemp("history") / "errlog_history.db"))
+    for n in range(600):
+        # Few distinct values per column, so most keys share their value with other rows
+        record = ErrlogRecord("", 0, rng.choice((0x80800001, 0x80801105, 0xC0020303)), rng.randrange(0x0A000000, 0x0A000008),
+                              5, 1, n, 0, rng.choice((0x3000, 0x3800, 0x4000)), rng.choice((0x1800, 0x2000)))
+        store.add(record, rng.choice(CONSOLES))
+    store.flush()
+    yield store
+    store.close()
+
+
+def full_order(store, sort, descending, console=None):
+    """Row ids in the order pages should follow: the sort column, equal values in the order of the column's index."""
+    id_descending = descending != (sort == 'rtc')
+    where = " WHERE console = ?" if console else ""
+    return [row[0] for row in store.connection.execute(
+        f"SELECT id FROM errlogs{where} ORDER BY {sort} {'DESC' if descending else ''}, id {'DESC' if id_descending else ''}",
+        (console,) if console else ())]
+
+
+def key(record, sort):
+    return (record.entry_no if sort == 'id' else getattr(record, sort), record.entry_no)
+
+
+ORDERS = [(sort, descending, console) for sort in SORT_COLUMNS for descending in (True, False) for console in (None, CONSOLES[0])]
+
+
+@pytest.mark.parametrize("sort, descending, console", ORDERS)
+def test_pages_follow_full_order(store, sort, descending, console):
+    expected = full_order(store, sort, descending, console)
+    pages, after = [], None
+    while True:
+        page = store.page(37, console=console, after=after, sort=sort, descending=descending)
+        if not page:
+            break
+        pages.extend(record.entry_no for record in page)
+        after = key(page[-1], sort)
+    assert pages == expected
+
+    # Backwards from the last row gives the same rows
+    before = store.key_at(len(expected) - 1, console, sort, descending)
+    backward = [expected[-1]]
+    while True:
+        page = store.page(37, console=console, before=before, sort=sort, descending=descending)
+        if not page:
+            break
+        backward[:0] = [record.entry_no for record in page]
+        before = key(page[0], sort)
+    assert backward == expected
+
+
+@pytest.mark.parametrize("sort, descending, console", ORDERS)
+def test_key_at_and_position(store, sort, descending, console):
+    expected = full_order(store, sort, descending, console)
+    for position in (0, 1, 36, 37, len(expected) // 2, len(expected) - 1):
+        found = store.key_at(position, console, sort, descending)
+        assert found[1] == expected[position]
+        assert store.position(found, console, sort, descending) == position
+        page = store.page(5, console=console, after=found, sort=sort, descending=descending)
+        assert [record.entry_no for record in page] == expected[position + 1:position + 6]
+    assert store.key_at(len(expected), console, sort, descending) is None
+
+
+@pytest.mark.parametrize("column, descending", [(column, descending) for column in HISTORY_SORT_COLUMNS for descending in (True, False)])
+def test_history_model_random_access(store, column, descending):
+    model = ErrlogHistoryModel(store, lambda record: record.entry_no, sort_column=column, descending=descending, page_size=23)
+    expected = full_order(store, HISTORY_SORT_COLUMNS[column], descending)
+    assert len(model) == len(expected)
+    rng = random.Random(3)
+    top = 0
+    for _ in range(200):
+        top = rng.choice([top + rng.randrange(-30, 30), rng.randrange(len(expected))])  # Scroll, or jump
+        top = max(0, min(top, len(expected) - 20))
+        assert model.rows_in(top, top + 20) == expected[top:top + 20]
+        assert model.record(top).entry_no == expected[top]
+        assert model.position(model.record(top)) == top
+
+
+def test_duplicates_are_ignored(tmp_path):
+    store = ErrlogStore(str(tmp_path / "errlog_history.db"))
+    record = ErrlogRecord("", 0, 0x80800001, 0x0A000000, 5, 1, 2, 0, 0x3000, 0x2000)
+    store.add(record, "COM3"); store.add(record, "COM3"); store.add(record, "COM4")
+    assert store.flush() == 2
+    assert store.count() == 2 and store.count(console="COM3") == 1
+    store.close()
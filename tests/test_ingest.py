@@ -0,0 +1,52 @@
+# test_ingest.py
+# The GUI's errlog ingest path with its widgets stubbed out: duplicate checks, ordering and the filter index.
+
+import pytest
+
+from errlog_index import ErrlogQuery, parse_code_prefix
+from metrics import PipelineMetrics
+from uart_simulator import UNUSED_SLOT_REPLY, generate_errlog_lines, with_checksum
+
+gui = pytest.importorskip("gui")  # Needs tkinter and pyserial, but no display
+
+
+class NullWidget:
+    def row_inserted(self, *args): pass
+    def reset(self): pass
+    def config(self, **kwargs): pass
+
+
+@pytest.fixture
+def app():
+    app = gui.UartTerminalGUI.__new__(gui.UartTerminalGUI)  # No Tk root
+    app._init_ingest_state(PipelineMetrics())
+    app.errlog_table = app.errlog_header_label = NullWidget()
+    app.log_to_general_output = lambda message, tag=None: None
+    return app
+
+
+def test_refetched_entries_are_listed_once(app):
+    lines = generate_errlog_lines(40, seed=5)
+    for line in lines + lines[:10]:  # The first ten fetched again, by a second dump
+        app.parse_and_add_errlog_entry(with_checksum(line))
+    assert len(app.errlog_model) == 40 and app.duplicate_errlog_count == 10
+    # The same entry with another ack is still the same entry
+    app.parse_and_add_errlog_entry(with_checksum(lines[0].replace("OK 00000000", "OK 00000001")))
+    assert len(app.errlog_model) == 40 and app.duplicate_errlog_count == 11
+
+
+def test_unused_and_malformed_lines_are_not_listed(app):
+    app.parse_and_add_errlog_entry(with_checksum(UNUSED_SLOT_REPLY))
+    app.parse_and_add_errlog_entry("OK 00000000 -1 0x10 1_0 0 0 0 -100 0")
+    assert len(app.errlog_model) == 0 and len(app.errlog_index) == 0
+
+
+def test_listed_newest_first_and_indexed(app):
+    lines = generate_errlog_lines(40, seed=6)
+    for line in reversed(lines):  # Oldest first
+        app.parse_and_add_errlog_entry(with_checksum(line))
+    rtcs = [app.errlog_model.record(i).rtc for i in range(len(app.errlog_model))]
+    assert rtcs == sorted(rtcs, reverse=True)
+    query = ErrlogQuery(code_range=parse_code_prefix("80"))
+    expected = [i for i, record in enumerate(app.errlog_index.records) if query.matches(record)]
+    assert app.errlog_index.query(query) == expected
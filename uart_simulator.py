@@ -0,0 +1,233 @@
+# uart_simulator.py
+# This file contains a stand-in PS5 UART console on a Linux/macOS pseudo-terminal.
+# pyserial opens the printed device path like any other port, so the GUI, the capture
+# engine and the benchmarks can be exercised without a console or an adapter.
+#
+# Usage: python main.py simulate [--errlog-file FILE] [--slots N] [--seed N] [--baud N]
+#                                [--replay FILE [--rate LINES_PER_SEC] [--loop]]
+
+import argparse
+import os
+import random
+import select
+import sys
+import threading
+import time
+
+import decoders
+from serial_reader import LineFramer, calculate_checksum
+
+DEFAULT_BAUD = 115200
+DEFAULT_SLOTS = 32  # Filled errlog slots when the entries are generated
+DEFAULT_CAPACITY = 64  # Errlog slots the console has, filled or not
+DEFAULT_VERSION_REPLY = "OK 00000000 SIMULATED-UART 1.00"
+# A real console answers an unused slot with an entry of all-F fields, and NG only past its last slot
+UNUSED_SLOT_REPLY = "OK 00000000 FFFFFFFF FFFFFFFF FFFFFFFF FFFFFFFF FFFF FFFFFFFF FFFF FFFF"
+EMPTY_SLOT_REPLY = "NG E0000003"  # Answer to 'errlog N' past the last slot
+UNKNOWN_COMMAND_REPLY = "NG E0000001"
+
+
+def with_checksum(line):
+    """Appends the ':XX' checksum the console puts after every reply."""
+    return f"{line}:{calculate_checksum(line):02X}"
+
+
+def generate_errlog_lines(count, seed=None):
+    """Returns count plausible errlog reply lines (without checksum), slot 0 being the newest."""
+    rng = random.Random(seed)
+    codes = [code for code, _, _ in decoders.ERR_CODE_RULES if len(code) == 8]
+    rtc = rng.randrange(0x08000000, 0x10000000)
+    lines = []
+    for i in range(count):
+        # Older the deeper the slot, up to a week apart, closer together if a week each would take the RTC below 0
+        rtc -= rng.randrange(1, max(2, min(86400 * 7, rtc // (count - i))))
+        lines.append(f"OK 00000000 {rng.choice(codes)} {rtc:08X} {rng.choice(('00000005', '20000001', 'FF000000'))} "
+                     f"{rng.randrange(1 << 32):08X} {rng.randrange(0x3000):04X} {rng.randrange(1 << 32):08X} "
+                     f"{rng.randrange(0x2000, 0x6000):04X} {rng.randrange(0x1000, 0x3000):04X}")
+    return lines
+
+
+def read_session_lines(path):
+    """Reads a recorded session, dropping the '> ' prefix of lines saved from the GUI console."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return [line.strip().lstrip('>').lstrip() for line in f if line.strip()]
+
+
+class UartSimulator:
+    """
+    A fake console behind a pseudo-terminal.
+
+    Received commands are echoed back (the ':XX' checksum some adapters add is
+    dropped, as the reader's echo filter expects), then answered: 'errlog N'
+    with the Nth entry, UNUSED_SLOT_REPLY for the unfilled slots up to
+    capacity or EMPTY_SLOT_REPLY past it, 'version' with version_reply,
+    'errlog clear' by emptying the slots. Output is paced to the baud rate so
+    throughput matches a real link.
+    """
+
+    def __init__(self, errlog_lines=None, slots=DEFAULT_SLOTS, seed=None, baud=DEFAULT_BAUD,
+                 version_reply=DEFAULT_VERSION_REPLY, reply_delay=0.0, capacity=DEFAULT_CAPACITY):
+        self.errlog_lines = list(errlog_lines) if errlog_lines is not None else generate_errlog_lines(slots, seed)
+        self.capacity = max(capacity, len(self.errlog_lines))
+        self.baud = baud
+        self.version_reply = version_reply
+        self.reply_delay = reply_delay  # Extra seconds before each reply, to simulate a slow console
+        self.commands_received = 0
+        self.lines_sent = 0
+        self.port_name = None
+        self._master_fd = None
+        self._slave_fd = None
+        self._framer = LineFramer()
+        self._write_lock = threading.Lock()
+        self._next_write_time = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Creates the pseudo-terminal and starts answering commands. Returns the device path to open."""
+        import pty, tty  # POSIX only
+        self._master_fd, self._slave_fd = pty.openpty()
+        tty.setraw(self._master_fd); tty.setraw(self._slave_fd)  # No line discipline: bytes pass through untouched
+        # The slave end stays open here, so the port does not hang up when a client closes it
+        self.port_name = os.ttyname(self._slave_fd)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._serve, name="uart-simulator", daemon=True)
+        self._thread.start()
+        return self.port_name
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(1.0)
+            self._thread = None
+        for fd in (self._master_fd, self._slave_fd):
+            if fd is not None:
+                os.close(fd)
+        self._master_fd = self._slave_fd = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reply_to(self, command):
+        """Returns the reply lines (without checksum) for one received command."""
+        parts = command.split()
+        if not parts:
+            return []
+        name = parts[0].lower()
+        if name == "version":
+            return [self.version_reply]
+        if name == "errlog" and len(parts) == 2:
+            if parts[1].lower() == "clear":
+                self.errlog_lines = []
+                return ["OK 00000000"]
+            try:
+                index = int(parts[1], 0)
+            except ValueError:
+                return [UNKNOWN_COMMAND_REPLY]
+            if 0 <= index < len(self.errlog_lines):
+                return [self.errlog_lines[index]]
+            return [UNUSED_SLOT_REPLY] if 0 <= index < self.capacity else [EMPTY_SLOT_REPLY]
+        return [UNKNOWN_COMMAND_REPLY]
+
+    def write_lines(self, lines):
+        """Sends lines to the client, paced to the baud rate (10 bit times per byte)."""
+        data = "".join(f"{line}\n" for line in lines).encode('utf-8')
+        seconds_per_byte = 10.0 / self.baud
+        with self._write_lock:
+            now = time.perf_counter()
+            if self._next_write_time > now:
+                time.sleep(self._next_write_time - now)
+            view = memoryview(data)
+            while view:
+                written = os.write(self._master_fd, view)
+                view = view[written:]
+            self._next_write_time = max(now, self._next_write_time) + len(data) * seconds_per_byte
+            self.lines_sent += len(lines)
+
+    def replay(self, lines, rate=None, loop=False):
+        """
+        Writes recorded lines at rate lines per second, or as fast as the baud
+        rate allows when rate is None. Blocks until done (or stop() with loop=True).
+        """
+        interval = 1.0 / rate if rate else 0.0
+        next_time = time.perf_counter()
+        while not self._stop.is_set():
+            for line in lines:
+                if self._stop.is_set():
+                    return
+                if interval:
+                    next_time += interval
+                    delay = next_time - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                self.write_lines([line])
+            if not loop:
+                return
+
+    def _serve(self):
+        while not self._stop.is_set():
+            ready, _, _ = select.select([self._master_fd], [], [], 0.1)  # Timeout only to notice stop()
+            if not ready:
+                continue
+            try:
+                data = os.read(self._master_fd, 4096)
+            except OSError:
+                return  # Closed by stop()
+            for line in self._framer.feed(data):
+                command = line.rpartition(':')[0] if len(line) > 3 and line[-3] == ':' else line  # Drop the adapter checksum
+                self.commands_received += 1
+                self.write_lines([command])  # Echo, as the console does
+                if self.reply_delay:
+                    time.sleep(self.reply_delay)
+                self.write_lines([with_checksum(reply) for reply in self.reply_to(command)])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py simulate", description="Simulate a PS5 UART console on a pseudo-terminal.")
+    parser.add_argument('--errlog-file', help="file with the 'OK ...' lines to answer 'errlog N' with (one per slot)")
+    parser.add_argument('--slots', type=int, default=DEFAULT_SLOTS, help="number of generated errlog entries when no file is given")
+    parser.add_argument('--capacity', type=int, default=DEFAULT_CAPACITY, help="errlog slots in all; unfilled ones answer as unused")
+    parser.add_argument('--seed', type=int, help="seed for the generated entries, for repeatable runs")
+    parser.add_argument('--baud', type=int, default=DEFAULT_BAUD, help="baud rate the output is paced to")
+    parser.add_argument('--reply-delay', type=float, default=0.0, help="extra seconds before each reply")
+    parser.add_argument('--replay', help="recorded session to play back after start-up")
+    parser.add_argument('--rate', type=float, help="replay speed in lines per second (default: full baud rate)")
+    parser.add_argument('--loop', action='store_true', help="replay the session until interrupted")
+    args = parser.parse_args(argv)
+
+    if os.name != 'posix':
+        print("Error: the simulator needs POSIX pseudo-terminals (Linux or macOS).", file=sys.stderr)
+        return 1
+    try:
+        errlog_lines = read_session_lines(args.errlog_file) if args.errlog_file else None
+        replay_lines = read_session_lines(args.replay) if args.replay else None
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    simulator = UartSimulator(errlog_lines, slots=args.slots, seed=args.seed, baud=args.baud, reply_delay=args.reply_delay,
+                              capacity=args.capacity)
+    print(f"Simulated console on {simulator.start()} ({len(simulator.errlog_lines)} of {simulator.capacity} errlog slots filled, "
+          f"{args.baud} baud)", flush=True)
+    try:
+        if replay_lines:
+            started = time.perf_counter()
+            simulator.replay(replay_lines, rate=args.rate, loop=args.loop)
+            elapsed = time.perf_counter() - started
+            print(f"Replayed {len(replay_lines)} lines in {elapsed:.2f} s", flush=True)
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"{simulator.commands_received} commands received, {simulator.lines_sent} lines sent", file=sys.stderr)
+        simulator.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())